@@ -0,0 +1,34 @@
+"""property feed keyset indexes
+
+Revision ID: 3f2b9c1d7e4a
+Revises: 0174af76d98a
+Create Date: 2026-10-17 10:12:31.482915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2b9c1d7e4a'
+down_revision: Union[str, Sequence[str], None] = '0174af76d98a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_property_created_at_id', 'property', ['created_at', 'id'], unique=False)
+    op.create_index('ix_property_price_id', 'property', ['price', 'id'], unique=False)
+    op.create_index('ix_property_status_listing_created_at_id', 'property', ['status', 'listing_type', 'created_at', 'id'], unique=False)
+    op.create_index('ix_property_status_listing_price_id', 'property', ['status', 'listing_type', 'price', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_property_status_listing_price_id', table_name='property')
+    op.drop_index('ix_property_status_listing_created_at_id', table_name='property')
+    op.drop_index('ix_property_price_id', table_name='property')
+    op.drop_index('ix_property_created_at_id', table_name='property')
@@ -0,0 +1,78 @@
+"""conversation summary table
+
+Revision ID: 5c7e2a9d4b13
+Revises: 8a41d0c6b2f5
+Create Date: 2026-10-17 14:21:08.406233
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c7e2a9d4b13'
+down_revision: Union[str, Sequence[str], None] = '8a41d0c6b2f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BACKFILL = '''
+INSERT INTO conversation (
+    user_low_id, user_high_id, last_message_id, last_message_at,
+    last_sender_id, last_property_id, unread_low, unread_high
+)
+SELECT user_low_id, user_high_id, id, timestamp,
+       sender_id, property_id, unread_low, unread_high
+FROM (
+    SELECT paired.*,
+           ROW_NUMBER() OVER (
+               PARTITION BY user_low_id, user_high_id ORDER BY id DESC
+           ) AS position,
+           SUM(CASE WHEN NOT is_read AND receiver_id < sender_id THEN 1 ELSE 0 END)
+               OVER (PARTITION BY user_low_id, user_high_id) AS unread_low,
+           SUM(CASE WHEN NOT is_read AND receiver_id > sender_id THEN 1 ELSE 0 END)
+               OVER (PARTITION BY user_low_id, user_high_id) AS unread_high
+    FROM (
+        SELECT id, sender_id, receiver_id, property_id, is_read, timestamp,
+               CASE WHEN sender_id <= receiver_id
+                    THEN sender_id ELSE receiver_id END AS user_low_id,
+               CASE WHEN sender_id <= receiver_id
+                    THEN receiver_id ELSE sender_id END AS user_high_id
+        FROM chat_message
+    ) AS paired
+) AS ranked
+WHERE position = 1
+'''
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('conversation',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_low_id', sa.Integer(), nullable=False),
+    sa.Column('user_high_id', sa.Integer(), nullable=False),
+    sa.Column('last_message_id', sa.Integer(), nullable=True),
+    sa.Column('last_message_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_sender_id', sa.Integer(), nullable=True),
+    sa.Column('last_property_id', sa.Integer(), nullable=True),
+    sa.Column('unread_low', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('unread_high', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['last_message_id'], ['chat_message.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['last_property_id'], ['property.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['user_high_id'], ['user.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_low_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_low_id', 'user_high_id', name='uq_conversation_pair')
+    )
+    op.create_index('ix_conversation_low_last_message_at', 'conversation', ['user_low_id', 'last_message_at'], unique=False)
+    op.create_index('ix_conversation_high_last_message_at', 'conversation', ['user_high_id', 'last_message_at'], unique=False)
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_conversation_high_last_message_at', table_name='conversation')
+    op.drop_index('ix_conversation_low_last_message_at', table_name='conversation')
+    op.drop_table('conversation')
@@ -0,0 +1,28 @@
+"""property image property index
+
+Revision ID: 8a41d0c6b2f5
+Revises: 3f2b9c1d7e4a
+Create Date: 2026-10-17 11:03:52.117604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a41d0c6b2f5'
+down_revision: Union[str, Sequence[str], None] = '3f2b9c1d7e4a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_property_image_property_id_is_primary', 'property_image', ['property_id', 'is_primary'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_property_image_property_id_is_primary', table_name='property_image')
@@ -0,0 +1,30 @@
+"""chat message indexes
+
+Revision ID: b91d3f6a2c58
+Revises: 5c7e2a9d4b13
+Create Date: 2026-10-17 15:02:44.913527
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b91d3f6a2c58'
+down_revision: Union[str, Sequence[str], None] = '5c7e2a9d4b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_chat_message_sender_receiver_id', 'chat_message', ['sender_id', 'receiver_id', 'id'], unique=False)
+    op.create_index('ix_chat_message_receiver_id_is_read', 'chat_message', ['receiver_id', 'is_read'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_chat_message_receiver_id_is_read', table_name='chat_message')
+    op.drop_index('ix_chat_message_sender_receiver_id', table_name='chat_message')
@@ -10,7 +10,7 @@ from .property import (
     AccountInfo,
     PaymentConfirmation,
 )
-from .chat import ChatMessage
+from .chat import ChatMessage, Conversation
 from .rating import Rating
 from .transaction import (
     WalletMapping,
@@ -36,6 +36,7 @@ __all__ = [
     "AccountInfo",
     "PaymentConfirmation",
     "ChatMessage",
+    "Conversation",
     "Rating",
     "WalletMapping",
     "DeviceToken",
@@ -1,5 +1,13 @@
 from core.database import Base
-from sqlalchemy import ForeignKey, Integer, Text, Boolean, DateTime
+from sqlalchemy import (
+    ForeignKey,
+    Integer,
+    Text,
+    Boolean,
+    DateTime,
+    Index,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime, timezone
 
@@ -28,5 +36,56 @@ class ChatMessage(Base):
         DateTime(timezone=True), default=utc_now
     )
 
-    sender = relationship("BaseUser", foreign_keys=[sender_id])
-    receiver = relationship("BaseUser", foreign_keys=[receiver_id])
+    sender = relationship("BaseUser", foreign_keys=[sender_id], lazy="raise_on_sql")
+    receiver = relationship(
+        "BaseUser", foreign_keys=[receiver_id], lazy="raise_on_sql"
+    )
+
+    __table_args__ = (
+        # One range scan per direction of a conversation, newest first
+        Index("ix_chat_message_sender_receiver_id", "sender_id", "receiver_id", "id"),
+        # Unread lookups and mark-read
+        Index("ix_chat_message_receiver_id_is_read", "receiver_id", "is_read"),
+    )
+
+
+class Conversation(Base):
+    """Inbox summary of the messages between an ordered pair of users.
+
+    Maintained in the same transaction as every message insert; ``low`` and
+    ``high`` are the smaller and larger user ID of the pair.
+    """
+
+    __tablename__ = "conversation"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    user_low_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("user.id", ondelete="CASCADE"), nullable=False
+    )
+    user_high_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("user.id", ondelete="CASCADE"), nullable=False
+    )
+    last_message_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("chat_message.id", ondelete="SET NULL"), nullable=True
+    )
+    last_message_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    last_sender_id: Mapped[int] = mapped_column(Integer, nullable=True)
+    last_property_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("property.id", ondelete="SET NULL"), nullable=True
+    )
+    unread_low: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )  # Unread by user_low_id
+    unread_high: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )  # Unread by user_high_id
+
+    __table_args__ = (
+        UniqueConstraint("user_low_id", "user_high_id", name="uq_conversation_pair"),
+        Index("ix_conversation_low_last_message_at", "user_low_id", "last_message_at"),
+        Index(
+            "ix_conversation_high_last_message_at", "user_high_id", "last_message_at"
+        ),
+    )
@@ -0,0 +1,177 @@
+"""Named relationship loading profiles.
+
+Every relationship is mapped with ``lazy="raise_on_sql"`` so nothing is pulled
+in implicitly. Queries opt into exactly the graph their response needs by
+applying a profile:
+
+    select(Property).options(*load_profile("property-detail"))
+
+Strict mode (``DB_STRICT_LOADING`` or the ``strict_loading()`` context manager)
+additionally forbids relationship access that would be satisfied from the
+identity map, and ``QueryCounter`` records the statements issued so tests can
+assert a bounded number of SELECTs per endpoint.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import (
+    ORMExecuteState,
+    Session,
+    raiseload,
+    selectin_polymorphic,
+    selectinload,
+)
+
+from app.models.property import Property, PropertyImage
+from app.models.user import Admin, Agent, BaseUser, Client
+from core.configs import settings
+
+
+def _auth_minimal(entity: type = BaseUser) -> list:
+    """Columns only; used by the auth dependency chain on every request."""
+    return [raiseload("*")]
+
+
+def _user_profile(entity: type = BaseUser) -> list:
+    """Everything ``UserShow`` serializes."""
+    options: list = [selectinload(entity.account_info)]
+    if entity is BaseUser:
+        # Account type unknown up front: load subclass columns per type
+        options.append(selectin_polymorphic(BaseUser, [Client, Agent, Admin]))
+        options.append(selectinload(Client.appointments))
+        options.append(selectinload(Agent.appointments))
+        options.append(selectinload(Agent.availabilities))
+    else:
+        for name in ("appointments", "availabilities"):
+            if hasattr(entity, name):
+                options.append(selectinload(getattr(entity, name)))
+    options.append(raiseload("*"))
+    return options
+
+
+def _feed_card(entity: type = Property) -> list:
+    """A property plus just the image columns a listing card renders."""
+    return [
+        selectinload(Property.images).load_only(
+            PropertyImage.image_url, PropertyImage.is_primary
+        ),
+        raiseload("*"),
+    ]
+
+
+def _property_detail(entity: type = Property) -> list:
+    """Everything ``PropertyShow`` serializes."""
+    return [selectinload(Property.images), raiseload("*")]
+
+
+def _agent_profile(entity: type = Agent) -> list:
+    """Everything ``AgentFeed`` serializes."""
+    return [
+        selectinload(Agent.listings).selectinload(Property.images),
+        selectinload(Agent.availabilities),
+        raiseload("*"),
+    ]
+
+
+LOADING_PROFILES: dict[str, Callable[..., list]] = {
+    "auth-minimal": _auth_minimal,
+    "user-profile": _user_profile,
+    "feed-card": _feed_card,
+    "property-detail": _property_detail,
+    "agent-profile": _agent_profile,
+}
+
+
+def load_profile(name: str, entity: Optional[type] = None) -> tuple:
+    """Return the loader options for a named profile.
+
+    Args:
+        name: Profile name (see ``LOADING_PROFILES``)
+        entity: Root entity of the query, for profiles shared across the
+            user hierarchy (defaults to the profile's natural root)
+
+    Returns:
+        Tuple of loader options to pass to ``Select.options``
+
+    Raises:
+        ValueError: If the profile is unknown
+    """
+    try:
+        factory = LOADING_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown loading profile: {name}")
+    return tuple(factory(entity) if entity is not None else factory())
+
+
+# SECTION - Strict (test) mode
+
+_strict_loading: ContextVar[bool] = ContextVar(
+    "strict_loading", default=settings.DB_STRICT_LOADING
+)
+
+
+@contextmanager
+def strict_loading(enabled: bool = True) -> Iterator[None]:
+    """Fail on any relationship access the query did not load explicitly."""
+    token = _strict_loading.set(enabled)
+    try:
+        yield
+    finally:
+        _strict_loading.reset(token)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _apply_strict_loading(orm_execute_state: ORMExecuteState) -> None:
+    if not _strict_loading.get():
+        return
+    if (
+        orm_execute_state.is_select
+        and not orm_execute_state.is_column_load
+        and not orm_execute_state.is_relationship_load
+    ):
+        orm_execute_state.statement = orm_execute_state.statement.options(
+            raiseload("*")
+        )
+
+
+class QueryCounter:
+    """Record the SQL statements issued through an engine.
+
+    Usage:
+        with QueryCounter(engine) as counter:
+            await client.get("/api/v1/property/get-properties")
+        assert counter.selects <= 2
+    """
+
+    def __init__(self, engine: Engine | AsyncEngine):
+        self.engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+        self.statements: list[str] = []
+
+    def _before_cursor_execute(
+        self, conn: Any, cursor: Any, statement: str, *args: Any
+    ) -> None:
+        self.statements.append(statement)
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "before_cursor_execute", self._before_cursor_execute)
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._before_cursor_execute)
+
+    @property
+    def count(self) -> int:
+        """Total number of statements."""
+        return len(self.statements)
+
+    @property
+    def selects(self) -> int:
+        """Number of SELECT statements."""
+        return sum(
+            1 for s in self.statements if s.lstrip().upper().startswith("SELECT")
+        )
@@ -9,6 +9,7 @@ from sqlalchemy import (
     CheckConstraint,
     Integer,
     Time,
+    Index,
 )
 from sqlalchemy.orm import mapped_column, Mapped, relationship
 from datetime import datetime, time, timezone
@@ -135,16 +136,16 @@ class Property(Base):
     )
 
     # NOTE - Relationships
-    agent = relationship("Agent", back_populates="listings", lazy="selectin")
+    agent = relationship("Agent", back_populates="listings", lazy="raise_on_sql")
     images = relationship(
         "PropertyImage",
         back_populates="property",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="raise_on_sql",
     )
-    client = relationship("Client", back_populates="properties", lazy="selectin")
+    client = relationship("Client", back_populates="properties", lazy="raise_on_sql")
     contract = relationship(
-        "Contract", uselist=False, back_populates="property", lazy="selectin"
+        "Contract", uselist=False, back_populates="property", lazy="raise_on_sql"
     )
     __table_args__ = (
         CheckConstraint(
@@ -155,6 +156,24 @@ class Property(Base):
             f"status IN {tuple(item.value for item in PropertyStatEnum)}",
             name="check_status",
         ),
+        # NOTE - Keyset indexes for the property feed, one per sort order;
+        # the status/listing_type variants serve the common filtered feed
+        Index("ix_property_created_at_id", "created_at", "id"),
+        Index("ix_property_price_id", "price", "id"),
+        Index(
+            "ix_property_status_listing_created_at_id",
+            "status",
+            "listing_type",
+            "created_at",
+            "id",
+        ),
+        Index(
+            "ix_property_status_listing_price_id",
+            "status",
+            "listing_type",
+            "price",
+            "id",
+        ),
         CheckConstraint(
             f"listing_type IN {tuple(item.value for item in ListingTypeEnum)}",
             name="check_listing",
@@ -173,7 +192,10 @@ class PropertyImage(Base):
         nullable=False,
     )
     is_primary: Mapped[bool] = mapped_column(Boolean, nullable=True, default=False)
-    property = relationship("Property", back_populates="images", lazy="selectin")
+    property = relationship("Property", back_populates="images", lazy="raise_on_sql")
+    __table_args__ = (
+        Index("ix_property_image_property_id_is_primary", "property_id", "is_primary"),
+    )
 
 
 class Appointment(Base):
@@ -202,8 +224,8 @@ class Appointment(Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=utc_now, onupdate=utc_now
     )
-    client = relationship("Client", back_populates="appointments", lazy="selectin")
-    agent = relationship("Agent", back_populates="appointments", lazy="selectin")
+    client = relationship("Client", back_populates="appointments", lazy="raise_on_sql")
+    agent = relationship("Agent", back_populates="appointments", lazy="raise_on_sql")
 
 
 # NOTE Agent Availability Model
@@ -218,7 +240,7 @@ class AgentAvailability(Base):
     start_time: Mapped[time] = mapped_column(Time, nullable=False)
     end_time: Mapped[time] = mapped_column(Time, nullable=False)
     is_booked: Mapped[bool] = mapped_column(Boolean, default=False)
-    agent = relationship("Agent", back_populates="availabilities", lazy="selectin")
+    agent = relationship("Agent", back_populates="availabilities", lazy="raise_on_sql")
 
 
 class Contract(Base):
@@ -253,9 +275,9 @@ class Contract(Base):
         String(255), nullable=True, unique=True, index=True
     )  # For idempotency - prevents duplicate contract creation
 
-    property = relationship("Property", back_populates="contract", lazy="selectin")
+    property = relationship("Property", back_populates="contract", lazy="raise_on_sql")
     payment_confirmation = relationship(
-        "PaymentConfirmation", uselist=False, back_populates="contract", lazy="selectin"
+        "PaymentConfirmation", uselist=False, back_populates="contract", lazy="raise_on_sql"
     )
 
 
@@ -270,7 +292,7 @@ class AccountInfo(Base):
     bank_name: Mapped[str] = mapped_column(String(255), nullable=False)
     account_number: Mapped[str] = mapped_column(String(20), nullable=False, unique=True)
 
-    user = relationship("BaseUser", back_populates="account_info", lazy="selectin")
+    user = relationship("BaseUser", back_populates="account_info", lazy="raise_on_sql")
 
 
 class PaymentConfirmation(Base):
@@ -295,11 +317,11 @@ class PaymentConfirmation(Base):
     )  # For idempotency - prevents duplicate payment processing
 
     contract = relationship(
-        "Contract", back_populates="payment_confirmation", lazy="selectin"
+        "Contract", back_populates="payment_confirmation", lazy="raise_on_sql"
     )
     client = relationship(
-        "Client", back_populates="payment_confirmations", lazy="selectin"
+        "Client", back_populates="payment_confirmations", lazy="raise_on_sql"
     )
     agent = relationship(
-        "Agent", back_populates="payment_confirmations", lazy="selectin"
+        "Agent", back_populates="payment_confirmations", lazy="raise_on_sql"
     )
@@ -30,7 +30,7 @@ class WalletMapping(Base):
         DateTime(timezone=True), default=utc_now, onupdate=utc_now
     )
 
-    user = relationship("BaseUser", lazy="selectin", passive_deletes=True)
+    user = relationship("BaseUser", lazy="raise_on_sql", passive_deletes=True)
 
 
 class DeviceToken(Base):
@@ -46,7 +46,7 @@ class DeviceToken(Base):
         DateTime(timezone=True), default=utc_now
     )
 
-    user = relationship("BaseUser", lazy="selectin", passive_deletes=True)
+    user = relationship("BaseUser", lazy="raise_on_sql", passive_deletes=True)
 
 
 class TransactionRecord(Base):
@@ -102,8 +102,8 @@ class TransactionNotification(Base):
         DateTime(timezone=True), default=utc_now
     )
 
-    recipient = relationship("BaseUser", lazy="selectin", passive_deletes=True)
-    property = relationship("Property", lazy="selectin", passive_deletes=True)
+    recipient = relationship("BaseUser", lazy="raise_on_sql", passive_deletes=True)
+    property = relationship("Property", lazy="raise_on_sql", passive_deletes=True)
 
 
 class TransactionAuditLog(Base):
@@ -143,5 +143,5 @@ class MintedPropertyDraft(Base):
         DateTime(timezone=True), default=utc_now
     )
 
-    linked_property = relationship("Property", lazy="selectin")
+    linked_property = relationship("Property", lazy="raise_on_sql")
 
@@ -81,8 +81,9 @@ class BaseUser(Base):
         default=KycStatusEnum.pending,
         nullable=True,
     )
+    # NOTE - Written in bulk by LastSeenTracker, not on every row update
     last_seen: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=utc_now, onupdate=utc_now
+        DateTime(timezone=True), default=utc_now
     )
     fullname: Mapped[str] = mapped_column(
         String(50),
@@ -98,7 +99,7 @@ class BaseUser(Base):
     account_info = relationship(
         "AccountInfo",
         back_populates="user",
-        lazy="selectin",
+        lazy="raise_on_sql",
         cascade="all, delete-orphan",
     )
 
@@ -107,13 +108,13 @@ class BaseUser(Base):
         "ChatMessage",
         foreign_keys="[ChatMessage.sender_id]",
         back_populates="sender",
-        lazy="selectin",
+        lazy="raise_on_sql",
     )
     received_messages = relationship(
         "ChatMessage",
         foreign_keys="[ChatMessage.receiver_id]",
         back_populates="receiver",
-        lazy="selectin",
+        lazy="raise_on_sql",
     )
     __mapper_args__ = {
         "polymorphic_identity": "user",
@@ -163,19 +164,19 @@ class Client(BaseUser):
     properties: _RelationshipDeclared[Any] = relationship(
         "Property",
         back_populates="client",
-        lazy="selectin",
+        lazy="raise_on_sql",
         passive_deletes=True,
     )
     appointments = relationship(
         "Appointment",
         back_populates="client",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="raise_on_sql",
     )
     payment_confirmations = relationship(
         "PaymentConfirmation",
         back_populates="client",
-        lazy="selectin",
+        lazy="raise_on_sql",
         cascade="all, delete-orphan",
     )
 
@@ -201,24 +202,24 @@ class Agent(BaseUser):
         "Property",
         back_populates="agent",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="raise_on_sql",
     )
     appointments = relationship(
         "Appointment",
         back_populates="agent",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="raise_on_sql",
     )
     availabilities = relationship(
         "AgentAvailability",
         back_populates="agent",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="raise_on_sql",
     )
     payment_confirmations = relationship(
         "PaymentConfirmation",
         back_populates="agent",
-        lazy="selectin",
+        lazy="raise_on_sql",
         cascade="all, delete-orphan",
     )
 
@@ -242,3 +243,12 @@ class Admin(BaseUser):
     __mapper_args__ = {
         "polymorphic_identity": AccountTypeEnum.admin,
     }
+
+
+# NOTE - Concrete model per account type, so lookups that already know the
+# account type load every column in a single joined SELECT
+ACCOUNT_TYPE_MODELS: dict[AccountTypeEnum, type[BaseUser]] = {
+    AccountTypeEnum.client: Client,
+    AccountTypeEnum.agent: Agent,
+    AccountTypeEnum.admin: Admin,
+}
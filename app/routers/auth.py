@@ -27,6 +27,7 @@ from app.services.user_service import (
 )
 from app.utils.utils import verify_otp, blacklist_token, token_exp_time
 from app.utils.email import create_send_otp
+from app.services.principal_cache import get_principal_cache
 from app.schemas.auth_schema import SignUpShow
 
 router = APIRouter(
@@ -68,6 +69,7 @@ async def verify_account(current_user: OtpVerification, db: DBSession):
     refresh_user.verified = True  # type: ignore
     db.add(refresh_user)
     await db.commit()
+    await get_principal_cache().invalidate(current_user.id, current_user.account_type)  # type: ignore
 
     scopes = [current_user.account_type.value, current_user.role.value]  # type: ignore
     access_token = await create_access_token(
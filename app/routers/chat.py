@@ -1,14 +1,19 @@
 from fastapi import (
     APIRouter,
-    WebSocket,
-    WebSocketDisconnect,
     status,
     Query,
     HTTPException,
 )
 from app.models.chat import ChatMessage
 from app.models.user import BaseUser
-from app.models.property import Property, PropertyImage
+from app.services.conversations import (
+    PropertySummaryLoader,
+    history_query,
+    inbox_query,
+    mark_read,
+    record_message,
+    unread_totals_query,
+)
 from app.schemas.chat import (
     ChatMessageSchema,
     ChatMessageDetailSchema,
@@ -24,16 +29,12 @@ from app.schemas.chat import (
     MessageHistoryParams,
 )
 
-from typing import Dict, List, Optional, Annotated, Any
-from core.dependecies import DBSession
+from typing import List, Optional, Annotated
+from core.dependecies import DBSession, ReadDBSession
 from app.services.user_service import ActiveUser
+from app.services.ws_fanout import get_websocket_fanout
 from sqlalchemy.future import select
 from sqlalchemy.engine import Result
-from sqlalchemy import or_, and_, func, desc
-from core.logger import logger
-from core.configs import settings
-from datetime import datetime
-import json
 
 router = APIRouter(
     prefix="/chat",
@@ -52,13 +53,14 @@ router = APIRouter(
 )
 async def chat_history(
     current_user: ActiveUser,
-    db: DBSession,
+    db: ReadDBSession,
     pagination: Annotated[ChatPaginationParams, Query()],
 ):
+    query = select(ChatMessage).where(ChatMessage.sender_id == current_user.id)
+    if pagination.before_id is not None:
+        query = query.where(ChatMessage.id < pagination.before_id)
     query = (
-        select(ChatMessage)
-        .where(ChatMessage.sender_id == current_user.id)
-        .order_by(ChatMessage.timestamp.desc())
+        query.order_by(ChatMessage.id.desc())
         .offset(pagination.offset)
         .limit(pagination.limit)
     )
@@ -87,22 +89,7 @@ async def get_property_info(
     property_id: int, db: DBSession
 ) -> Optional[PropertyInfoSchema]:
     """Fetch minimal property info for chat context"""
-    query = select(Property).where(Property.id == property_id)
-    result = await db.execute(query)
-    property_obj = result.scalar_one_or_none()
-    if property_obj:
-        images = (
-            [img.image_url for img in property_obj.images]
-            if property_obj.images
-            else []
-        )
-        return PropertyInfoSchema(
-            id=property_obj.id,
-            title=property_obj.title,
-            address=property_obj.location,
-            images=images,
-        )
-    return None
+    return await PropertySummaryLoader(db).load(property_id)
 
 
 @router.get(
@@ -114,119 +101,32 @@ async def get_property_info(
 )
 async def get_conversations(
     current_user: ActiveUser,
-    db: DBSession,
+    db: ReadDBSession,
     pagination: Annotated[ConversationPaginationParams, Query()],
 ):
     """
     Get all active conversations for the current user.
     Returns conversation details including other user info, last message, and unread count.
     """
-    user_id = current_user.id
-
-    # Build a subquery to get all conversation partners with their latest message timestamp
-    # This approach uses database-level sorting and pagination
-    sent_subquery = (
-        select(
-            ChatMessage.receiver_id.label("other_user_id"),
-            func.max(ChatMessage.timestamp).label("last_timestamp"),
+    # NOTE - One indexed read of the conversation summary table, joined to
+    # the last message, the partner and the property
+    query = inbox_query(current_user.id, pagination.offset, pagination.limit)
+    rows = (await db.execute(query)).all()
+    return [
+        ConversationSchema(
+            other_user_id=row.other_user_id,
+            other_user_name=row.username,
+            other_user_avatar_url=row.avatar_url,
+            other_user_fullname=row.fullname,
+            last_message=row.last_message,
+            last_message_timestamp=row.last_message_at,
+            last_message_sender_id=row.last_sender_id,
+            unread_count=row.unread,
+            property_id=row.last_property_id,
+            property_title=row.property_title,
         )
-        .where(ChatMessage.sender_id == user_id)
-        .group_by(ChatMessage.receiver_id)
-    )
-
-    received_subquery = (
-        select(
-            ChatMessage.sender_id.label("other_user_id"),
-            func.max(ChatMessage.timestamp).label("last_timestamp"),
-        )
-        .where(ChatMessage.receiver_id == user_id)
-        .group_by(ChatMessage.sender_id)
-    )
-
-    # Union all conversation partners with their latest message timestamps
-    union_subquery = sent_subquery.union_all(received_subquery).subquery()
-
-    # Get unique conversation partners with max timestamp, sorted and paginated at DB level
-    partners_query = (
-        select(
-            union_subquery.c.other_user_id,
-            func.max(union_subquery.c.last_timestamp).label("latest_timestamp"),
-        )
-        .group_by(union_subquery.c.other_user_id)
-        .order_by(desc(func.max(union_subquery.c.last_timestamp)))
-        .offset(pagination.offset)
-        .limit(pagination.limit)
-    )
-
-    partners_result = await db.execute(partners_query)
-    partners = partners_result.fetchall()
-
-    conversations = []
-    for partner_row in partners:
-        other_user_id = partner_row[0]
-
-        # Get the last message in this conversation
-        last_message_query = (
-            select(ChatMessage)
-            .where(
-                or_(
-                    and_(
-                        ChatMessage.sender_id == user_id,
-                        ChatMessage.receiver_id == other_user_id,
-                    ),
-                    and_(
-                        ChatMessage.sender_id == other_user_id,
-                        ChatMessage.receiver_id == user_id,
-                    ),
-                )
-            )
-            .order_by(desc(ChatMessage.timestamp))
-            .limit(1)
-        )
-        last_message_result = await db.execute(last_message_query)
-        last_message = last_message_result.scalar_one_or_none()
-
-        # Count unread messages from this user
-        unread_query = select(func.count(ChatMessage.id)).where(
-            and_(
-                ChatMessage.sender_id == other_user_id,
-                ChatMessage.receiver_id == user_id,
-                ChatMessage.is_read
-                == False,  # noqa: E712 - SQLAlchemy requires == for SQL generation
-            )
-        )
-        unread_result = await db.execute(unread_query)
-        unread_count = unread_result.scalar() or 0
-
-        # Get other user info
-        other_user_info = await get_user_info(other_user_id, db)
-
-        # Get property info if the last message has a property_id
-        property_title = None
-        property_id = None
-        if last_message and last_message.property_id:
-            property_info = await get_property_info(last_message.property_id, db)
-            if property_info:
-                property_title = property_info.title
-                property_id = property_info.id
-
-        conversation = ConversationSchema(
-            other_user_id=other_user_id,
-            other_user_name=other_user_info.username if other_user_info else None,
-            other_user_avatar_url=(
-                other_user_info.avatar_url if other_user_info else None
-            ),
-            other_user_fullname=other_user_info.fullname if other_user_info else None,
-            last_message=last_message.message if last_message else None,
-            last_message_timestamp=last_message.timestamp if last_message else None,
-            last_message_sender_id=last_message.sender_id if last_message else None,
-            unread_count=unread_count,
-            property_id=property_id,
-            property_title=property_title,
-        )
-        conversations.append(conversation)
-
-    return conversations
+        for row in rows
+    ]
 
 
 @router.get(
@@ -239,7 +139,7 @@ async def get_conversations(
 async def get_message_history(
     user_id: int,
     current_user: ActiveUser,
-    db: DBSession,
+    db: ReadDBSession,
     pagination: Annotated[MessageHistoryParams, Query()],
 ):
     """
@@ -256,28 +156,15 @@ async def get_message_history(
             detail="User not found",
         )
 
-    # Build the query for messages between the two users
-    conditions = or_(
-        and_(
-            ChatMessage.sender_id == current_user_id,
-            ChatMessage.receiver_id == user_id,
-        ),
-        and_(
-            ChatMessage.sender_id == user_id,
-            ChatMessage.receiver_id == current_user_id,
-        ),
-    )
-
-    # Add property filter if provided
-    if pagination.property_id:
-        conditions = and_(conditions, ChatMessage.property_id == pagination.property_id)
-
-    query = (
-        select(ChatMessage)
-        .where(conditions)
-        .order_by(desc(ChatMessage.timestamp))
-        .offset(pagination.offset)
-        .limit(pagination.limit)
+    # NOTE - Keyset paging: clients pass the oldest message ID they hold as
+    # before_id, so every page is two short index range scans
+    query = history_query(
+        current_user_id,
+        user_id,
+        limit=pagination.limit,
+        offset=pagination.offset,
+        before_id=pagination.before_id,
+        property_id=pagination.property_id,
     )
     result = await db.execute(query)
     messages = result.scalars().all()
@@ -290,6 +177,11 @@ async def get_message_history(
         fullname=current_user.fullname,
     )
 
+    # One batched lookup for every property mentioned on the page
+    properties = await PropertySummaryLoader(db).load_many(
+        msg.property_id for msg in messages
+    )
+
     # Build detailed response
     detailed_messages = []
     for msg in messages:
@@ -300,10 +192,6 @@ async def get_message_history(
             other_user if msg.sender_id == current_user_id else current_user_info
         )
 
-        property_info = None
-        if msg.property_id:
-            property_info = await get_property_info(msg.property_id, db)
-
         detailed_messages.append(
             ChatMessageDetailSchema(
                 id=msg.id,
@@ -315,7 +203,7 @@ async def get_message_history(
                 is_read=msg.is_read,
                 sender_info=sender_info,
                 receiver_info=receiver_info,
-                property_info=property_info,
+                property_info=properties.get(msg.property_id),
             )
         )
 
@@ -367,6 +255,8 @@ async def send_message(
         is_read=False,
     )
     db.add(new_message)
+    await db.flush()
+    await record_message(db, new_message)
     await db.commit()
     await db.refresh(new_message)
 
@@ -393,9 +283,7 @@ async def send_message(
         ),
         "property_id": new_message.property_id,
     }
-    from .websocket import WebSocketConnectionManager
-    manager = WebSocketConnectionManager()
-    await manager.send_personal_message(payload, receiver_id)
+    delivered = await get_websocket_fanout().deliver(receiver_id, payload)
 
     return SendMessageResponse(
         id=new_message.id,
@@ -406,6 +294,7 @@ async def send_message(
         property_id=new_message.property_id,
         is_read=new_message.is_read,
         sender_info=sender_info,
+        delivered=delivered,
     )
 
 
@@ -414,15 +303,19 @@ async def send_message(
     response_model=MarkReadResponse,
     status_code=status.HTTP_200_OK,
     summary="Mark messages as read",
-    description="Mark all messages from a specific user as read.",
+    description="Mark all messages from a specific user as read, "
+    "optionally only up to a message ID.",
 )
 async def mark_messages_read(
     sender_id: int,
     current_user: ActiveUser,
     db: DBSession,
+    up_to_id: Annotated[
+        Optional[int], Query(description="Only mark messages up to this message ID")
+    ] = None,
 ):
     """
-    Mark all unread messages from a specific sender as read.
+    Mark unread messages from a specific sender as read.
     """
     current_user_id = current_user.id
 
@@ -434,25 +327,9 @@ async def mark_messages_read(
             detail="Sender not found",
         )
 
-    # Get all unread messages from this sender to the current user
-    query = select(ChatMessage).where(
-        and_(
-            ChatMessage.sender_id == sender_id,
-            ChatMessage.receiver_id == current_user_id,
-            ChatMessage.is_read
-            == False,  # noqa: E712 - SQLAlchemy requires == for SQL generation
-        )
-    )
-    result = await db.execute(query)
-    messages = result.scalars().all()
-
-    # Mark them as read
-    messages_marked = 0
-    for msg in messages:
-        msg.is_read = True
-        db.add(msg)
-        messages_marked += 1
-
+    # NOTE - One UPDATE; the watermark lets clients mark incrementally
+    # (everything up to the newest message they have shown)
+    messages_marked = await mark_read(db, current_user_id, sender_id, up_to_id)
     await db.commit()
 
     return MarkReadResponse(messages_marked=messages_marked, success=True)
@@ -473,31 +350,8 @@ async def get_unread_count(
     Get the total number of unread messages for the current user.
     Also returns the number of conversations with unread messages.
     """
-    current_user_id = current_user.id
-
-    # Count total unread messages
-    total_unread_query = select(func.count(ChatMessage.id)).where(
-        and_(
-            ChatMessage.receiver_id == current_user_id,
-            ChatMessage.is_read
-            == False,  # noqa: E712 - SQLAlchemy requires == for SQL generation
-        )
-    )
-    total_unread_result = await db.execute(total_unread_query)
-    total_unread = total_unread_result.scalar() or 0
-
-    # Count distinct senders with unread messages (conversations with unread)
-    conversations_query = select(
-        func.count(func.distinct(ChatMessage.sender_id))
-    ).where(
-        and_(
-            ChatMessage.receiver_id == current_user_id,
-            ChatMessage.is_read
-            == False,  # noqa: E712 - SQLAlchemy requires == for SQL generation
-        )
-    )
-    conversations_result = await db.execute(conversations_query)
-    conversations_with_unread = conversations_result.scalar() or 0
+    result = await db.execute(unread_totals_query(current_user.id))
+    total_unread, conversations_with_unread = result.one()
 
     return UnreadCountResponse(
         total_unread=total_unread,
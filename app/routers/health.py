@@ -94,16 +94,19 @@ async def health_stats():
     """Cache and performance statistics.
 
     Returns:
-        Dict with cache stats and resource usage
+        Dict with cache stats, DB pool occupancy and resource usage
     """
     try:
         from app.services.cache import get_cache_service
 
+        from core.database import get_pool_stats
+
         cache = await get_cache_service()
         stats = await cache.get_stats()
 
         return {
             "cache": stats,
+            "db_pool": get_pool_stats(),
             "timestamp": datetime.utcnow().isoformat(),
         }
     except Exception as e:
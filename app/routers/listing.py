@@ -1,11 +1,12 @@
 from fastapi import APIRouter, status, Query, HTTPException
-from core.dependecies import DBSession
+from core.dependecies import DBSession, ReadDBSession
 from app.schemas.property_schema import (
     PropertyBase,
     PropertyShow,
     PropertyUpdate,
     FilterParams,
     PropertyFeed,
+    PropertyCardFeed,
     DeleteProperty,
 )
 from app.services.listing import (
@@ -14,12 +15,14 @@ from app.services.listing import (
     get_property_by_id,
     update_listing,
     filtered_property,
+    property_cards,
     get_agent_by_id,
     delist_property,
 )
 from app.services.user_service import ActiveAgent, ActiveUser
 from app.schemas.user_schema import AgentFeed
-from typing import List, Annotated
+from app.utils.enums import FeedViewEnum
+from typing import List, Annotated, Union
 from pydantic import Field
 from fastapi import Query
 
@@ -70,20 +73,25 @@ async def edit_property_listing(
 
 
 list_desc = """  
-Retrieve a paginated list of available properties using cursor-based pagination. Users can filter results based on specific criteria, such as property ID, and define the number of listings returned per request. The response includes a `next_cursor` to facilitate seamless pagination."""
+Retrieve a paginated list of properties using keyset (cursor) pagination. Results can be filtered by status, listing type, property type, price, bedrooms, bathrooms and location, and ordered by `newest`, `oldest`, `price_asc` or `price_desc`. Pass the `next_coursor` from a response as `cursor` to fetch the next page; every page costs the same as the first.
+
+Pass `view=card` for a lightweight card projection (id, title, price, location, bedrooms, bathrooms, primary image URL and agent name) fetched in a single query."""
 
 
 @router.get(
     "/get-properties",
-    response_model=PropertyFeed,
+    response_model=Union[PropertyFeed, PropertyCardFeed],
     status_code=status.HTTP_200_OK,
     description=list_desc,
 )
 async def property_feed(
     filter_query: Annotated[FilterParams, Query()],
     _current_user: ActiveUser,
-    db: DBSession,
+    db: ReadDBSession,
+    view: Annotated[FeedViewEnum, Query()] = FeedViewEnum.full,
 ):
+    if view == FeedViewEnum.card:
+        return await property_cards(filter_query, db)
     return await filtered_property(filter_query, db)
 
 
@@ -96,7 +104,7 @@ async def property_feed(
 async def get_property(
     property_id: int,
     current_user: ActiveUser,
-    db: DBSession,
+    db: ReadDBSession,
 ):
     return await get_property_by_id(property_id, db)
 
@@ -106,7 +114,7 @@ async def get_property(
     response_model=AgentFeed,
     status_code=status.HTTP_200_OK,
 )
-async def agent_profile(agent_id: int, current_user: ActiveUser, db: DBSession):
+async def agent_profile(agent_id: int, current_user: ActiveUser, db: ReadDBSession):
     return await get_agent_by_id(agent_id, db)
 
 
@@ -8,12 +8,14 @@ from app.services.user_service import (
     get_current_user,
 )
 from app.services.profile import (
+    get_profile,
     update_user,
     create_new_payment_info,
     get_account_info,
     update_account_info,
     run_account_info_deletion,
 )
+from app.services.principal_cache import get_principal_cache
 from core.dependecies import DBSession, get_db
 from app.schemas.user_schema import (
     UserShow,
@@ -59,13 +61,13 @@ router = APIRouter(
     description="Get Current User Profile",
     status_code=status.HTTP_200_OK,
 )
-async def get_me(current_user: ActiveUser):
-    return current_user
+async def get_me(current_user: ActiveUser, db: DBSession):
+    return await get_profile(current_user.id, db, type(current_user))
 
 
 @router.get("/{user_id}", response_model=UserShow, status_code=status.HTTP_200_OK)
 async def get_user_by_id(user_id: int, current_user: ActiveVerifiedUser, db: DBSession):
-    user = await db.get(BaseUser, user_id)
+    user = await get_profile(user_id, db)
     return user
 
 
@@ -94,6 +96,7 @@ async def delete_account(current_user: ActiveUser, db: DBSession):
     db.add(current_user)
     await db.commit()
     await db.refresh(current_user)
+    await get_principal_cache().invalidate(current_user.id, current_user.account_type)
     return {"message": "Account deleted successfully"}
 
 
@@ -387,6 +390,9 @@ async def get_kyc_status(
         if status_result.get("status")=="verified":
             current_user.kyc_status = KycStatusEnum.verified
             await db.commit()
+            await get_principal_cache().invalidate(
+                current_user.id, current_user.account_type
+            )
             
 
         return {
@@ -47,7 +47,17 @@ JWT token is required and can be provided via:
     "receiver_id": int,
     "message": string,
     "created_at": string,    // ISO 8601 timestamp
-    "property_id": int       // Optional
+    "property_id": int,      // Optional
+    "seq": string            // Delivery log position; pass back as last_seq
+}
+```
+
+### Resume Marker (Server → Client, after replay)
+```json
+{
+    "type": "resumed",
+    "last_seq": string,      // Last replayed position
+    "complete": boolean      // False: gap too old for the log, re-read chat history
 }
 ```
 
@@ -55,7 +65,7 @@ JWT token is required and can be provided via:
 ```json
 {
     "status": "sent",
-    "delivered": boolean,    // True if recipient is online
+    "delivered": boolean,    // True once a worker wrote it to the recipient's socket
     "message_id": int
 }
 ```
@@ -67,101 +77,106 @@ JWT token is required and can be provided via:
 }
 ```
 
+## Resuming
+
+Reconnect with `?last_seq={seq}` (the `seq` of the last message received) to
+have messages sent since then replayed. Live messages may arrive during the
+replay, so clients should drop any `seq` already seen.
+
+## Heartbeat
+
+The server sends `{"type": "ping"}` every `WS_HEARTBEAT_INTERVAL` seconds and
+expects `{"type": "pong"}` (or any other frame) back. A socket silent for
+`WS_HEARTBEAT_TIMEOUT` seconds is closed with WS_1001_GOING_AWAY.
+
 ## Connection Errors
 - WS_1008_POLICY_VIOLATION: Authentication failed (invalid/missing token, inactive user)
+- WS_1001_GOING_AWAY: Heartbeat timed out
 """
 
+from typing import Optional
+
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status, Query
-from typing import Dict, Optional, Annotated
-from core.dependecies import DBSession
+from pydantic import ValidationError
 from core.logger import logger
-from app.models.chat import ChatMessage
-from app.services.user_service import ActiveVerifiedWSUser
+from app.services.chat_ingest import get_chat_ingest
+from app.services.delivery_log import get_delivery_log
+from app.services.presence import PresenceService
+from app.services.user_service import ActiveUser, ActiveVerifiedWSUser
+from app.services.websocket_manager import (
+    Connection,
+    WebSocketMessage,
+    get_connection_manager,
+)
+from app.services.ws_fanout import get_websocket_fanout
 from app.models.user import BaseUser
-from app.schemas.user_schema import UserShow
-from app.schemas.chat import ChatMessageSchema
+from app.schemas.chat import ChatMessageSchema, UserInfoSchema
 
 
 router = APIRouter(tags=["WebSocket"])
 
 
-class WebSocketConnectionManager:
-    """Manages WebSocket connections and message routing."""
-
-    def __init__(self):
-        # Dictionary mapping user_id to their WebSocket connections
-        self.active_connections: Dict[int, WebSocket] = {}
+# Global connection registry (many sockets per user, queued writes)
+ws_manager = get_connection_manager()
 
-    def connect(self, websocket: WebSocket, user_id: int) -> bool:
-        """
-        Track a WebSocket connection by user_id.
+# Recent deliveries per user, replayed to reconnecting clients
+delivery_log = get_delivery_log()
 
-        Note: The WebSocket should already be accepted before calling this method.
+# Delivers to users connected to other workers; the listener runs in lifespan
+ws_fanout = get_websocket_fanout()
 
-        Args:
-            websocket: The WebSocket connection (already accepted)
-            user_id: The authenticated user's ID
+# Heartbeat, idle reaping and the shared presence map; the loop runs in lifespan
+presence = PresenceService(ws_manager)
 
-        Returns True if connection tracking was successful.
-        """
-        self.active_connections[user_id] = websocket
-        logger.info(f"WebSocket connected: user_id={user_id}")
-        return True
+# Group-commits inbound chat messages; drained in lifespan on shutdown
+chat_ingest = get_chat_ingest()
 
-    def disconnect(self, user_id: int):
-        """Remove a user's WebSocket connection from tracking."""
-        if user_id in self.active_connections:
-            del self.active_connections[user_id]
-            logger.info(f"WebSocket disconnected: user_id={user_id}")
 
-    def is_connected(self, user_id: int) -> bool:
-        """Check if a user is currently connected."""
-        return user_id in self.active_connections
-
-    async def send_personal_message(self, message: dict, user_id: int) -> bool:
-        """
-        Send a message to a specific user by their ID.
-        Returns True if the message was sent, False if user is not connected.
-        """
-        if user_id in self.active_connections:
-            try:
-                await self.active_connections[user_id].send_json(message)
-                return True
-            except Exception as e:
-                logger.error(f"Error sending message to user {user_id}: {e}")
-                # Clean up broken connection
-                self.disconnect(user_id)
-                return False
-        return False
-
-    async def broadcast(self, message: dict, exclude_user_id: Optional[int] = None):
-        """Broadcast a message to all connected users, optionally excluding one."""
-        disconnected_users = []
-        for user_id, websocket in self.active_connections.items():
-            if exclude_user_id and user_id == exclude_user_id:
-                continue
-            try:
-                await websocket.send_json(message)
-            except Exception as e:
-                logger.error(f"Error broadcasting to user {user_id}: {e}")
-                disconnected_users.append(user_id)
+def parse_chat_message(sender_id: int, data: dict) -> Optional[ChatMessageSchema]:
+    """Validate and coerce an inbound chat frame; None if it is malformed.
 
-        # Clean up disconnected users
-        for user_id in disconnected_users:
-            self.disconnect(user_id)
+    Keeps bad input out of the group commit, where one bad row would fail
+    the whole batch.
+    """
+    try:
+        return ChatMessageSchema(
+            sender_id=sender_id,
+            receiver_id=data.get("receiver_id"),
+            message=data.get("message"),
+            property_id=data.get("property_id"),
+        )
+    except ValidationError:
+        return None
 
-    def get_connected_users(self) -> list[int]:
-        """Get list of all currently connected user IDs."""
-        return list(self.active_connections.keys())
 
+async def resume(connection: Connection, last_seq: Optional[str]) -> None:
+    """Replay deliveries logged after ``last_seq`` to a reconnecting socket.
 
-# Global connection manager instance
-ws_manager = WebSocketConnectionManager()
+    Raises:
+        WebSocketDisconnect: The socket closed mid-replay
+    """
+    if not last_seq:
+        return
+    payloads, complete = await delivery_log.read_after(connection.user_id, last_seq)
+    for payload in payloads:
+        # NOTE - Wait for room: a long replay must not trip the slow-consumer policy
+        await connection.put(payload)
+    await connection.put(
+        {
+            "type": "resumed",
+            "last_seq": payloads[-1]["seq"] if payloads else last_seq,
+            "complete": complete,
+        }
+    )
 
 
 @router.websocket("/chat/{user_id}")
 async def websocket_endpoint(
-    websocket: WebSocket, current_user: ActiveVerifiedWSUser, db: DBSession
+    websocket: WebSocket,
+    current_user: ActiveVerifiedWSUser,
+    last_seq: Optional[str] = Query(
+        None, description="seq of the last message received, to resume from"
+    ),
 ):
     """
     WebSocket endpoint for real-time messaging.
@@ -194,10 +209,12 @@ async def websocket_endpoint(
     if current_user is None:
         return
 
-    current_user = UserShow.model_validate(current_user)  # type: ignore
+    current_user = UserInfoSchema.model_validate(current_user)  # type: ignore
 
     # Track the session (connection already accepted by auth)
-    ws_manager.connect(websocket, current_user.id)
+    connection = await ws_manager.connect(websocket, current_user.id, accept=False)
+    await ws_fanout.register(current_user.id)
+    await presence.connected(current_user.id)
 
     # Build user info for messages
     sender_info = {
@@ -206,7 +223,45 @@ async def websocket_endpoint(
         "avatar_url": current_user.avatar_url,
     }
 
+    async def store_and_deliver(receiver_id: int, message: str, property_id):
+        # Store message in database (group-committed with other sockets)
+        try:
+            chat_message = await chat_ingest.submit(
+                current_user.id, receiver_id, message, property_id
+            )
+        except Exception as e:
+            logger.error(f"Error storing WebSocket message: {e}")
+            ws_manager.send(websocket, {"error": "Message could not be stored"})
+            return
+
+        # Build outgoing message payload
+        payload = {
+            "id": chat_message.id,
+            "sender_info": sender_info,
+            "receiver_id": chat_message.receiver_id,
+            "message": chat_message.message,
+            "created_at": (
+                chat_message.timestamp.isoformat() if chat_message.timestamp else None
+            ),
+            "property_id": chat_message.property_id,
+        }
+
+        # Send to receiver on whichever worker holds their socket
+        sent = await ws_fanout.deliver(receiver_id, payload)
+
+        # Send confirmation back to sender
+        ws_manager.send(
+            websocket,
+            {
+                "status": "sent",
+                "delivered": sent,
+                "message_id": chat_message.id,
+            },
+        )
+
     try:
+        await resume(connection, last_seq)
+
         while True:
             # Wait for incoming messages
             try:
@@ -214,66 +269,57 @@ async def websocket_endpoint(
             except WebSocketDisconnect:
                 raise
             except Exception:
-                await websocket.send_json({"error": "Invalid JSON received"})
+                connection.touch()
+                ws_manager.send(websocket, {"error": "Invalid JSON received"})
                 continue
 
-            receiver_id = data.get("receiver_id")
-            message = data.get("message")
-            property_id = data.get("property_id")
+            connection.touch()
+            if data.get("type") == "pong":
+                continue
+            if data.get("type") == "ping":
+                ws_manager.send(websocket, {"type": "pong"})
+                continue
 
             # Validate required fields
-            if not receiver_id or not message:
-                await websocket.send_json(
-                    {"error": "Missing required fields: receiver_id, message"}
+            if not data.get("receiver_id") or not data.get("message"):
+                ws_manager.send(
+                    websocket, {"error": "Missing required fields: receiver_id, message"}
+                )
+                continue
+            chat_message = parse_chat_message(current_user.id, data)
+            if chat_message is None:
+                ws_manager.send(
+                    websocket,
+                    {"error": "Invalid fields: receiver_id, property_id, message"},
                 )
                 continue
 
-            # Store message in database
-            chat_message = ChatMessage(
-                sender_id=current_user.id,
-                receiver_id=receiver_id,
-                message=message,
-                property_id=property_id,
-                is_read=False,
-            )
-            db.add(chat_message)
-            await db.commit()
-            await db.refresh(chat_message)
-
-            # Build outgoing message payload
-            payload = {
-                "id": chat_message.id,
-                "sender_info": sender_info,
-                "receiver_id": chat_message.receiver_id,
-                "message": chat_message.message,
-                "created_at": (
-                    chat_message.timestamp.isoformat()
-                    if chat_message.timestamp
-                    else None
-                ),
-                "property_id": chat_message.property_id,
-            }
-
-            # Send to receiver if connected
-            sent = await ws_manager.send_personal_message(payload, receiver_id)
-
-            # Send confirmation back to sender
-            await websocket.send_json(
-                {
-                    "status": "sent",
-                    "delivered": sent,
-                    "message_id": chat_message.id,
-                }
+            # NOTE - Keep reading while earlier messages are being stored,
+            # up to the socket's database concurrency cap
+            await connection.start_operation(
+                store_and_deliver(
+                    chat_message.receiver_id,
+                    chat_message.message,
+                    chat_message.property_id,
+                )
             )
 
     except WebSocketDisconnect:
-        ws_manager.disconnect(current_user.id)
         logger.info(f"WebSocket disconnected for user_id={current_user.id}")
+    finally:
+        await connection.wait_operations()
+        await ws_manager.disconnect(websocket)
+        await ws_fanout.unregister(current_user.id)
+        await presence.disconnected(current_user.id)
 
 
 @router.websocket("/chat/global-chat")
 async def websocket_chat(
-    websocket: WebSocket, db: DBSession, current_user: ActiveVerifiedWSUser
+    websocket: WebSocket,
+    current_user: ActiveVerifiedWSUser,
+    last_seq: Optional[str] = Query(
+        None, description="seq of the last message received, to resume from"
+    ),
 ):
     """
     WebSocket endpoint for chat messaging.
@@ -310,107 +356,172 @@ async def websocket_chat(
     """
 
     # Track the session (connection already accepted by auth)
-    ws_manager.connect(websocket, current_user.id)  # type: ignore
-    current_user_show = UserShow.model_validate(current_user)
+    connection = await ws_manager.connect(
+        websocket, current_user.id, accept=False  # type: ignore
+    )
+    await ws_fanout.register(current_user.id)  # type: ignore
+    await presence.connected(current_user.id)  # type: ignore
+    current_user_show = UserInfoSchema.model_validate(current_user)
+    sender_info = {
+        "id": current_user_show.id,
+        "username": current_user_show.username,
+        "avatar_url": current_user_show.avatar_url,
+    }
+
+    async def store_and_deliver(sender_id: int, receiver_id: int, message: str):
+        # Store in DB (group-committed with other sockets)
+        try:
+            db_message = await chat_ingest.submit(sender_id, receiver_id, message)
+        except Exception as e:
+            logger.error(f"Error storing WebSocket message: {e}")
+            ws_manager.send(websocket, "Message could not be stored")
+            return
+
+        payload = {
+            "id": db_message.id,
+            "sender_info": sender_info,
+            "receiver_id": db_message.receiver_id,
+            "message": db_message.message,
+            "created_at": (
+                db_message.timestamp.isoformat() if db_message.timestamp else None
+            ),
+        }
+
+        await ws_fanout.deliver(receiver_id, payload)
 
     try:
+        await resume(connection, last_seq)
+
         while True:
             try:
                 data = await websocket.receive_json()
             except WebSocketDisconnect:
                 raise
             except Exception:
-                await websocket.send_text("Invalid JSON received")
+                connection.touch()
+                ws_manager.send(websocket, "Invalid JSON received")
                 continue
 
-            sender_id = current_user_show.id
-            receiver_id = data.get("receiver_id")
-            message = data.get("message")
+            connection.touch()
+            if data.get("type") == "pong":
+                continue
+            if data.get("type") == "ping":
+                ws_manager.send(websocket, {"type": "pong"})
+                continue
 
-            if not all([sender_id, receiver_id, message]):
-                await websocket.send_text("Missing fields in message")
+            sender_id = current_user_show.id
+            if not all([sender_id, data.get("receiver_id"), data.get("message")]):
+                ws_manager.send(websocket, "Missing fields in message")
+                continue
+            chat_message = parse_chat_message(sender_id, data)
+            if chat_message is None:
+                ws_manager.send(websocket, "Invalid fields in message")
                 continue
 
-            # Store in DB
-            chat_message = ChatMessageSchema(
-                sender_id=sender_id, receiver_id=receiver_id, message=message
+            await connection.start_operation(
+                store_and_deliver(
+                    sender_id, chat_message.receiver_id, chat_message.message
+                )
             )
-            db_message = ChatMessage(**chat_message.model_dump(exclude_unset=True))
-            db.add(db_message)
-            await db.commit()
-            await db.refresh(db_message)
-
-            sender_info = {
-                "id": sender_id,
-                "username": current_user_show.username,
-                "avatar_url": current_user_show.avatar_url,
-            }
-            payload = {
-                "id": db_message.id,
-                "sender_info": sender_info,
-                "receiver_id": db_message.receiver_id,
-                "message": db_message.message,
-                "created_at": (
-                    db_message.timestamp.isoformat() if db_message.timestamp else None
-                ),
-            }
-
-            await ws_manager.send_personal_message(payload, receiver_id)
 
     except WebSocketDisconnect:
-        ws_manager.disconnect(current_user.id)
+        pass
+    finally:
+        await connection.wait_operations()
+        await ws_manager.disconnect(websocket)
+        await ws_fanout.unregister(current_user.id)  # type: ignore
+        await presence.disconnected(current_user.id)  # type: ignore
 
 
 @router.websocket("/notifications/{user_id}")
-async def websocket_notifications(websocket: WebSocket, user_id: int):
+async def websocket_notifications(
+    websocket: WebSocket, user_id: int, current_user: ActiveVerifiedWSUser
+):
     """
     WebSocket endpoint for real-time notifications.
 
     Connects to the WebSocket and listens for incoming notification events.
-    The user_id should match the authenticated user making the connection.
+    Authenticated like the chat sockets; the user_id must match the
+    authenticated user or the socket is closed with WS_1008_POLICY_VIOLATION.
 
     ## Message Types:
     - **notification**: Real-time notification (bid, payment, KYC, etc.)
     - **chat_message**: New chat message alert
-    - **status_update**: Property or contract status change
+    - **status_update**: Property or contract status change, for subscribed topics
+    - **subscribed** / **unsubscribed**: Topic subscription confirmed
     - **pong**: Server response to ping (keep-alive)
+    - **ping**: Server heartbeat; reply with `{type: 'pong'}` to stay connected
+
+    ## Topics:
+    Send `{type: 'subscribe', topic: 'property:12'}` to receive status updates
+    for a topic, and `{type: 'unsubscribe', topic: ...}` to stop. Topics are
+    `property:{id}`, `transaction:{bid_id}` and `agent:{id}`; a socket may
+    follow up to `WS_MAX_TOPICS` of them. Transaction topics are limited to the
+    bid's buyer and seller, and agent topics to that agent.
 
     ## Example Client Connection (JavaScript):
     ```javascript
-    const ws = new WebSocket('ws://localhost:8000/ws/notifications/123');
+    const ws = new WebSocket('ws://localhost:8000/ws/notifications/123?token=...');
     ws.onopen = () => console.log('Connected');
     ws.onmessage = (event) => {
         const data = JSON.parse(event.data);
         console.log('Notification:', data);
     };
     ws.send(JSON.stringify({type: 'ping'}));
+    ws.send(JSON.stringify({type: 'subscribe', topic: 'property:12'}));
     ```
     """
+    if current_user is None:
+        return
+    if current_user.id != user_id:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    connection = None
     try:
-        await websocket.accept()
-        ws_manager.connect(websocket, user_id)
+        # Connection already accepted by auth
+        connection = await ws_manager.connect(websocket, user_id, accept=False)
+        await ws_fanout.register(user_id)
+        await presence.connected(user_id)
         logger.info(f"Notification WebSocket connected: user_id={user_id}")
 
         # Send connection confirmation
-        await websocket.send_json(
+        ws_manager.send(
+            websocket,
             {
                 "type": "connected",
                 "user_id": user_id,
                 "message": "WebSocket connection established",
-            }
+            },
         )
 
         # Listen for incoming messages (e.g., pings)
         while True:
             try:
                 data = await websocket.receive_json()
+                connection.touch()
 
                 if data.get("type") == "ping":
-                    await websocket.send_json({"type": "pong"})
+                    ws_manager.send(websocket, {"type": "pong"})
                 elif data.get("type") == "subscribe":
-                    # Handle subscription to specific notification types
-                    notification_type = data.get("notification_type")
-                    logger.info(f"User {user_id} subscribed to {notification_type}")
+                    topic = str(data.get("topic", ""))
+                    if await ws_manager.subscribe(websocket, topic):
+                        await ws_fanout.subscribe_topic(topic)
+                        ws_manager.send(websocket, {"type": "subscribed", "topic": topic})
+                    else:
+                        ws_manager.send(
+                            websocket,
+                            WebSocketMessage.error(
+                                "Unknown, forbidden or too many topics",
+                                "invalid_topic",
+                                {"topic": topic},
+                            ),
+                        )
+                elif data.get("type") == "unsubscribe":
+                    topic = str(data.get("topic", ""))
+                    ws_manager.unsubscribe(websocket, topic)
+                    await ws_fanout.unsubscribe_topic(topic)
+                    ws_manager.send(websocket, {"type": "unsubscribed", "topic": topic})
 
             except Exception as e:
                 logger.error(f"Error reading message from notification WebSocket: {e}")
@@ -419,5 +530,25 @@ async def websocket_notifications(websocket: WebSocket, user_id: int):
     except Exception as e:
         logger.error(f"Notification WebSocket error: {e}")
     finally:
-        ws_manager.disconnect(user_id)
+        await ws_manager.disconnect(websocket)
+        await ws_fanout.unregister(user_id)
+        for topic in connection.topics if connection else ():
+            await ws_fanout.unsubscribe_topic(topic)
+        await presence.disconnected(user_id)
         logger.info(f"Notification WebSocket disconnected: user_id={user_id}")
+
+
+@router.get("/presence/online")
+async def online_count(current_user: ActiveUser):
+    """Number of users with a live WebSocket on any worker."""
+    return {"online": await presence.online_count()}
+
+
+@router.get("/presence/{user_id}")
+async def user_presence(user_id: int, current_user: ActiveUser):
+    """Whether a user is online and when they were last seen (epoch seconds)."""
+    return {
+        "user_id": user_id,
+        "online": await presence.is_online(user_id),
+        "last_seen": await presence.last_seen(user_id),
+    }
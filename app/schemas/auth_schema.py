@@ -1,7 +1,6 @@
 from pydantic import BaseModel, EmailStr, Field, BeforeValidator,AfterValidator
 from app.utils.enums import PhoneStr, AccountTypeEnum
 from typing import Union, Optional, Annotated, Literal
-from app.utils.utils import hash_password
 from typing import List
 
 
@@ -43,7 +42,7 @@ class OtpSchema(BaseModel):
 
 
 class PasswordReset(BaseModel):
-    password: Annotated[str, BeforeValidator(hash_password), Field(examples=["admin"])]
+    password: Annotated[str, Field(examples=["admin"])]
 
 
 class SwitchAccountType(BaseModel):
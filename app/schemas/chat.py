@@ -4,6 +4,7 @@ from typing import Optional, List, Annotated
 
 
 class ChatMessageSchema(BaseModel):
+    id: Optional[int] = None
     sender_id: int
     receiver_id: int
     message: str
@@ -20,6 +21,7 @@ class ChatPaginationParams(BaseModel):
     """Reusable pagination parameters for chat endpoints"""
     offset: Annotated[int, Field(ge=0, default=0, description="Number of items to skip")]
     limit: Annotated[int, Field(ge=1, le=200, default=50, description="Number of items to return")]
+    before_id: Optional[int] = Field(None, description="Return messages older than this message ID")
 
 
 class ConversationPaginationParams(BaseModel):
@@ -32,6 +34,7 @@ class MessageHistoryParams(BaseModel):
     """Parameters for message history endpoint"""
     offset: Annotated[int, Field(ge=0, default=0, description="Number of messages to skip")]
     limit: Annotated[int, Field(ge=1, le=200, default=100, description="Number of messages to return")]
+    before_id: Optional[int] = Field(None, description="Return messages older than this message ID")
     property_id: Optional[int] = Field(None, description="Filter by property ID")
 
 
@@ -108,6 +111,7 @@ class SendMessageResponse(BaseModel):
     property_id: Optional[int] = None
     is_read: bool = False
     sender_info: Optional[UserInfoSchema] = None
+    delivered: bool = False  # Written to the receiver's socket on some worker
 
     class Config:
         from_attributes = True
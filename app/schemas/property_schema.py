@@ -1,6 +1,11 @@
 from pydantic import BaseModel, AnyUrl, Field, field_validator,AfterValidator
 from typing import List, Union, Annotated, Optional
-from app.utils.enums import ListingTypeEnum, PropertyTypeEnum, PropertyStatEnum
+from app.utils.enums import (
+    ListingTypeEnum,
+    PropertyTypeEnum,
+    PropertyStatEnum,
+    FeedSortEnum,
+)
 from datetime import datetime, time
 from app.utils.enums import AppointmentStatEnum
 from app.utils.validators import PropertyValidators, ValidatorMixin
@@ -87,13 +92,53 @@ class FilterParams(BaseModel):
         int, Field(description="The amount of listings to fetch", ge=10, default=20)
     ]
     cursor: Annotated[
-        int, Field(description="The Id of the last listing", ge=1, default=1)
+        Optional[str],
+        Field(
+            description="Opaque cursor from `next_coursor` of the previous page",
+            default=None,
+        ),
+    ]
+    sort: Annotated[
+        FeedSortEnum, Field(description="Feed ordering", default=FeedSortEnum.newest)
+    ]
+    status: Optional[PropertyStatEnum] = None
+    listing_type: Optional[ListingTypeEnum] = None
+    property_type: Optional[PropertyTypeEnum] = None
+    min_price: Annotated[Optional[float], Field(ge=0, default=None)]
+    max_price: Annotated[Optional[float], Field(ge=0, default=None)]
+    min_bedroom: Annotated[Optional[int], Field(ge=0, default=None)]
+    max_bedroom: Annotated[Optional[int], Field(ge=0, default=None)]
+    min_bathroom: Annotated[Optional[int], Field(ge=0, default=None)]
+    location: Annotated[
+        Optional[str],
+        Field(description="Case-insensitive match on location", max_length=70, default=None),
     ]
 
 
 class PropertyFeed(BaseModel):
     data: List[PropertyShow]
-    next_coursor: int | None
+    next_coursor: str | None
+
+
+class PropertyCard(BaseModel):
+    """Listing card projection for feeds"""
+
+    id: int
+    title: str
+    price: float
+    location: str
+    bedroom: int
+    bathroom: int
+    primary_image_url: Optional[str] = None
+    agent_name: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class PropertyCardFeed(BaseModel):
+    data: List[PropertyCard]
+    next_coursor: str | None
 
 
 class DeleteProperty(BaseModel):
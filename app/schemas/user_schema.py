@@ -1,6 +1,6 @@
 from pydantic import BaseModel, BeforeValidator, AfterValidator, EmailStr, Field, AnyUrl
 from app.utils.enums import AccountTypeEnum
-from app.utils.utils import hash_password, decode_url
+from app.utils.utils import decode_url
 from datetime import datetime
 from app.utils.enums import KycStatusEnum, UserRole, PhoneStr
 from typing import Union, Literal, List, Optional, Annotated
@@ -32,7 +32,7 @@ class BaseUserSchema(BaseModel):
 class UserCreate(BaseModel):
     username: Annotated[str, Field(example="Admin", max_length=30)] = None  # type: ignore
     email: Annotated[EmailStr, Field(examples=["penivera655@gmail.com"])]
-    password: Annotated[str, BeforeValidator(hash_password), Field(examples=["admin"])]
+    password: Annotated[str, Field(examples=["admin"])]
 
 
 class AccountInfoBase(BaseModel):
@@ -1,5 +1,8 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models.user import BaseUser, Client, Agent
+from app.models.user import BaseUser, Client, Agent, ACCOUNT_TYPE_MODELS
+from app.models.loading import load_profile
+from app.services.profile import get_profile
+from app.services.principal_cache import get_principal_cache
 from fastapi import status, HTTPException, BackgroundTasks
 from sqlalchemy.future import select
 from email_validator import validate_email, EmailNotValidError
@@ -7,7 +10,7 @@ import re
 from app.schemas.auth_schema import LoginData, Token, TokenData, SignUpShow, SocialLoginRequest
 
 from app.schemas.user_schema import UserInDB, UserCreate, UserShow
-from app.utils.utils import verify_password
+from app.utils.hashing import hash_password_async, verify_and_update_async
 from app.utils.email import create_send_otp
 from datetime import datetime, timezone, timedelta
 from core.configs import settings
@@ -29,18 +32,17 @@ from jwt.exceptions import InvalidTokenError, ExpiredSignatureError
 from core.database import AsyncSessionLocal
 from pydantic import EmailStr
 from sqlalchemy import or_, and_
-from sqlalchemy.orm import selectinload
 
 
 # NOTE -  Create agent
 async def create_account(user_data: UserCreate, db: AsyncSession):
-    new_client = Client(**user_data.model_dump(), account_type=AccountTypeEnum.client)
-    new_agent = Agent(**user_data.model_dump(), account_type=AccountTypeEnum.agent)
+    data = user_data.model_dump()
+    data["password"] = await hash_password_async(user_data.password)
+    new_client = Client(**data, account_type=AccountTypeEnum.client)
+    new_agent = Agent(**data, account_type=AccountTypeEnum.agent)
     try:
         db.add_all([new_client, new_agent])
         await db.commit()
-        await db.refresh(new_client)
-        await db.refresh(new_agent)
         logger.info(f"User {new_client.email} created")  # type:ignore
         return new_client
     except IntegrityError:
@@ -58,27 +60,22 @@ async def get_user(
 ) -> BaseUser | Client | Agent:
     """Fetch a user based on email, phone, or username and account type."""
 
-    # Start with common options for BaseUser
-    options = [selectinload(BaseUser.account_info)]
-
-    # Conditionally add agent-specific options
-    if account_type == AccountTypeEnum.agent:
-        options.append(selectinload(Agent.listings))
-        options.append(selectinload(Agent.availabilities))
+    # Query the concrete model so subclass columns come back in the same SELECT
+    model = ACCOUNT_TYPE_MODELS.get(account_type, BaseUser)
     conditions = [
-        BaseUser.email == identifier,
-        BaseUser.username == identifier,
-        BaseUser.phone_number == identifier,
+        model.email == identifier,
+        model.username == identifier,
+        model.phone_number == identifier,
     ]
     if identifier.isdigit():
-        conditions.append(BaseUser.id == int(identifier))
+        conditions.append(model.id == int(identifier))
 
     query = (
-        select(BaseUser)
-        .options(*options)
+        select(model)
+        .options(*load_profile("auth-minimal", model))
         .where(
             and_(
-                BaseUser.account_type == account_type,
+                model.account_type == account_type,
                 or_(*conditions),
             )
         )
@@ -89,8 +86,6 @@ async def get_user(
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
         )
-    user.last_seen = datetime.now(timezone.utc)
-    await db.refresh(user)
     return user
 
 
@@ -100,10 +95,19 @@ async def authenticate_user(login_data: LoginData, db: AsyncSession) -> UserInDB
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid Username"
         )
-    if not verify_password(login_data.password, user.password):
+    is_valid, new_hash = await verify_and_update_async(
+        login_data.password, user.password
+    )
+    if not is_valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid Password"
         )
+    if new_hash:
+        # NOTE - Stored hash predates the current bcrypt cost; upgrade it
+        user.password = new_hash
+        db.add(user)
+        await db.commit()
+        logger.info(f"Password hash upgraded for user {user.id}")
     return user
 
 
@@ -129,7 +133,7 @@ async def process_signup(
     access_token = await create_access_token(data=token_data)
     return SignUpShow(
         token=Token(access_token=access_token),
-        user_data=UserShow.model_validate(new_user),
+        user_data=UserShow.model_validate(await get_profile(new_user.id, db, Client)),
     )
 
 
@@ -156,6 +160,7 @@ async def process_social_login(
                 db.add(user)
                 await db.commit()
                 await db.refresh(user)
+                await get_principal_cache().invalidate(user.id, user.account_type)
         except HTTPException:
             # User doesn't exist, create account
             username = idinfo.get("name") or idinfo.get("given_name") or email.split("@")[0]
@@ -186,7 +191,7 @@ async def process_social_login(
         
         return SignUpShow(
             token=Token(access_token=access_token),
-            user_data=UserShow.model_validate(user),
+            user_data=UserShow.model_validate(await get_profile(user.id, db, Client)),
         )
             
     except ValueError as e:
@@ -222,6 +227,7 @@ async def switch_account(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"{switch_to} account not found",
         )
+    await get_principal_cache().invalidate(current_user.id, current_user.account_type)  # type: ignore
     scopes = [switch_to]
     new_token = await create_access_token(
         data=TokenData(sub=user.id, scopes=scopes)  # type: ignore
@@ -1,20 +1,29 @@
-"""Cache service for Redis operations."""
+"""Cache service for Redis operations, with an in-process L1 in front."""
 
-from typing import Any, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 from datetime import timedelta
 import redis.asyncio as redis
 from app.utils.cache import (
     get_cached,
     set_cached,
     delete_cached,
-    clear_pattern,
+    get_many_cached,
+    set_many_cached,
+    delete_many_cached,
+    bump_generations,
+    get_generation,
+    read_through,
+    set_versioned,
     CACHE_TTL,
 )
+from app.utils.local_cache import MISSING, get_local_cache, publish_invalidation
 from app.utils.cache_keys import (
     user_profile_key,
     user_listings_key,
     property_feed_key,
     property_detail_key,
+    property_card_key,
+    property_summary_key,
     search_results_key,
     agent_profile_key,
     agent_stats_key,
@@ -23,6 +32,13 @@ from app.utils.cache_keys import (
     system_config_key,
     notification_key,
     device_tokens_key,
+    tagged_key,
+    user_tag,
+    agent_tag,
+    chat_tag,
+    contract_tag,
+    PROPERTY_FEED_TAG,
+    SEARCH_TAG,
     invalidate_user_cache,
     invalidate_property_cache,
     invalidate_listing_cache,
@@ -45,178 +61,363 @@ class CacheService:
         """
         self.redis = redis_client
 
+    async def _tagged(self, key: str, tag: str) -> Optional[str]:
+        """Scope a key to its tag's current generation (None if unavailable)."""
+        generation = await get_generation(self.redis, tag)
+        if generation is None:
+            return None
+        return tagged_key(key, generation)
+
+    async def _get(
+        self, namespace: str, key: str, tag: Optional[str] = None
+    ) -> Optional[Any]:
+        """Get from L1, falling back to Redis (scoped to ``tag`` if given)."""
+        local = get_local_cache()
+        value = local.get(namespace, key)
+        if value is not MISSING:
+            return value
+        scoped = key if tag is None else await self._tagged(key, tag)
+        value = await get_cached(self.redis, scoped) if scoped else None
+        if value is None:
+            local.record_miss(namespace)
+            return None
+        local.record_l2_hit(namespace)
+        local.set(namespace, key, value, tag)
+        return value
+
+    async def _set(
+        self,
+        namespace: str,
+        key: str,
+        value: Any,
+        ttl: timedelta,
+        tag: Optional[str] = None,
+    ) -> bool:
+        """Write to Redis and L1."""
+        scoped = key if tag is None else await self._tagged(key, tag)
+        if not scoped:
+            return False
+        get_local_cache().set(namespace, key, value, tag)
+        return await set_cached(self.redis, scoped, value, ttl)
+
+    async def _delete(self, namespace: str, key: str) -> bool:
+        """Delete a key from Redis and from every worker's L1."""
+        # NOTE - Clear Redis first so a peer refilling L1 meanwhile cannot
+        # pick up the stale value
+        deleted = await delete_cached(self.redis, key)
+        await publish_invalidation(self.redis, keys=[(namespace, key)])
+        return deleted
+
+    async def get_many(self, namespace: str, keys: List[str]) -> Dict[str, Any]:
+        """Get several keys: L1 first, the rest in one Redis MGET.
+
+        Args:
+            namespace: Cache namespace (L1 config and counters)
+            keys: Cache keys (untagged)
+
+        Returns:
+            Mapping of found keys to values
+        """
+        local = get_local_cache()
+        found, remote = {}, []
+        for key in keys:
+            value = local.get(namespace, key)
+            if value is MISSING:
+                remote.append(key)
+            else:
+                found[key] = value
+
+        fetched = await get_many_cached(self.redis, remote)
+        for key in remote:
+            if key in fetched:
+                local.record_l2_hit(namespace)
+                local.set(namespace, key, fetched[key])
+            else:
+                local.record_miss(namespace)
+        found.update(fetched)
+        return found
+
+    async def set_many(
+        self,
+        namespace: str,
+        items: Dict[str, Any],
+        ttl: Union[timedelta, Dict[str, timedelta]],
+    ) -> bool:
+        """Set several keys in one pipelined round trip.
+
+        Args:
+            namespace: Cache namespace
+            items: Mapping of keys to values
+            ttl: One TTL for every key, or a TTL per key
+        """
+        local = get_local_cache()
+        for key, value in items.items():
+            local.set(namespace, key, value)
+        return await set_many_cached(self.redis, items, ttl)
+
+    async def delete_many(self, namespace: str, keys: List[str]) -> int:
+        """Delete several keys from Redis and from every worker's L1.
+
+        Returns:
+            Number of keys deleted from Redis
+        """
+        deleted = await delete_many_cached(self.redis, keys)
+        # NOTE - After the Redis delete, so no worker refills from the old values
+        await publish_invalidation(self.redis, keys=[(namespace, key) for key in keys])
+        return deleted
+
+    async def _invalidate_tags(self, tags: list[str], **extra) -> int:
+        count = await bump_generations(self.redis, tags)
+        await publish_invalidation(self.redis, tags=tags)
+        logger.info(f"Cache tags invalidated", extra={"tags": tags, **extra})
+        return count
+
     # User profile operations
     async def get_user_profile(self, user_id: int) -> Optional[dict]:
         """Get cached user profile."""
-        return await get_cached(self.redis, user_profile_key(user_id))
+        return await self._get(
+            "user_profile", user_profile_key(user_id), user_tag(user_id)
+        )
 
     async def set_user_profile(self, user_id: int, profile: dict) -> bool:
         """Cache user profile."""
-        return await set_cached(
-            self.redis, user_profile_key(user_id), profile, CACHE_TTL["user_profile"]
+        return await self._set(
+            "user_profile",
+            user_profile_key(user_id),
+            profile,
+            CACHE_TTL["user_profile"],
+            tag=user_tag(user_id),
         )
 
     async def invalidate_user(self, user_id: int) -> int:
         """Invalidate all user caches."""
-        count = 0
-        for pattern in invalidate_user_cache(user_id):
-            count += await clear_pattern(self.redis, pattern)
-        logger.info(
-            f"User cache invalidated", extra={"user_id": user_id, "keys_deleted": count}
+        return await self._invalidate_tags(
+            invalidate_user_cache(user_id), user_id=user_id
         )
-        return count
 
     # Property feed operations
     async def get_property_feed(
         self, page: int = 1, filters_hash: str = ""
     ) -> Optional[dict]:
         """Get cached property feed."""
-        return await get_cached(self.redis, property_feed_key(page, filters_hash))
+        return await self._get(
+            "property_feed", property_feed_key(page, filters_hash), PROPERTY_FEED_TAG
+        )
 
     async def set_property_feed(self, page: int, filters_hash: str, feed: dict) -> bool:
         """Cache property feed."""
-        return await set_cached(
-            self.redis,
+        return await self._set(
+            "property_feed",
             property_feed_key(page, filters_hash),
             feed,
             CACHE_TTL["property_feed"],
+            tag=PROPERTY_FEED_TAG,
         )
 
     # Property detail operations
-    async def get_property_detail(self, property_id: int) -> Optional[dict]:
-        """Get cached property detail."""
-        return await get_cached(self.redis, property_detail_key(property_id))
+    async def get_property_detail(
+        self,
+        property_id: int,
+        loader: Callable[[], Awaitable[Tuple[dict, Optional[int]]]],
+    ) -> dict:
+        """Get property detail, loading it through the cache on a miss.
+
+        Args:
+            property_id: Property ID
+            loader: Coroutine factory returning ``(detail, version)``
 
-    async def set_property_detail(self, property_id: int, detail: dict) -> bool:
-        """Cache property detail."""
-        return await set_cached(
+        Returns:
+            Serialized property detail
+        """
+        local = get_local_cache()
+        key = property_detail_key(property_id)
+        detail = local.get("property_detail", key)
+        if detail is not MISSING:
+            return detail
+
+        loaded = False
+
+        async def load():
+            nonlocal loaded
+            loaded = True
+            return await loader()
+
+        detail = await read_through(self.redis, key, load, CACHE_TTL["property_detail"])
+        if loaded:
+            local.record_miss("property_detail")
+        else:
+            local.record_l2_hit("property_detail")
+        local.set("property_detail", key, detail)
+        return detail
+
+    async def set_property_detail(
+        self, property_id: int, detail: dict, version: Optional[int]
+    ) -> bool:
+        """Cache property detail unless a newer version is already cached."""
+        stored = await set_versioned(
             self.redis,
             property_detail_key(property_id),
             detail,
+            version,
             CACHE_TTL["property_detail"],
         )
+        # NOTE - Invalidate L1 only after Redis holds the new detail, or a
+        # peer could refill its L1 from the old value in between
+        await publish_invalidation(
+            self.redis, keys=[("property_detail", property_detail_key(property_id))]
+        )
+        return stored
+
+    async def invalidate_property_detail(self, property_id: int) -> bool:
+        """Invalidate a single property detail."""
+        return await self._delete("property_detail", property_detail_key(property_id))
+
+    # Property feed entries (PropertyShow per property, shared by feed pages)
+    async def get_property_cards(self, property_ids: List[int]) -> Dict[int, dict]:
+        """Get cached feed entries for several properties in one round trip."""
+        keys = {property_card_key(pid): pid for pid in property_ids}
+        found = await self.get_many("property_card", list(keys))
+        return {keys[key]: value for key, value in found.items()}
+
+    async def set_property_cards(self, cards: Dict[int, dict]) -> bool:
+        """Cache feed entries for several properties in one round trip."""
+        return await self.set_many(
+            "property_card",
+            {property_card_key(pid): card for pid, card in cards.items()},
+            CACHE_TTL["property_card"],
+        )
 
-    async def invalidate_properties(self) -> int:
-        """Invalidate all property caches."""
-        count = 0
-        patterns = [
-            "property:detail:*",
-            "property:feed:*",
-            "search:*",
-        ]
-        for pattern in patterns:
-            count += await clear_pattern(self.redis, pattern)
-        logger.info(f"Property cache invalidated", extra={"keys_deleted": count})
-        return count
+    async def invalidate_property(self, property_id: int) -> int:
+        """Invalidate a property's detail, feed entry and summary, and every feed and search page."""
+        await self.invalidate_property_detail(property_id)
+        await self.delete_many("property_card", [property_card_key(property_id)])
+        # Summaries live only in L1
+        await publish_invalidation(
+            self.redis, keys=[("property_summary", property_summary_key(property_id))]
+        )
+        return await self._invalidate_tags(
+            invalidate_property_cache(property_id), property_id=property_id
+        )
 
     # Search operations
     async def get_search_results(self, query: str, filters_hash: str) -> Optional[dict]:
         """Get cached search results."""
-        return await get_cached(self.redis, search_results_key(query, filters_hash))
+        return await self._get(
+            "search_results", search_results_key(query, filters_hash), SEARCH_TAG
+        )
 
     async def set_search_results(
         self, query: str, filters_hash: str, results: dict
     ) -> bool:
         """Cache search results."""
-        return await set_cached(
-            self.redis,
+        return await self._set(
+            "search_results",
             search_results_key(query, filters_hash),
             results,
             CACHE_TTL["search_results"],
+            tag=SEARCH_TAG,
         )
 
     # Agent operations
     async def get_agent_profile(self, agent_id: int) -> Optional[dict]:
         """Get cached agent profile."""
-        return await get_cached(self.redis, agent_profile_key(agent_id))
+        return await self._get(
+            "agent_profile", agent_profile_key(agent_id), agent_tag(agent_id)
+        )
 
     async def set_agent_profile(self, agent_id: int, profile: dict) -> bool:
         """Cache agent profile."""
-        return await set_cached(
-            self.redis, agent_profile_key(agent_id), profile, CACHE_TTL["user_profile"]
+        return await self._set(
+            "agent_profile",
+            agent_profile_key(agent_id),
+            profile,
+            CACHE_TTL["user_profile"],
+            tag=agent_tag(agent_id),
         )
 
     async def get_agent_stats(self, agent_id: int) -> Optional[dict]:
         """Get cached agent statistics."""
-        return await get_cached(self.redis, agent_stats_key(agent_id))
+        return await self._get(
+            "agent_stats", agent_stats_key(agent_id), agent_tag(agent_id)
+        )
 
     async def set_agent_stats(self, agent_id: int, stats: dict) -> bool:
         """Cache agent statistics."""
-        return await set_cached(
-            self.redis, agent_stats_key(agent_id), stats, CACHE_TTL["user_stats"]
+        return await self._set(
+            "agent_stats",
+            agent_stats_key(agent_id),
+            stats,
+            CACHE_TTL["user_stats"],
+            tag=agent_tag(agent_id),
         )
 
     async def invalidate_agent(self, agent_id: int) -> int:
         """Invalidate all agent caches."""
-        count = 0
-        for pattern in invalidate_listing_cache(agent_id):
-            count += await clear_pattern(self.redis, pattern)
-        logger.info(
-            f"Agent cache invalidated",
-            extra={"agent_id": agent_id, "keys_deleted": count},
+        return await self._invalidate_tags(
+            invalidate_listing_cache(agent_id), agent_id=agent_id
         )
-        return count
 
     # Contract operations
     async def get_contract(self, contract_id: int) -> Optional[dict]:
         """Get cached contract."""
-        return await get_cached(self.redis, contract_key(contract_id))
+        return await self._get(
+            "contract", contract_key(contract_id), contract_tag(contract_id)
+        )
 
     async def set_contract(self, contract_id: int, contract: dict) -> bool:
         """Cache contract."""
-        return await set_cached(
-            self.redis, contract_key(contract_id), contract, CACHE_TTL["contract"]
+        return await self._set(
+            "contract",
+            contract_key(contract_id),
+            contract,
+            CACHE_TTL["contract"],
+            tag=contract_tag(contract_id),
         )
 
     async def invalidate_contract(self, contract_id: int) -> int:
         """Invalidate contract cache."""
-        count = 0
-        for pattern in invalidate_contract_cache(contract_id):
-            count += await clear_pattern(self.redis, pattern)
-        logger.info(
-            f"Contract cache invalidated",
-            extra={"contract_id": contract_id, "keys_deleted": count},
+        return await self._invalidate_tags(
+            invalidate_contract_cache(contract_id), contract_id=contract_id
         )
-        return count
 
     # Chat operations
     async def get_chat_history(
         self, conversation_id: int, page: int = 1
     ) -> Optional[dict]:
         """Get cached chat history."""
-        return await get_cached(self.redis, chat_history_key(conversation_id, page))
+        return await self._get(
+            "chat_history",
+            chat_history_key(conversation_id, page),
+            chat_tag(conversation_id),
+        )
 
     async def set_chat_history(
         self, conversation_id: int, page: int, history: dict
     ) -> bool:
         """Cache chat history."""
-        return await set_cached(
-            self.redis,
+        return await self._set(
+            "chat_history",
             chat_history_key(conversation_id, page),
             history,
             CACHE_TTL["chat_history"],
+            tag=chat_tag(conversation_id),
         )
 
     async def invalidate_chat(self, conversation_id: int) -> int:
         """Invalidate chat cache."""
-        count = 0
-        for pattern in invalidate_chat_cache(conversation_id):
-            count += await clear_pattern(self.redis, pattern)
-        logger.info(
-            f"Chat cache invalidated",
-            extra={"conversation_id": conversation_id, "keys_deleted": count},
+        return await self._invalidate_tags(
+            invalidate_chat_cache(conversation_id), conversation_id=conversation_id
         )
-        return count
 
     # Notification operations
     async def get_notifications(self, user_id: int) -> Optional[list]:
         """Get cached notifications."""
-        return await get_cached(self.redis, notification_key(user_id))
+        return await self._get("notifications", notification_key(user_id))
 
     async def set_notifications(self, user_id: int, notifications: list) -> bool:
         """Cache notifications."""
-        return await set_cached(
-            self.redis,
+        return await self._set(
+            "notifications",
             notification_key(user_id),
             notifications,
             CACHE_TTL["chat_history"],
@@ -224,32 +425,35 @@ class CacheService:
 
     async def invalidate_notifications(self, user_id: int) -> bool:
         """Invalidate user notifications."""
-        return await delete_cached(self.redis, notification_key(user_id))
+        return await self._delete("notifications", notification_key(user_id))
 
     # Device operations
     async def get_device_tokens(self, user_id: int) -> Optional[list]:
         """Get cached device tokens."""
-        return await get_cached(self.redis, device_tokens_key(user_id))
+        return await self._get("device_tokens", device_tokens_key(user_id))
 
     async def set_device_tokens(self, user_id: int, tokens: list) -> bool:
         """Cache device tokens."""
-        return await set_cached(
-            self.redis, device_tokens_key(user_id), tokens, CACHE_TTL["chat_history"]
+        return await self._set(
+            "device_tokens",
+            device_tokens_key(user_id),
+            tokens,
+            CACHE_TTL["chat_history"],
         )
 
     async def invalidate_device_tokens(self, user_id: int) -> bool:
         """Invalidate user device tokens."""
-        return await delete_cached(self.redis, device_tokens_key(user_id))
+        return await self._delete("device_tokens", device_tokens_key(user_id))
 
     # System config operations
     async def get_config(self, key: str) -> Optional[Any]:
         """Get cached system config."""
-        return await get_cached(self.redis, system_config_key(key))
+        return await self._get("system_config", system_config_key(key))
 
     async def set_config(self, key: str, value: Any) -> bool:
         """Cache system config."""
-        return await set_cached(
-            self.redis, system_config_key(key), value, CACHE_TTL["system_config"]
+        return await self._set(
+            "system_config", system_config_key(key), value, CACHE_TTL["system_config"]
         )
 
     # Health check
@@ -265,17 +469,25 @@ class CacheService:
 
     # Stats
     async def get_stats(self) -> dict:
-        """Get cache statistics."""
+        """Get cache statistics.
+
+        Returns:
+            Redis memory usage plus this worker's hit, miss and eviction
+            counters per namespace
+        """
+        stats = {"namespaces": get_local_cache().stats()}
         try:
             info = await self.redis.info("memory")
-            return {
-                "used_memory": info.get("used_memory_human"),
-                "used_memory_peak": info.get("used_memory_peak_human"),
-                "connected_clients": await self.redis.client_list(),
-            }
+            stats.update(
+                {
+                    "used_memory": info.get("used_memory_human"),
+                    "used_memory_peak": info.get("used_memory_peak_human"),
+                    "connected_clients": await self.redis.client_list(),
+                }
+            )
         except Exception as e:
             logger.error(f"Failed to get cache stats: {e}")
-            return {}
+        return stats
 
 
 async def get_cache_service() -> CacheService:
@@ -284,7 +496,7 @@ async def get_cache_service() -> CacheService:
     Returns:
         CacheService instance
     """
-    from core.database import get_redis
+    from core.database import get_cache_redis
 
-    redis_client = await get_redis()
+    redis_client = await get_cache_redis()
     return CacheService(redis_client)
@@ -0,0 +1,202 @@
+"""
+Group-commit pipeline for chat messages arriving over WebSockets.
+Handlers submit messages to an in-process queue; one writer task drains it
+every few milliseconds and stores the whole batch with a multi-row
+``INSERT ... RETURNING`` plus one conversation upsert, in a single
+transaction. Each sender is then acknowledged with its message's ID, and a
+database connection is only held while a batch is being written.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.chat import ChatMessage
+from app.services.conversations import record_messages
+from core.configs import settings
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+_Pending = Tuple[ChatMessage, asyncio.Future]
+
+
+class ChatIngest:
+    """Batch chat message inserts from many sockets into group commits."""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        max_batch: Optional[int] = None,
+        max_delay: Optional[float] = None,
+        queue_size: Optional[int] = None,
+    ):
+        """Initialize pipeline.
+
+        Args:
+            session_factory: Session factory (the WebSocket pool by default)
+            max_batch: Most messages per commit (settings default)
+            max_delay: Seconds a message waits for a batch to fill (settings default)
+            queue_size: Messages buffered before ``submit`` waits (settings default)
+        """
+        if session_factory is None:
+            from core.database import WSSessionLocal
+
+            session_factory = WSSessionLocal
+        self.session_factory = session_factory
+        self.max_batch = max_batch or settings.CHAT_INGEST_MAX_BATCH
+        self.max_delay = (
+            max_delay
+            if max_delay is not None
+            else settings.CHAT_INGEST_MAX_DELAY_MS / 1000
+        )
+        self.queue_size = queue_size or settings.CHAT_INGEST_QUEUE_SIZE
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+
+    async def submit(
+        self,
+        sender_id: int,
+        receiver_id: int,
+        message: str,
+        property_id: Optional[int] = None,
+    ) -> ChatMessage:
+        """Queue a message and wait until its batch is committed.
+
+        Args:
+            sender_id: Sending user
+            receiver_id: Receiving user
+            message: Message text
+            property_id: Optional property under discussion
+
+        Returns:
+            The stored message (detached) with its ID and timestamp
+
+        Raises:
+            Exception: Whatever the database raised for this message
+        """
+        self._ensure_writer()
+        chat_message = ChatMessage(
+            sender_id=sender_id,
+            receiver_id=receiver_id,
+            message=message,
+            property_id=property_id,
+            is_read=False,
+            timestamp=datetime.now(timezone.utc),
+        )
+        stored = asyncio.get_running_loop().create_future()
+        await self._queue.put((chat_message, stored))
+        return await stored
+
+    async def close(self) -> None:
+        """Write everything still queued, then stop the writer."""
+        if self._writer is None or self._writer.done():
+            return
+        await self._queue.join()
+        self._writer.cancel()
+        try:
+            await self._writer
+        except asyncio.CancelledError:
+            pass
+        self._writer = None
+
+    def _ensure_writer(self) -> None:
+        if self._writer is None or self._writer.done():
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._writer = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(
+                        await asyncio.wait_for(self._queue.get(), remaining)
+                    )
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _write(self, batch: List[_Pending]) -> None:
+        try:
+            await self._commit(batch)
+        except Exception as e:
+            if len(batch) == 1:
+                self._fail(batch[0], e)
+                return
+            # NOTE - One bad message (e.g. unknown receiver) must not fail
+            # the others; retry them one by one to isolate it
+            logger.warning(f"Chat group commit failed, retrying singly: {e}")
+            for pending in batch:
+                await self._write([pending])
+            return
+        for message, stored in batch:
+            if not stored.done():
+                stored.set_result(message)
+
+    async def _commit(self, batch: List[_Pending]) -> None:
+        messages = [message for message, _ in batch]
+        async with self.session_factory() as db:
+            # NOTE - PostgreSQL returns batched IDs in parameter order; SQLite
+            # would fall back to a statement per row for that, but assigns
+            # rowids in VALUES order, so its IDs are simply sorted instead
+            ordered = db.get_bind().dialect.name == "postgresql"
+            result = await db.execute(
+                insert(ChatMessage).returning(
+                    ChatMessage.id, sort_by_parameter_order=ordered
+                ),
+                [
+                    {
+                        "sender_id": message.sender_id,
+                        "receiver_id": message.receiver_id,
+                        "message": message.message,
+                        "property_id": message.property_id,
+                        "is_read": message.is_read,
+                        "timestamp": message.timestamp,
+                    }
+                    for message in messages
+                ],
+            )
+            ids = result.scalars().all()
+            if not ordered:
+                ids = sorted(ids)
+            for message, message_id in zip(messages, ids):
+                message.id = message_id
+            await record_messages(db, messages)
+            await db.commit()
+        from core.database import mark_recent_writes
+
+        # NOTE - Socket writes skip get_db; pin senders' history reads to the
+        # primary so they see their own messages, as REST writes do
+        await mark_recent_writes(message.sender_id for message in messages)
+
+    @staticmethod
+    def _fail(pending: _Pending, error: Exception) -> None:
+        message, stored = pending
+        message.id = None
+        if not stored.done():
+            stored.set_exception(error)
+
+
+# Global pipeline instance
+_ingest: Optional[ChatIngest] = None
+
+
+def get_chat_ingest() -> ChatIngest:
+    """Get the process-wide chat ingest pipeline."""
+    global _ingest
+    if _ingest is None:
+        _ingest = ChatIngest()
+    return _ingest
@@ -0,0 +1,372 @@
+"""
+Conversation summaries for O(1) inbox reads.
+Every message insert upserts its pair's ``conversation`` row in the same
+transaction (last message pointer, per-side unread counter), so the inbox and
+unread badge read one small indexed table instead of scanning ``chat_message``.
+"""
+
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import case, func, select, union_all, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.models.chat import ChatMessage, Conversation
+from app.models.property import Property, PropertyImage
+from app.models.user import BaseUser
+from app.schemas.chat import PropertyInfoSchema
+from app.utils.cache_keys import property_summary_key
+from app.utils.local_cache import MISSING, get_local_cache
+
+UPSERT_INSERTS = {
+    "postgresql": pg_insert,
+    "sqlite": sqlite_insert,
+}
+
+
+def conversation_pair(user_a: int, user_b: int) -> Tuple[int, int]:
+    """Order two user IDs as ``(low, high)``."""
+    return (user_a, user_b) if user_a <= user_b else (user_b, user_a)
+
+
+async def record_message(db: AsyncSession, message: ChatMessage) -> None:
+    """Fold a flushed message into its conversation summary.
+
+    Runs one atomic upsert, so concurrent first messages between a pair
+    cannot create two rows and counters are never lost. The caller commits.
+
+    Args:
+        db: Session holding the flushed message
+        message: Message with its ID and timestamp assigned
+    """
+    await record_messages(db, [message])
+
+
+async def record_messages(db: AsyncSession, messages: Iterable[ChatMessage]) -> None:
+    """Fold a batch of stored messages into their conversation summaries.
+
+    Messages are combined per pair first, so the whole batch is a single
+    multi-row upsert with one row per conversation. The caller commits.
+
+    Args:
+        db: Session that stored the messages
+        messages: Messages with their IDs and timestamps assigned
+    """
+    rows: Dict[Tuple[int, int], dict] = {}
+    for message in messages:
+        low, high = conversation_pair(message.sender_id, message.receiver_id)
+        unread = not message.is_read and message.sender_id != message.receiver_id
+        row = rows.setdefault(
+            (low, high),
+            {
+                "user_low_id": low,
+                "user_high_id": high,
+                "last_message_id": None,
+                "unread_low": 0,
+                "unread_high": 0,
+            },
+        )
+        row["unread_low"] += int(unread and message.receiver_id == low)
+        row["unread_high"] += int(unread and message.receiver_id == high)
+        if row["last_message_id"] is None or message.id > row["last_message_id"]:
+            row.update(
+                last_message_id=message.id,
+                last_message_at=message.timestamp,
+                last_sender_id=message.sender_id,
+                last_property_id=message.property_id,
+            )
+    if not rows:
+        return
+
+    insert = UPSERT_INSERTS[db.get_bind().dialect.name]
+    # Sorted so concurrent batches lock conversation rows in the same order
+    stmt = insert(Conversation).values([rows[pair] for pair in sorted(rows)])
+    table = Conversation.__table__
+    # NOTE - Message IDs are monotonic; an older message arriving late only
+    # bumps the counters and keeps the newer last-message pointer
+    newer = stmt.excluded.last_message_id > func.coalesce(table.c.last_message_id, 0)
+    last_columns = (
+        "last_message_id",
+        "last_message_at",
+        "last_sender_id",
+        "last_property_id",
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_low_id", "user_high_id"],
+        set_={
+            **{
+                column: case(
+                    (newer, stmt.excluded[column]), else_=table.c[column]
+                )
+                for column in last_columns
+            },
+            "unread_low": table.c.unread_low + stmt.excluded.unread_low,
+            "unread_high": table.c.unread_high + stmt.excluded.unread_high,
+        },
+    )
+    await db.execute(stmt)
+
+
+async def reset_unread(
+    db: AsyncSession, reader_id: int, other_user_id: int, read: Optional[int] = None
+) -> None:
+    """Lower the reader's unread counter for a conversation. The caller commits.
+
+    Args:
+        db: Database session
+        reader_id: User who read the messages
+        other_user_id: The other side of the conversation
+        read: Messages just marked read, or None to zero the counter
+    """
+    low, high = conversation_pair(reader_id, other_user_id)
+    column = Conversation.unread_low if reader_id == low else Conversation.unread_high
+    value = 0 if read is None else case((column > read, column - read), else_=0)
+    await db.execute(
+        update(Conversation)
+        .where(Conversation.user_low_id == low, Conversation.user_high_id == high)
+        .values({column: value})
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def mark_read(
+    db: AsyncSession,
+    reader_id: int,
+    sender_id: int,
+    up_to_id: Optional[int] = None,
+) -> int:
+    """Mark a sender's messages to the reader as read in one UPDATE.
+
+    The caller commits.
+
+    Args:
+        db: Database session
+        reader_id: User who read the messages
+        sender_id: User who sent them
+        up_to_id: Watermark; only messages with this ID or lower are marked
+
+    Returns:
+        Number of messages marked
+    """
+    stmt = update(ChatMessage).where(
+        ChatMessage.sender_id == sender_id,
+        ChatMessage.receiver_id == reader_id,
+        ChatMessage.is_read == False,  # noqa: E712 - SQLAlchemy requires == for SQL generation
+    )
+    if up_to_id is not None:
+        stmt = stmt.where(ChatMessage.id <= up_to_id)
+    result = await db.execute(
+        stmt.values(is_read=True).execution_options(synchronize_session=False)
+    )
+    marked = result.rowcount
+    if marked or up_to_id is None:
+        # A full mark-read also heals a drifted counter
+        await reset_unread(
+            db, reader_id, sender_id, read=None if up_to_id is None else marked
+        )
+    return marked
+
+
+def _my_side(user_id: int, depth: Optional[int] = None):
+    """The user's conversations as ``(other_user_id, unread, ...)`` rows.
+
+    One range scan per side of the pair; with ``depth`` each side is cut to
+    its ``depth`` most recent conversations before the union.
+    """
+    branches = []
+    for mine, other, unread in (
+        (Conversation.user_low_id, Conversation.user_high_id, Conversation.unread_low),
+        (Conversation.user_high_id, Conversation.user_low_id, Conversation.unread_high),
+    ):
+        branch = select(
+            Conversation.id.label("conversation_id"),
+            other.label("other_user_id"),
+            unread.label("unread"),
+            Conversation.last_message_id,
+            Conversation.last_message_at,
+            Conversation.last_sender_id,
+            Conversation.last_property_id,
+        ).where(mine == user_id)
+        if mine is Conversation.user_high_id:
+            # A self-conversation matches both sides; list it once
+            branch = branch.where(Conversation.user_low_id != user_id)
+        if depth is not None:
+            branch = branch.order_by(
+                Conversation.last_message_at.desc(), Conversation.id.desc()
+            ).limit(depth)
+        branches.append(select(branch.subquery()))
+    return union_all(*branches).subquery()
+
+
+def inbox_query(user_id: int, offset: int, limit: int):
+    """Single-statement inbox page with partner, last message and property title.
+
+    Args:
+        user_id: Inbox owner
+        offset: Conversations to skip
+        limit: Conversations to return
+    """
+    side = _my_side(user_id, depth=offset + limit)
+    user = BaseUser.__table__
+    message = ChatMessage.__table__
+    property_table = Property.__table__
+    return (
+        select(
+            side.c.other_user_id,
+            side.c.unread,
+            side.c.last_message_at,
+            side.c.last_sender_id,
+            side.c.last_property_id,
+            message.c.message.label("last_message"),
+            user.c.username,
+            user.c.avatar_url,
+            user.c.fullname,
+            property_table.c.title.label("property_title"),
+        )
+        .select_from(side)
+        .outerjoin(message, message.c.id == side.c.last_message_id)
+        .outerjoin(user, user.c.id == side.c.other_user_id)
+        .outerjoin(property_table, property_table.c.id == side.c.last_property_id)
+        .order_by(side.c.last_message_at.desc(), side.c.conversation_id.desc())
+        .offset(offset)
+        .limit(limit)
+    )
+
+
+def unread_totals_query(user_id: int):
+    """``(total_unread, conversations_with_unread)`` for a user in one statement."""
+    side = _my_side(user_id)
+    return select(
+        func.coalesce(func.sum(side.c.unread), 0),
+        func.coalesce(func.sum(case((side.c.unread > 0, 1), else_=0)), 0),
+    )
+
+
+def history_query(
+    user_id: int,
+    other_user_id: int,
+    limit: int,
+    offset: int = 0,
+    before_id: Optional[int] = None,
+    property_id: Optional[int] = None,
+):
+    """Newest-first messages between two users, keyset-paged by message ID.
+
+    Each direction of the conversation is its own range scan on
+    ``(sender_id, receiver_id, id)``, cut to the page size before the union,
+    so the cost of a page does not grow with how far back it is.
+
+    Args:
+        user_id: One side of the conversation
+        other_user_id: The other side
+        limit: Messages to return
+        offset: Messages to skip after the cursor
+        before_id: Only messages older than this message ID
+        property_id: Only messages about this property
+    """
+    directions = [(user_id, other_user_id)]
+    if other_user_id != user_id:
+        directions.append((other_user_id, user_id))
+
+    branches = []
+    for sender_id, receiver_id in directions:
+        branch = select(ChatMessage).where(
+            ChatMessage.sender_id == sender_id,
+            ChatMessage.receiver_id == receiver_id,
+        )
+        if before_id is not None:
+            branch = branch.where(ChatMessage.id < before_id)
+        if property_id is not None:
+            branch = branch.where(ChatMessage.property_id == property_id)
+        branches.append(
+            branch.order_by(ChatMessage.id.desc()).limit(offset + limit).subquery()
+        )
+
+    page = union_all(*(select(branch) for branch in branches)).subquery()
+    message = aliased(ChatMessage, page)
+    return (
+        select(message).order_by(message.id.desc()).offset(offset).limit(limit)
+    )
+
+
+class PropertySummaryLoader:
+    """Per-request loader for the property summaries shown beside messages.
+
+    IDs are deduplicated, looked up in the L1 cache, and the misses are
+    fetched together in one ``IN`` query selecting only the summary columns.
+    """
+
+    def __init__(self, db: AsyncSession):
+        """Initialize loader.
+
+        Args:
+            db: Database session for cache misses
+        """
+        self.db = db
+        self._loaded: Dict[int, Optional[PropertyInfoSchema]] = {}
+
+    async def load_many(
+        self, property_ids: Iterable[Optional[int]]
+    ) -> Dict[int, PropertyInfoSchema]:
+        """Summaries for existing properties, keyed by ID.
+
+        Args:
+            property_ids: Property IDs; ``None`` and repeats are ignored
+
+        Returns:
+            Mapping of found property IDs to summaries
+        """
+        wanted = {pid for pid in property_ids if pid is not None}
+        local = get_local_cache()
+        missing = []
+        for pid in wanted - self._loaded.keys():
+            cached = local.get("property_summary", property_summary_key(pid))
+            if cached is MISSING:
+                missing.append(pid)
+            else:
+                self._loaded[pid] = PropertyInfoSchema(**cached)
+
+        if missing:
+            summaries = await self._fetch(missing)
+            for pid in missing:
+                local.record_miss("property_summary")
+                summary = self._loaded[pid] = summaries.get(pid)
+                if summary is not None:
+                    local.set(
+                        "property_summary",
+                        property_summary_key(pid),
+                        summary.model_dump(),
+                    )
+
+        return {
+            pid: self._loaded[pid] for pid in wanted if self._loaded[pid] is not None
+        }
+
+    async def load(self, property_id: int) -> Optional[PropertyInfoSchema]:
+        """Summary for one property, or None if it does not exist."""
+        return (await self.load_many([property_id])).get(property_id)
+
+    async def _fetch(self, property_ids: list) -> Dict[int, PropertyInfoSchema]:
+        query = (
+            select(
+                Property.id,
+                Property.title,
+                Property.location,
+                PropertyImage.image_url,
+            )
+            .outerjoin(PropertyImage, PropertyImage.property_id == Property.id)
+            .where(Property.id.in_(property_ids))
+            .order_by(Property.id, PropertyImage.id)
+        )
+        summaries: Dict[int, PropertyInfoSchema] = {}
+        for row in (await self.db.execute(query)).all():
+            summary = summaries.get(row.id)
+            if summary is None:
+                summary = summaries[row.id] = PropertyInfoSchema(
+                    id=row.id, title=row.title, address=row.location, images=[]
+                )
+            if row.image_url is not None:
+                summary.images.append(row.image_url)
+        return summaries
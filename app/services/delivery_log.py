@@ -0,0 +1,122 @@
+"""
+Per-user delivery log for WebSocket chat payloads.
+Every delivery is appended to a capped Redis stream before it is sent, and
+the stream ID travels with the payload as ``seq``. A reconnecting client
+passes the last ``seq`` it saw and the socket replays what came after it
+from Redis, instead of the client re-reading its chat history.
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.configs import settings
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def log_key(user_id: int) -> str:
+    """Redis stream holding a user's recent deliveries."""
+    return f"{settings.WS_CHANNEL_PREFIX}:log:{user_id}"
+
+
+def _seq(stream_id: str) -> Tuple[int, int]:
+    milliseconds, _, sequence = stream_id.partition("-")
+    return int(milliseconds), int(sequence or 0)
+
+
+class DeliveryLog:
+    """Capped, expiring Redis stream of deliveries per user."""
+
+    def __init__(self, maxlen: Optional[int] = None, ttl: Optional[int] = None):
+        """Initialize delivery log.
+
+        Args:
+            maxlen: Entries kept per user (settings default)
+            ttl: Seconds a user's log outlives their last delivery (settings default)
+        """
+        self.maxlen = maxlen or settings.WS_DELIVERY_LOG_MAXLEN
+        self.ttl = ttl or settings.WS_DELIVERY_LOG_TTL
+
+    async def append(self, user_id: int, payload: Dict[str, Any]) -> Optional[str]:
+        """Log a payload for a user.
+
+        Args:
+            user_id: Receiving user
+            payload: JSON-serializable message
+
+        Returns:
+            The entry's sequence ID, or None if Redis is unavailable
+        """
+        from core.database import get_redis
+
+        key = log_key(user_id)
+        try:
+            redis_client = await get_redis()
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.xadd(
+                    key,
+                    {"payload": json.dumps(payload, default=str)},
+                    maxlen=self.maxlen,
+                    approximate=True,
+                )
+                pipe.expire(key, self.ttl)
+                seq, _ = await pipe.execute()
+            return seq
+        except Exception as e:
+            logger.warning(f"Delivery log append error: {e}")
+            return None
+
+    async def read_after(
+        self, user_id: int, last_seq: str
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """Read a user's deliveries logged after a sequence ID.
+
+        Args:
+            user_id: Receiving user
+            last_seq: Last sequence ID the client received
+
+        Returns:
+            The payloads in order, each with its ``seq``, and whether they
+            are complete. They are not when ``last_seq`` is older than the
+            log's oldest entry (trimmed or expired), when it is malformed,
+            or when Redis is unavailable; the client then falls back to
+            chat history.
+        """
+        from core.database import get_redis
+
+        key = log_key(user_id)
+        try:
+            after = _seq(last_seq)
+        except ValueError:
+            return [], False
+        try:
+            redis_client = await get_redis()
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.xrange(key, "-", "+", count=1)
+                pipe.xrange(key, f"({after[0]}-{after[1]}", "+", count=self.maxlen)
+                oldest, entries = await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Delivery log read error: {e}")
+            return [], False
+
+        complete = bool(oldest) and _seq(oldest[0][0]) <= after
+        payloads = [
+            {**json.loads(fields["payload"]), "seq": seq} for seq, fields in entries
+        ]
+        return payloads, complete
+
+
+_delivery_log: Optional[DeliveryLog] = None
+
+
+def get_delivery_log() -> DeliveryLog:
+    """Get delivery log singleton.
+
+    Returns:
+        DeliveryLog instance
+    """
+    global _delivery_log
+    if _delivery_log is None:
+        _delivery_log = DeliveryLog()
+    return _delivery_log
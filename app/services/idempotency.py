@@ -5,9 +5,10 @@ Provides utilities to track and validate idempotent requests.
 
 from typing import Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
-import json
 import redis.asyncio as aioredis
 
+from app.utils.codec import get_codec
+
 from core.configs import settings
 from core.logger import get_logger
 from core.exceptions import IdempotencyError, DuplicatePaymentError
@@ -29,7 +30,8 @@ class IdempotencyService:
         Initialize idempotency service.
 
         Args:
-            redis_client: Optional Redis client for distributed tracking
+            redis_client: Optional Redis client for distributed tracking; binary
+                codecs need one created with ``decode_responses=False``
         """
         self.redis_client = redis_client
         self.local_cache: Dict[str, Dict[str, Any]] = {}
@@ -147,7 +149,7 @@ class IdempotencyService:
         try:
             value = await self.redis_client.get(key)
             if value:
-                return json.loads(value)
+                return get_codec().decode(value)
         except Exception as e:
             logger.warning(f"Redis get error: {str(e)}")
         return None
@@ -163,7 +165,7 @@ class IdempotencyService:
             await self.redis_client.setex(
                 key,
                 ttl,
-                json.dumps(value, default=str),
+                get_codec().encode(value),
             )
         except Exception as e:
             logger.error(f"Redis set error: {str(e)}")
@@ -0,0 +1,127 @@
+"""
+Write-behind tracking of user activity.
+Authenticated requests record a last-seen timestamp in memory; a scheduled
+job persists all pending timestamps with one bulk UPDATE, so read-only
+requests never write to the user row.
+"""
+
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from sqlalchemy import case, update
+
+from app.models.user import BaseUser
+from core.configs import settings
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class LastSeenTracker:
+    """Buffers last-seen timestamps and flushes them in bulk."""
+
+    # Users remembered for staleness checks; older entries are re-queued
+    MAX_TRACKED_USERS = 50_000
+
+    def __init__(self, staleness: Optional[timedelta] = None):
+        """
+        Initialize last-seen tracker.
+
+        Args:
+            staleness: How far a persisted timestamp may lag before a new
+                sighting is queued again (defaults to LAST_SEEN_STALENESS)
+        """
+        self.staleness = staleness or timedelta(seconds=settings.LAST_SEEN_STALENESS)
+        self._pending: Dict[int, datetime] = {}
+        self._recorded: "OrderedDict[int, datetime]" = OrderedDict()
+
+    @property
+    def pending(self) -> int:
+        """Number of users waiting to be flushed."""
+        return len(self._pending)
+
+    def record(self, user_id: int, seen_at: Optional[datetime] = None) -> bool:
+        """
+        Record that a user was seen.
+
+        Args:
+            user_id: ID of the user
+            seen_at: When the user was seen (defaults to now)
+
+        Returns:
+            True if the sighting was queued, False if within the staleness window
+        """
+        seen_at = seen_at or datetime.now(timezone.utc)
+        previous = self._recorded.get(user_id)
+        if previous is not None and seen_at - previous < self.staleness:
+            return False
+
+        self._recorded[user_id] = seen_at
+        self._recorded.move_to_end(user_id)
+        while len(self._recorded) > self.MAX_TRACKED_USERS:
+            self._recorded.popitem(last=False)
+        self._pending[user_id] = seen_at
+        return True
+
+    async def flush(self, session_factory=None) -> int:
+        """
+        Persist pending timestamps with a single UPDATE statement.
+
+        Args:
+            session_factory: Session factory to use (defaults to AsyncSessionLocal)
+
+        Returns:
+            Number of users flushed
+        """
+        if not self._pending:
+            return 0
+        if session_factory is None:
+            from core.database import AsyncSessionLocal
+
+            session_factory = AsyncSessionLocal
+
+        batch, self._pending = self._pending, {}
+        table = BaseUser.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id.in_(batch.keys()))
+            .values(
+                last_seen=case(batch, value=table.c.id),
+                # NOTE - Keep updated_at: activity is not a profile change
+                updated_at=table.c.updated_at,
+            )
+        )
+        try:
+            async with session_factory() as db:
+                await db.execute(stmt)
+                await db.commit()
+        except Exception as e:
+            # Requeue, keeping any newer sighting recorded meanwhile
+            for user_id, seen_at in batch.items():
+                self._pending.setdefault(user_id, seen_at)
+            logger.error(f"Failed to flush last_seen for {len(batch)} users: {e}")
+            return 0
+
+        logger.debug(f"Flushed last_seen for {len(batch)} users")
+        return len(batch)
+
+
+_last_seen_tracker: Optional[LastSeenTracker] = None
+
+
+def get_last_seen_tracker() -> LastSeenTracker:
+    """Get last-seen tracker singleton.
+
+    Returns:
+        LastSeenTracker instance
+    """
+    global _last_seen_tracker
+    if _last_seen_tracker is None:
+        _last_seen_tracker = LastSeenTracker()
+    return _last_seen_tracker
+
+
+async def flush_last_seen_task():
+    """Scheduled task to persist buffered last_seen timestamps"""
+    await get_last_seen_tracker().flush()
@@ -1,3 +1,8 @@
+import base64
+import binascii
+import json
+from typing import Optional, Sequence
+from sqlalchemy import func, true, tuple_
 from sqlalchemy.future import select
 from sqlalchemy.engine import Result
 from app.models.property import Property, PropertyImage
@@ -10,12 +15,15 @@ from app.models.property import (
     AccountInfo,
 )
 from app.models.user import BaseUser, Agent
+from app.models.loading import load_profile
 from app.schemas.property_schema import PropertyBase, PropertyUpdate, ContractCreate
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 from app.schemas.property_schema import (
     FilterParams,
     PropertyFeed,
+    PropertyCardFeed,
+    PropertyShow,
     DeleteProperty,
     AgentAvailabilitySchema,
 )
@@ -25,6 +33,7 @@ from app.utils.enums import (
     PropertyStatEnum,
     ListingTypeEnum,
     AccountTypeEnum,
+    FeedSortEnum,
 )
 from core.logger import logger
 
@@ -39,79 +48,93 @@ async def create_property_listing(
     new_property.images = images
     db.add(new_property)
     await db.commit()
-    await db.refresh(new_property)
-    return new_property
+    return await _get_property_detail(new_property.id, db)
+
+
+async def _get_property_detail(property_id: int, db: AsyncSession):
+    query = (
+        select(Property)
+        .where(Property.id == property_id)
+        .options(*load_profile("property-detail"))
+        .execution_options(populate_existing=True)
+    )
+    result: Result = await db.execute(query)
+    return result.scalar_one_or_none()
 
 
 async def get_user_properties(
     current_user: UserInDB, filter_query: FilterParams, db: AsyncSession
 ):
-    query = (
-        select(Property)
-        .where(Property.agent_id == current_user.id)
-        .where(Property.id >= filter_query.cursor)
-        .limit(filter_query.limit)
+    query = build_feed_query(filter_query, agent_id=current_user.id).options(
+        *load_profile("feed-card")
     )
     result: Result = await db.execute(query)
-    property = result.scalars().all()
-    return property
+    properties, _ = _feed_page(result.scalars().all(), filter_query)
+    return properties
+
 
+def detail_version(property: Property) -> Optional[int]:
+    """Cache version of a property detail: ``updated_at`` in microseconds."""
+    updated_at = property.updated_at
+    if updated_at is None:
+        return None
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    return int(updated_at.timestamp() * 1_000_000)
 
-async def get_property_by_id(property_id: int, db: AsyncSession):
+
+async def get_property_by_id(
+    property_id: int, db: AsyncSession, session_factory=None
+) -> PropertyShow:
     """Fetch a single property by its ID.
 
+    Reads through the detail cache, which stores the full ``PropertyShow``
+    serialization versioned by ``updated_at``.
+
     Args:
         property_id: The ID of the property to fetch.
-        db: The database session.
+        db: The database session, used when the cache is unavailable.
+        session_factory: Session factory for cache rebuilds (defaults to
+            AsyncSessionLocal).
 
     Returns:
-        The property object if found.
+        The property detail.
 
     Raises:
         HTTPException: If the property is not found.
     """
-    # Try cache first
+
+    async def load_from(session: AsyncSession):
+        property = await _get_property_detail(property_id, session)
+        if not property:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Property with id: {property_id} not found",
+            )
+        detail = PropertyShow.model_validate(property).model_dump(mode="json")
+        return detail, detail_version(property)
+
+    async def load():
+        # NOTE - The rebuild is shared with concurrent requests and may outlive
+        # this one, so it must not run on this request's session
+        factory = session_factory
+        if factory is None:
+            from core.database import AsyncSessionLocal
+
+            factory = AsyncSessionLocal
+        async with factory() as session:
+            return await load_from(session)
+
     try:
         from app.services.cache import get_cache_service
 
         cache = await get_cache_service()
-        cached = await cache.get_property_detail(property_id)
-        if cached:
-            logger.debug(f"Property cache hit", extra={"property_id": property_id})
-            # Reconstruct property from cached dict
-            return Property(**cached)
     except Exception as e:
         logger.warning(f"Cache error, falling back to database: {e}")
-
-    query = select(Property).where(Property.id == property_id)
-    result: Result = await db.execute(query)
-    property = result.scalar_one_or_none()
-    if not property:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Property with id: {property_id} not found",
-        )
-
-    # Cache the result
-    try:
-        cache = await get_cache_service()
-        property_dict = {
-            "id": property.id,
-            "title": property.title,
-            "description": property.description,
-            "price": property.price,
-            "location": property.location,
-            "bedroom": property.bedroom,
-            "bathroom": property.bathroom,
-            "property_type": property.property_type,
-            "listing_type": property.listing_type,
-            "agent_id": property.agent_id,
-        }
-        await cache.set_property_detail(property_id, property_dict)
-    except Exception as e:
-        logger.warning(f"Failed to cache property: {e}")
-
-    return property
+        detail, _ = await load_from(db)
+    else:
+        detail = await cache.get_property_detail(property_id, load)
+    return PropertyShow.model_validate(detail)
 
 
 async def update_listing(
@@ -120,8 +143,10 @@ async def update_listing(
     update_data: PropertyUpdate,
     db: AsyncSession,
 ):
-    query = select(Property).where(
-        Property.id == property_id, Property.agent_id == current_user.id
+    query = (
+        select(Property)
+        .where(Property.id == property_id, Property.agent_id == current_user.id)
+        .options(*load_profile("property-detail"))
     )
     result = await db.execute(query)
     property = result.scalar_one_or_none()
@@ -139,17 +164,24 @@ async def update_listing(
             PropertyImage(**image_data.model_dump())
             for image_data in update_data.images
         ]
+    # NOTE - Image-only edits do not touch the row; bump the detail cache version
+    property.updated_at = datetime.now(timezone.utc)
 
     db.add(property)
     await db.commit()
-    await db.refresh(property)
+    property = await _get_property_detail(property_id, db)
 
     # Invalidate caches
     try:
         from app.services.cache import get_cache_service
 
         cache = await get_cache_service()
-        await cache.invalidate_properties()
+        await cache.invalidate_property(property_id)
+        await cache.set_property_detail(
+            property_id,
+            PropertyShow.model_validate(property).model_dump(mode="json"),
+            detail_version(property),
+        )
         logger.info(
             f"Property caches invalidated after update",
             extra={"property_id": property_id},
@@ -157,9 +189,172 @@ async def update_listing(
     except Exception as e:
         logger.warning(f"Failed to invalidate cache: {e}")
 
+    await _publish_property_update(property_id, property.agent_id, property.status.value)
     return property
 
 
+async def _publish_property_update(property_id: int, agent_id: int, status: str) -> None:
+    """Push a property status update to sockets following the property or agent."""
+    from app.services.websocket_manager import WebSocketMessage
+    from app.services.ws_fanout import get_websocket_fanout
+
+    fanout = get_websocket_fanout()
+    message = WebSocketMessage.status_update(
+        "property", property_id, status, {"agent_id": agent_id}
+    )
+    for topic in (f"property:{property_id}", f"agent:{agent_id}"):
+        await fanout.publish(topic, message)
+
+
+# SECTION - Property feed keyset pagination
+
+# NOTE - Sort column and descending flag per feed ordering; id breaks ties.
+# Each ordering is backed by a (column, id) composite index.
+FEED_SORTS = {
+    FeedSortEnum.newest: (Property.created_at, True),
+    FeedSortEnum.oldest: (Property.created_at, False),
+    FeedSortEnum.price_asc: (Property.price, False),
+    FeedSortEnum.price_desc: (Property.price, True),
+}
+
+
+def encode_feed_cursor(sort: FeedSortEnum, property: Property) -> str:
+    """Encode the keyset position after ``property`` as an opaque cursor."""
+    column, _ = FEED_SORTS[sort]
+    value = getattr(property, column.key)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps([sort.value, value, property.id]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_feed_cursor(sort: FeedSortEnum, cursor: Optional[str]) -> Optional[tuple]:
+    """Decode a cursor into ``(sort_value, id)``.
+
+    Cursors from the old id-based feed (plain integers) restart the feed.
+
+    Raises:
+        HTTPException: If the cursor is malformed or was issued for another sort
+    """
+    if not cursor or cursor.isdigit():
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, value, property_id = json.loads(base64.urlsafe_b64decode(padded))
+        if sort_value != sort.value:
+            raise ValueError("cursor sort mismatch")
+        column, _ = FEED_SORTS[sort]
+        if column is Property.created_at:
+            value = datetime.fromisoformat(value)
+        return value, int(property_id)
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid feed cursor"
+        )
+
+
+def build_feed_query(
+    filter_query: FilterParams, agent_id: Optional[int] = None, columns=None
+):
+    """Build the filtered keyset query for one feed page.
+
+    One extra row is fetched to tell whether another page exists.
+
+    Args:
+        filter_query: Feed filters, sort and cursor
+        agent_id: Restrict the feed to one agent's listings
+        columns: Column projection to select instead of full ``Property`` rows
+    """
+    column, descending = FEED_SORTS[filter_query.sort]
+    query = select(*columns) if columns else select(Property)
+
+    if agent_id is not None:
+        query = query.where(Property.agent_id == agent_id)
+    if filter_query.status is not None:
+        query = query.where(Property.status == filter_query.status)
+    if filter_query.listing_type is not None:
+        query = query.where(Property.listing_type == filter_query.listing_type)
+    if filter_query.property_type is not None:
+        query = query.where(Property.property_type == filter_query.property_type)
+    if filter_query.min_price is not None:
+        query = query.where(Property.price >= filter_query.min_price)
+    if filter_query.max_price is not None:
+        query = query.where(Property.price <= filter_query.max_price)
+    if filter_query.min_bedroom is not None:
+        query = query.where(Property.bedroom >= filter_query.min_bedroom)
+    if filter_query.max_bedroom is not None:
+        query = query.where(Property.bedroom <= filter_query.max_bedroom)
+    if filter_query.min_bathroom is not None:
+        query = query.where(Property.bathroom >= filter_query.min_bathroom)
+    if filter_query.location:
+        location = (
+            filter_query.location.replace("\\", "\\\\")
+            .replace("%", "\\%")
+            .replace("_", "\\_")
+        )
+        query = query.where(Property.location.ilike(f"%{location}%", escape="\\"))
+
+    position = decode_feed_cursor(filter_query.sort, filter_query.cursor)
+    if position is not None:
+        key = tuple_(column, Property.id)
+        query = query.where(key < position if descending else key > position)
+
+    if descending:
+        query = query.order_by(column.desc(), Property.id.desc())
+    else:
+        query = query.order_by(column.asc(), Property.id.asc())
+    return query.limit(filter_query.limit + 1)
+
+
+def _feed_page(rows: Sequence[Property], filter_query: FilterParams):
+    properties = list(rows[: filter_query.limit])
+    next_cursor = (
+        encode_feed_cursor(filter_query.sort, properties[-1])
+        if len(rows) > filter_query.limit
+        else None
+    )
+    return properties, next_cursor
+
+
+async def _feed_entries(property_ids: list[int], db: AsyncSession) -> dict:
+    """Serialized ``PropertyShow`` entries for a feed page.
+
+    Cached entries come back in one MGET; the rest are loaded with one query
+    and written back in one pipelined round trip.
+    """
+    cards = {}
+    try:
+        from app.services.cache import get_cache_service
+
+        cache = await get_cache_service()
+        cards = await cache.get_property_cards(property_ids)
+    except Exception as e:
+        logger.warning(f"Cache error, falling back to database: {e}")
+
+    missing = [pid for pid in property_ids if pid not in cards]
+    if not missing:
+        return cards
+
+    query = (
+        select(Property)
+        .where(Property.id.in_(missing))
+        .options(*load_profile("feed-card"))
+    )
+    result: Result = await db.execute(query)
+    loaded = {
+        property.id: PropertyShow.model_validate(property).model_dump(mode="json")
+        for property in result.scalars()
+    }
+    cards.update(loaded)
+
+    try:
+        cache = await get_cache_service()
+        await cache.set_property_cards(loaded)
+    except Exception as e:
+        logger.warning(f"Failed to cache feed entries: {e}")
+    return cards
+
+
 async def filtered_property(filter_query: FilterParams, db: AsyncSession):
     # Generate cache key from filter params
     try:
@@ -167,10 +362,7 @@ async def filtered_property(filter_query: FilterParams, db: AsyncSession):
         from app.utils.cache_keys import generate_filter_hash
 
         cache = await get_cache_service()
-        filters_dict = {
-            "cursor": filter_query.cursor,
-            "limit": filter_query.limit,
-        }
+        filters_dict = filter_query.model_dump(mode="json")
         filters_hash = generate_filter_hash(filters_dict)
 
         # Try cache
@@ -181,15 +373,18 @@ async def filtered_property(filter_query: FilterParams, db: AsyncSession):
     except Exception as e:
         logger.warning(f"Cache error, falling back to database: {e}")
 
-    query = (
-        select(Property)
-        .where(Property.id >= filter_query.cursor)
-        .limit(filter_query.limit)
-    )
+    # NOTE - Select the page's keys only, then assemble entries from the
+    # per-property cache so a new feed generation reuses unchanged listings
+    column, _ = FEED_SORTS[filter_query.sort]
+    query = build_feed_query(filter_query, columns=(Property.id, column))
     result: Result = await db.execute(query)
-    properties: Property = result.scalars().all()  # type: ignore
-    next_cursor = properties[-1].id + 1 if properties else None
-    feed = PropertyFeed(data=properties, next_coursor=next_cursor)
+    rows, next_cursor = _feed_page(result.all(), filter_query)
+    property_ids = [row.id for row in rows]
+    cards = await _feed_entries(property_ids, db)
+    feed = PropertyFeed(
+        data=[cards[pid] for pid in property_ids if pid in cards],  # type: ignore
+        next_coursor=next_cursor,
+    )
 
     # Cache the result
     try:
@@ -197,10 +392,7 @@ async def filtered_property(filter_query: FilterParams, db: AsyncSession):
         await cache.set_property_feed(
             page=1,
             filters_hash=filters_hash,
-            feed={
-                "data": [p.__dict__ for p in properties],
-                "next_coursor": next_cursor,
-            },
+            feed=feed.model_dump(mode="json"),
         )
     except Exception as e:
         logger.warning(f"Failed to cache property feed: {e}")
@@ -208,8 +400,97 @@ async def filtered_property(filter_query: FilterParams, db: AsyncSession):
     return feed
 
 
+# NOTE - Card rows carry the sort columns so the cursor can be encoded from them
+CARD_COLUMNS = (
+    Property.id,
+    Property.title,
+    Property.price,
+    Property.location,
+    Property.bedroom,
+    Property.bathroom,
+    Property.created_at,
+)
+
+
+def build_card_query(filter_query: FilterParams, dialect: str):
+    """Build the single-statement card feed query.
+
+    The primary image comes from a LATERAL subquery on PostgreSQL (one index
+    probe on ``property_image (property_id, is_primary)`` per row) and from a
+    correlated scalar subquery elsewhere; the agent name from a plain join.
+    """
+    image_query = (
+        select(PropertyImage.image_url)
+        .where(PropertyImage.property_id == Property.id)
+        .order_by(
+            func.coalesce(PropertyImage.is_primary, False).desc(), PropertyImage.id
+        )
+        .limit(1)
+    )
+    agent = BaseUser.__table__
+    agent_name = func.coalesce(agent.c.fullname, agent.c.username).label("agent_name")
+    source = Property.__table__.outerjoin(agent, agent.c.id == Property.agent_id)
+
+    if dialect == "postgresql":
+        primary_image = image_query.lateral("primary_image")
+        image_url = primary_image.c.image_url
+        source = source.outerjoin(primary_image, true())
+    else:
+        image_url = image_query.scalar_subquery()
+
+    columns = (*CARD_COLUMNS, image_url.label("primary_image_url"), agent_name)
+    return build_feed_query(filter_query, columns=columns).select_from(source)
+
+
+async def property_cards(filter_query: FilterParams, db: AsyncSession):
+    """Fetch a page of the property feed as lightweight cards.
+
+    Args:
+        filter_query: Feed filters, sort and cursor
+        db: The database session
+
+    Returns:
+        PropertyCardFeed page
+    """
+    try:
+        from app.services.cache import get_cache_service
+        from app.utils.cache_keys import generate_filter_hash
+
+        cache = await get_cache_service()
+        filters_dict = {**filter_query.model_dump(mode="json"), "view": "card"}
+        filters_hash = generate_filter_hash(filters_dict)
+
+        cached = await cache.get_property_feed(page=1, filters_hash=filters_hash)
+        if cached:
+            logger.debug(f"Property card cache hit", extra={"filters": filters_dict})
+            return PropertyCardFeed(**cached)
+    except Exception as e:
+        logger.warning(f"Cache error, falling back to database: {e}")
+
+    query = build_card_query(filter_query, db.get_bind().dialect.name)
+    result: Result = await db.execute(query)
+    cards, next_cursor = _feed_page(result.all(), filter_query)
+    feed = PropertyCardFeed(data=cards, next_coursor=next_cursor)  # type: ignore
+
+    try:
+        cache = await get_cache_service()
+        await cache.set_property_feed(
+            page=1,
+            filters_hash=filters_hash,
+            feed=feed.model_dump(mode="json"),
+        )
+    except Exception as e:
+        logger.warning(f"Failed to cache property cards: {e}")
+
+    return feed
+
+
 async def get_agent_by_id(agent_id: int, db: AsyncSession):
-    query = select(Agent).where(Agent.id == agent_id)
+    query = (
+        select(Agent)
+        .where(Agent.id == agent_id)
+        .options(*load_profile("agent-profile"))
+    )
     result: Result = await db.execute(query)
     agent = result.scalar_one_or_none()
     if not agent:
@@ -245,6 +526,15 @@ async def delist_property(property_id: int, db: AsyncSession, current_user: User
     await db.delete(property)
     logger.info(f"Property with id:{property_id} deleted by agent id:{current_user.id}")
     await db.commit()
+
+    try:
+        from app.services.cache import get_cache_service
+
+        cache = await get_cache_service()
+        await cache.invalidate_property(property_id)
+    except Exception as e:
+        logger.warning(f"Failed to invalidate cache: {e}")
+    await _publish_property_update(property_id, current_user.id, "delisted")
     return DeleteProperty(message="Property Deleted")
 
 
@@ -317,14 +607,13 @@ async def update_agent_availabilty(
     schedule_id: int,
     current_user: AgentFeed,
 ):
-    schedule = next(
-        (
-            availability
-            for availability in current_user.availabilities
-            if availability.id == schedule_id
-        ),
-        None,
+    result: Result = await db.execute(
+        select(AgentAvailability).where(
+            AgentAvailability.id == schedule_id,
+            AgentAvailability.agent_id == current_user.id,
+        )
     )
+    schedule = result.scalar_one_or_none()
     if not schedule:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -338,17 +627,26 @@ async def update_agent_availabilty(
     return schedule
 
 
+async def _get_user_appointment(
+    appointment_id: int, current_user: UserInDB, db: AsyncSession
+):
+    owner = (
+        Appointment.agent_id
+        if current_user.account_type == AccountTypeEnum.agent
+        else Appointment.client_id
+    )
+    result: Result = await db.execute(
+        select(Appointment).where(
+            Appointment.id == appointment_id, owner == current_user.id
+        )
+    )
+    return result.scalar_one_or_none()
+
+
 async def cancel_appointment_by_id(
     appointment_id: int, current_user: UserInDB, db: AsyncSession
 ):
-    appointment: Appointment = next(
-        (
-            appointment
-            for appointment in current_user.appointments  # type: ignore
-            if appointment.id == appointment_id
-        ),
-        None,
-    )  # type: ignore
+    appointment = await _get_user_appointment(appointment_id, current_user, db)
     if not appointment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Appointment not found"
@@ -483,14 +781,7 @@ async def run_create_contract(
 async def confirm_agent_appointment(
     appointment_id: int, current_user: UserInDB, db: AsyncSession
 ):
-    appointment: Appointment = next(
-        (
-            appointment
-            for appointment in current_user.appointments  # type: ignore
-            if appointment.id == appointment_id
-        ),
-        None,
-    )  # type: ignore
+    appointment = await _get_user_appointment(appointment_id, current_user, db)
 
     if not appointment:
         raise HTTPException(
@@ -0,0 +1,184 @@
+"""
+WebSocket heartbeat and cross-worker presence.
+Each worker pings its sockets every ``WS_HEARTBEAT_INTERVAL`` seconds, reaps
+those silent for ``WS_HEARTBEAT_TIMEOUT`` and refreshes its connected users
+in a Redis sorted set scored by last heartbeat. Entries no worker refreshes
+age out, so a crashed worker cannot leave users online, and the online count
+is a ZCARD of the pruned set.
+"""
+
+import asyncio
+import time
+from typing import Iterable, List, Optional, Protocol
+
+from app.services.last_seen import get_last_seen_tracker
+from core.configs import settings
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class LocalConnections(Protocol):
+    """What presence needs from the per-process connection registry."""
+
+    def is_connected(self, user_id: int) -> bool: ...
+
+    def get_active_users(self) -> List[int]: ...
+
+    def ping_all(self) -> None: ...
+
+    def reap_idle(self, timeout: float) -> int: ...
+
+
+def online_key() -> str:
+    """Sorted set of online user IDs scored by last heartbeat (epoch seconds)."""
+    return f"{settings.WS_CHANNEL_PREFIX}:presence:online"
+
+
+def last_seen_key() -> str:
+    """Hash of user ID to the epoch seconds their last socket closed."""
+    return f"{settings.WS_CHANNEL_PREFIX}:presence:last_seen"
+
+
+class PresenceService:
+    """Heartbeat loop plus the Redis presence map shared by all workers."""
+
+    def __init__(
+        self,
+        connections: LocalConnections,
+        interval: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ):
+        """Initialize presence.
+
+        Args:
+            connections: This process's connection registry
+            interval: Seconds between heartbeats (settings default)
+            timeout: Seconds of silence before a socket is reaped and a user
+                stops counting as online (settings default)
+        """
+        self.connections = connections
+        self.interval = interval or settings.WS_HEARTBEAT_INTERVAL
+        self.timeout = timeout or settings.WS_HEARTBEAT_TIMEOUT
+
+    async def connected(self, user_id: int) -> None:
+        """Mark a user online as soon as a socket opens."""
+        from core.database import get_redis
+
+        try:
+            redis_client = await get_redis()
+            await redis_client.zadd(online_key(), {str(user_id): time.time()})
+        except Exception as e:
+            logger.warning(f"Presence update error: {e}")
+
+    async def disconnected(self, user_id: int) -> None:
+        """Record last-seen once a user's last local socket has closed.
+
+        The user stays in the online set for one more heartbeat so a worker
+        still holding another of their sockets can refresh them first.
+        """
+        if self.connections.is_connected(user_id):
+            return
+        from core.database import get_redis
+
+        now = time.time()
+        try:
+            redis_client = await get_redis()
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.hset(last_seen_key(), str(user_id), now)
+                pipe.zadd(
+                    online_key(),
+                    {str(user_id): now - self.timeout + self.interval},
+                    xx=True,
+                )
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Presence update error: {e}")
+
+    async def online_count(self) -> int:
+        """Number of users online on any worker.
+
+        Falls back to this worker's users when Redis is unavailable.
+        """
+        from core.database import get_redis
+
+        try:
+            redis_client = await get_redis()
+            return await redis_client.zcard(online_key())
+        except Exception as e:
+            logger.warning(f"Presence read error: {e}")
+            return len(self.connections.get_active_users())
+
+    async def last_seen(self, user_id: int) -> Optional[float]:
+        """Epoch seconds a user was last seen, or None if never recorded."""
+        from core.database import get_redis
+
+        try:
+            redis_client = await get_redis()
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.zscore(online_key(), str(user_id))
+                pipe.hget(last_seen_key(), str(user_id))
+                heartbeat, closed = await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Presence read error: {e}")
+            return time.time() if self.connections.is_connected(user_id) else None
+        seen = [float(value) for value in (heartbeat, closed) if value is not None]
+        return max(seen) if seen else None
+
+    async def is_online(self, user_id: int) -> bool:
+        """Whether any worker holds a live socket for the user."""
+        from core.database import get_redis
+
+        if self.connections.is_connected(user_id):
+            return True
+        try:
+            redis_client = await get_redis()
+            score = await redis_client.zscore(online_key(), str(user_id))
+        except Exception as e:
+            logger.warning(f"Presence read error: {e}")
+            return False
+        return score is not None and score >= time.time() - self.timeout
+
+    async def beat(self) -> int:
+        """Run one heartbeat: reap, ping, refresh presence.
+
+        Returns:
+            Number of sockets reaped
+        """
+        reaped = self.connections.reap_idle(self.timeout)
+        if reaped:
+            logger.info(f"Reaped {reaped} idle WebSocket connections")
+        self.connections.ping_all()
+        user_ids = self.connections.get_active_users()
+        tracker = get_last_seen_tracker()
+        for user_id in user_ids:
+            tracker.record(user_id)
+        await self._refresh(user_ids)
+        return reaped
+
+    async def run(self) -> None:
+        """Heartbeat until cancelled."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.beat()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"WebSocket heartbeat error: {e}")
+
+    async def _refresh(self, user_ids: Iterable[int]) -> None:
+        from core.database import get_redis
+
+        now = time.time()
+        try:
+            redis_client = await get_redis()
+            async with redis_client.pipeline(transaction=False) as pipe:
+                mapping = {str(user_id): now for user_id in user_ids}
+                if mapping:
+                    pipe.zadd(online_key(), mapping)
+                # NOTE - Prune here so ZCARD stays an exact-enough online count
+                pipe.zremrangebyscore(online_key(), "-inf", now - self.timeout)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Presence refresh error: {e}")
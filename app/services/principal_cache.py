@@ -0,0 +1,178 @@
+"""
+Principal cache for the auth dependency chain.
+Keeps the column state of authenticated users in the shared L1 backed by
+Redis so resolving ``current_user`` on a hot endpoint needs no DB round trip.
+Invalidations reach every worker's L1 through the invalidation channel.
+"""
+
+import enum
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.models.user import ACCOUNT_TYPE_MODELS, BaseUser
+from app.utils.cache import CACHE_TTL
+from app.utils.cache_keys import principal_key
+from app.utils.enums import AccountTypeEnum
+from app.utils.local_cache import MISSING, get_local_cache, publish_invalidation
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# NOTE - Never cached; routes that need it (login) query the user directly
+EXCLUDED_COLUMNS = frozenset({"password"})
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _decode(value: Any, column_type: Any) -> Any:
+    if value is None:
+        return None
+    enum_class = getattr(column_type, "enum_class", None)
+    if enum_class is not None:
+        return enum_class(value)
+    try:
+        python_type = column_type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    return value
+
+
+class PrincipalCache:
+    """Two-level cache of authenticated users keyed by token ``sub``."""
+
+    # L1 namespace (sized and timed in L1_CACHE)
+    NAMESPACE = "principal"
+
+    @staticmethod
+    async def _redis():
+        from core.database import get_redis
+
+        return await get_redis()
+
+    @staticmethod
+    def _serialize(user: BaseUser) -> Dict[str, Any]:
+        mapper = inspect(user).mapper
+        return {
+            attr.key: _encode(getattr(user, attr.key))
+            for attr in mapper.column_attrs
+            if attr.key not in EXCLUDED_COLUMNS
+        }
+
+    @staticmethod
+    def _build(model: type[BaseUser], fields: Dict[str, Any]) -> BaseUser:
+        mapper = inspect(model)
+        user = model()
+        for attr in mapper.column_attrs:
+            if attr.key in fields:
+                value = _decode(fields[attr.key], attr.columns[0].type)
+                setattr(user, attr.key, value)
+        make_transient_to_detached(user)
+        return user
+
+    async def get(
+        self, sub: str, account_type: AccountTypeEnum, db: AsyncSession
+    ) -> Optional[BaseUser]:
+        """
+        Resolve a principal from cache and attach it to the session.
+
+        The cached columns are merged without a load, so routes get a
+        persistent instance they can modify and commit as usual.
+
+        Args:
+            sub: Token subject (user ID)
+            account_type: Account type the token was issued for
+            db: Request database session
+
+        Returns:
+            The attached user, or None on a cache miss
+        """
+        model = ACCOUNT_TYPE_MODELS.get(account_type)
+        if model is None or not str(sub).isdigit():
+            return None
+
+        key = principal_key(sub, account_type.value)
+        local = get_local_cache()
+        fields = local.get(self.NAMESPACE, key)
+        if fields is MISSING:
+            try:
+                redis_client = await self._redis()
+                raw = await redis_client.get(key)
+            except Exception as e:
+                logger.warning(f"Principal cache get error: {e}")
+                return None
+            if not raw:
+                local.record_miss(self.NAMESPACE)
+                return None
+            fields = json.loads(raw)
+            local.record_l2_hit(self.NAMESPACE)
+            local.set(self.NAMESPACE, key, fields)
+
+        user = self._build(model, fields)
+        return await db.merge(user, load=False)
+
+    async def set(self, sub: str, account_type: AccountTypeEnum, user: BaseUser) -> None:
+        """
+        Cache a freshly loaded principal.
+
+        Args:
+            sub: Token subject (user ID)
+            account_type: Account type the token was issued for
+            user: User loaded from the database
+        """
+        if not str(sub).isdigit() or str(user.id) != str(sub):
+            return
+        key = principal_key(sub, account_type.value)
+        fields = self._serialize(user)
+        get_local_cache().set(self.NAMESPACE, key, fields)
+        try:
+            redis_client = await self._redis()
+            await redis_client.setex(
+                key, int(CACHE_TTL["principal"].total_seconds()), json.dumps(fields)
+            )
+        except Exception as e:
+            logger.warning(f"Principal cache set error: {e}")
+
+    async def invalidate(self, user_id: int, account_type: AccountTypeEnum) -> None:
+        """
+        Drop a principal after its account changed.
+
+        Args:
+            user_id: ID of the user
+            account_type: Account type of the user row
+        """
+        key = principal_key(user_id, AccountTypeEnum(account_type).value)
+        redis_client = await self._redis()
+        try:
+            await redis_client.delete(key)
+        except Exception as e:
+            logger.warning(f"Principal cache invalidate error: {e}")
+        # NOTE - After the Redis delete, so no worker refills from the old value
+        await publish_invalidation(redis_client, keys=[(self.NAMESPACE, key)])
+
+
+_principal_cache: Optional[PrincipalCache] = None
+
+
+def get_principal_cache() -> PrincipalCache:
+    """Get principal cache singleton.
+
+    Returns:
+        PrincipalCache instance
+    """
+    global _principal_cache
+    if _principal_cache is None:
+        _principal_cache = PrincipalCache()
+    return _principal_cache
@@ -12,8 +12,10 @@ from app.schemas.user_schema import (
     RatingShow,
     AccountInfoBase,
 )
-from app.models.user import Agent
+from app.models.user import Agent, BaseUser
 from app.models.property import AccountInfo
+from app.models.loading import load_profile
+from app.services.principal_cache import get_principal_cache
 from sqlalchemy.future import select
 from sqlalchemy.engine import Result
 from sqlalchemy.exc import IntegrityError
@@ -23,12 +25,35 @@ import datetime
 timestamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%d%H%M%S")
 
 
+async def get_profile(
+    user_id: int, db: AsyncSession, model: type[BaseUser] = BaseUser
+) -> BaseUser | None:
+    """Load a user with everything ``UserShow`` serializes.
+
+    Args:
+        user_id: ID of the user
+        db: The database session
+        model: Concrete user model when the account type is known
+
+    Returns:
+        The user, or None if not found
+    """
+    query = (
+        select(model)
+        .options(*load_profile("user-profile", model))
+        .where(model.id == user_id)
+        .execution_options(populate_existing=True)
+    )
+    result: Result = await db.execute(query)
+    return result.scalar_one_or_none()
+
 
 async def update_pfp(user: BaseUserSchema, db: AsyncSession, file_path: str):
     user.avatar_url = file_path
     db.add(user)
     await db.commit()
     await db.refresh(user)
+    await get_principal_cache().invalidate(user.id, user.account_type)
 
 
 async def update_user(update_data: UserUpdate, db: AsyncSession, user: UserInDB):
@@ -38,6 +63,7 @@ async def update_user(update_data: UserUpdate, db: AsyncSession, user: UserInDB)
         db.add(user)
         await db.commit()
         await db.refresh(user)
+        await get_principal_cache().invalidate(user.id, user.account_type)
         return user
     except IntegrityError as e:
         logger.error(str(e))
@@ -82,20 +108,23 @@ async def get_account_info(db: AsyncSession, user_id: None):
     return account_info or []
 
 
+async def _get_owned_account_info(
+    db: AsyncSession, user_id: int, account_info_id: int
+) -> AccountInfo | None:
+    query = select(AccountInfo).where(
+        AccountInfo.id == account_info_id, AccountInfo.user_id == user_id
+    )
+    result: Result = await db.execute(query)
+    return result.scalar_one_or_none()
+
+
 async def update_account_info(
     update_data: AccountInfoBase,
     db: AsyncSession,
     current_user: UserInDB,
     account_info_id: int,
 ):
-    account_info = next(
-        (
-            account_info
-            for account_info in current_user.account_info  # type: ignore
-            if account_info.id == account_info_id
-        ),
-        None,
-    )  # type: ignore
+    account_info = await _get_owned_account_info(db, current_user.id, account_info_id)
     if not account_info:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -113,14 +142,7 @@ async def update_account_info(
 async def run_account_info_deletion(
     current_user: UserInDB, db: AsyncSession, account_info_id: int
 ):
-    account_info = next(
-        (
-            account_info
-            for account_info in current_user.account_info # type: ignore
-            if account_info.id == account_info_id
-        ),
-        None,
-    )  # type: ignore
+    account_info = await _get_owned_account_info(db, current_user.id, account_info_id)
     if not account_info:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -215,9 +215,44 @@ async def upsert_transaction_from_event(
     db.add(audit)
     await db.commit()
 
+    await _publish_transaction_update(record)
     return record
 
 
+async def _publish_transaction_update(record: TransactionRecord) -> None:
+    """Push a transaction status change to sockets following it or its property."""
+    from app.services.websocket_manager import WebSocketMessage
+    from app.services.ws_fanout import get_websocket_fanout
+
+    fanout = get_websocket_fanout()
+    message = WebSocketMessage.status_update(
+        "transaction",
+        record.bid_id,
+        record.status.value,
+        {"property_id": record.property_id},
+    )
+    for topic in (f"transaction:{record.bid_id}", f"property:{record.property_id}"):
+        await fanout.publish(topic, message)
+
+
+async def is_transaction_party(user_id: int, bid_id: str, db: AsyncSession) -> bool:
+    """Whether the user's wallet is the buyer or seller on a bid."""
+    stmt = (
+        select(TransactionRecord.id)
+        .join(
+            WalletMapping,
+            or_(
+                WalletMapping.wallet_id == TransactionRecord.buyer_wallet_id,
+                WalletMapping.wallet_id == TransactionRecord.seller_wallet_id,
+            ),
+        )
+        .where(TransactionRecord.bid_id == bid_id, WalletMapping.user_id == user_id)
+        .limit(1)
+    )
+    result = await db.execute(stmt)
+    return result.scalar_one_or_none() is not None
+
+
 async def get_timeout_candidates(
     docs_release_timeout_hours: int,
     docs_confirm_timeout_hours: int,
@@ -3,6 +3,7 @@ from core.dependecies import (
     HTTPBearerDependency,
     InvalidCredentialsException,
     DBSession,
+    WSDBSession,
 )
 import jwt
 from jwt.exceptions import InvalidTokenError, ExpiredSignatureError
@@ -10,6 +11,8 @@ from core.configs import settings, redis
 from core.logger import logger
 from app.schemas.auth_schema import TokenData
 from app.services.auth import get_user
+from app.services.principal_cache import get_principal_cache
+from app.services.last_seen import get_last_seen_tracker
 from app.schemas.user_schema import UserShow, UserInDB
 from fastapi import Depends, HTTPException, status, Security
 from typing import Annotated
@@ -17,6 +20,7 @@ from app.utils.enums import AccountTypeEnum, UserRole
 from fastapi.security import SecurityScopes
 from pydantic import EmailStr
 from app.utils.utils import blacklist_token, token_exp_time
+from app.utils.hashing import hash_password_async
 from app.models.user import Agent, BaseUser, Client
 from dataclasses import dataclass
 from typing import List
@@ -55,12 +59,19 @@ async def get_token_payload(credentials: HTTPBearerDependency) -> TokenData:
 async def get_user_context_base(
     token_data: TokenData, db: DBSession, account_type: AccountTypeEnum
 ) -> UserContext:
-    user: UserInDB = await get_user(token_data.sub, db, account_type)  # type: ignore
+    cache = get_principal_cache()
+    user = await cache.get(token_data.sub, account_type, db)  # type: ignore
+    if user is None:
+        user = await get_user(token_data.sub, db, account_type)  # type: ignore
+        await cache.set(token_data.sub, account_type, user)  # type: ignore
     logger.info(
         f"Fetched user: {user.username if user else 'None'} for account type: {account_type}"
     )
     if not user:
         raise InvalidCredentialsException
+    get_last_seen_tracker().record(user.id)
+    # NOTE - Lets get_db pin this principal's reads to the primary after a write
+    db.info["principal_id"] = user.id
     return UserContext(user=user, scopes=token_data.scopes)
 
 
@@ -273,7 +284,7 @@ def is_jwt_like(value: str) -> bool:
 
 
 async def get_websocket_user(
-    websocket: WebSocket, db: DBSession, token: Annotated[str | None, Query()] = None
+    websocket: WebSocket, db: WSDBSession, token: Annotated[str | None, Query()] = None
 ) -> BaseUser:
     """
     Authenticate a WebSocket connection using JWT token.
@@ -350,6 +361,9 @@ async def get_websocket_user(
             return None
 
         user: UserInDB = await get_user(identifier, db)  # type: ignore
+        # NOTE - Hand the connection back before the socket settles in for
+        # hours; the loaded user stays usable detached
+        await db.close()
         if not user:
             logger.warning("WebSocket auth failed: User not found")
             await websocket.close(
@@ -359,6 +373,7 @@ async def get_websocket_user(
             return None
 
         logger.info(f"WebSocket auth successful: {user.email}")
+        get_last_seen_tracker().record(user.id)
 
         if not user.is_active:
             logger.warning("WebSocket auth failed: User inactive")
@@ -394,7 +409,7 @@ ActiveVerifiedWSUser = Annotated[BaseUser | Client | Agent, Depends(get_websocke
 
 
 async def reset_password(user: UserInDB, db: DBSession, new_password: str):
-    user.password = new_password
+    user.password = await hash_password_async(new_password)
     db.add(user)
     await db.commit()
     await db.refresh(user)
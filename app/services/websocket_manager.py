@@ -3,38 +3,238 @@ WebSocket connection manager for broadcasting real-time notifications and messag
 Provides centralized management of active WebSocket connections and message routing.
 """
 
-from typing import Dict, Set, Callable, Any, Optional
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Optional,
+    Set,
+    Union,
+)
 from fastapi import WebSocket, WebSocketDisconnect, status
 import asyncio
 import json
+import re
+import time
 from datetime import datetime
 import uuid
 
+from core.configs import settings
 from core.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Subscribable topics: property:{id}, transaction:{bid_id}, agent:{id}
+TOPIC_PATTERN = re.compile(r"^(property|agent):\d+$|^transaction:[\w-]{1,128}$")
+
+
+async def authorize_topic(user_id: int, topic: str, session_factory=None) -> bool:
+    """Whether a user may follow a topic.
+
+    Property updates are public; an agent topic is only for that agent and
+    a transaction topic only for the bid's buyer or seller.
+
+    Args:
+        user_id: Subscribing user
+        topic: Topic name (already validated against TOPIC_PATTERN)
+        session_factory: Session factory for the party lookup (defaults to
+            WSSessionLocal)
+
+    Returns:
+        True if the subscription is allowed
+    """
+    kind, _, key = topic.partition(":")
+    if kind == "property":
+        return True
+    if kind == "agent":
+        return int(key) == user_id
+    if session_factory is None:
+        from core.database import WSSessionLocal
+
+        session_factory = WSSessionLocal
+    from app.services.transactions import is_transaction_party
+
+    try:
+        async with session_factory() as db:
+            return await is_transaction_party(user_id, key, db)
+    except Exception as e:
+        logger.error(
+            "Topic authorization failed",
+            extra={"user_id": user_id, "topic": topic, "error": str(e)},
+        )
+        return False
+
+
+class Connection:
+    """One WebSocket with its bounded outbound queue and writer task.
+
+    Every write to the socket goes through the queue, so a slow client only
+    fills its own buffer and never blocks the sender or other clients.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        user_id: int,
+        room_id: Optional[str],
+        queue_size: int,
+        on_error: Callable[["Connection"], Awaitable[None]],
+    ):
+        """Initialize connection and start its writer.
+
+        Args:
+            websocket: Accepted WebSocket
+            user_id: Owning user ID
+            room_id: Optional room/channel ID
+            queue_size: Maximum queued outbound messages
+            on_error: Called when a write fails
+        """
+        self.websocket = websocket
+        self.user_id = user_id
+        self.room_id = room_id
+        self.connection_id = str(uuid.uuid4())
+        self.connected_at = datetime.utcnow().isoformat()
+        self.last_seen = time.monotonic()
+        self.topics: Set[str] = set()
+        self.dropped = 0
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._on_error = on_error
+        self.writer = asyncio.create_task(self._write())
+        # Bounds this socket's share of the WebSocket database pool
+        self.db_slots = asyncio.Semaphore(settings.WS_DB_CONCURRENCY)
+        self._operations: Set[asyncio.Task] = set()
+
+    def offer(self, message: Union[Dict[str, Any], str]) -> bool:
+        """Queue a message without waiting; False if the queue is full."""
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+
+    async def put(self, message: Union[Dict[str, Any], str]) -> None:
+        """Queue a message, waiting for room instead of dropping it.
+
+        Raises:
+            WebSocketDisconnect: The writer has stopped (write error,
+                eviction or disconnect), so the queue will never drain
+        """
+        if self.writer.done():
+            raise WebSocketDisconnect(code=status.WS_1001_GOING_AWAY)
+        put = asyncio.ensure_future(self.queue.put(message))
+        try:
+            await asyncio.wait(
+                {put, self.writer}, return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            if not put.done():
+                put.cancel()
+        if put.cancelled():
+            raise WebSocketDisconnect(code=status.WS_1001_GOING_AWAY)
+
+    def touch(self) -> None:
+        """Note that the client was heard from (any inbound frame)."""
+        self.last_seen = time.monotonic()
+
+    async def start_operation(self, operation: Awaitable[Any]) -> None:
+        """Run database-backed work for this socket in the background.
+
+        At most ``WS_DB_CONCURRENCY`` operations run at once; past that the
+        caller waits here, which stops it reading more from the socket.
+        """
+        await self.db_slots.acquire()
+        task = asyncio.ensure_future(operation)
+        self._operations.add(task)
+        task.add_done_callback(self._operation_done)
+
+    async def wait_operations(self) -> None:
+        """Wait for this socket's in-flight operations to finish."""
+        if self._operations:
+            await asyncio.gather(*self._operations, return_exceptions=True)
+
+    def _operation_done(self, task: asyncio.Task) -> None:
+        self._operations.discard(task)
+        self.db_slots.release()
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(
+                "WebSocket operation failed",
+                extra={
+                    "user_id": self.user_id,
+                    "connection_id": self.connection_id,
+                    "error": str(task.exception()),
+                },
+            )
+
+    async def _write(self) -> None:
+        try:
+            while True:
+                message = await self.queue.get()
+                if isinstance(message, str):
+                    await self.websocket.send_text(message)
+                else:
+                    await self.websocket.send_json(message)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(
+                "Error writing to WebSocket",
+                extra={
+                    "user_id": self.user_id,
+                    "connection_id": self.connection_id,
+                    "error": str(e),
+                },
+            )
+            await self._on_error(self)
+
 
 class ConnectionManager:
-    """Manages WebSocket connections and message broadcasting."""
+    """Registry of WebSocket connections: many per user, plus rooms."""
+
+    def __init__(
+        self,
+        queue_size: Optional[int] = None,
+        slow_consumer_policy: Optional[str] = None,
+        topic_authorizer: Optional[Callable[[int, str], Awaitable[bool]]] = None,
+    ):
+        """Initialize connection manager.
+
+        Args:
+            queue_size: Outbound queue size per connection (settings default)
+            slow_consumer_policy: ``disconnect`` or ``drop`` on a full queue
+            topic_authorizer: Decides whether a user may follow a topic
+                (defaults to authorize_topic)
+        """
+        self.topic_authorizer = topic_authorizer or authorize_topic
+        self.queue_size = queue_size or settings.WS_SEND_QUEUE_SIZE
+        self.slow_consumer_policy = (
+            slow_consumer_policy or settings.WS_SLOW_CONSUMER_POLICY
+        )
 
-    def __init__(self):
-        """Initialize connection manager."""
         # Store active connections: {user_id: set of websocket connections}
         self.active_connections: Dict[int, Set[WebSocket]] = {}
 
         # Store room connections for group messaging
         self.room_connections: Dict[str, Set[WebSocket]] = {}
 
-        # Connection metadata
-        self.connection_metadata: Dict[WebSocket, Dict[str, Any]] = {}
+        # Inverted index of topic subscriptions: {topic: set of websockets}
+        self.topic_connections: Dict[str, Set[WebSocket]] = {}
+
+        # Per-socket state (queue, writer, metadata)
+        self.connections: Dict[WebSocket, Connection] = {}
+
+        # Closes of evicted slow consumers, kept so they are not collected
+        self._closing: Set[asyncio.Task] = set()
 
     async def connect(
         self,
         websocket: WebSocket,
         user_id: int,
         room_id: Optional[str] = None,
-    ) -> None:
+        accept: bool = True,
+    ) -> Connection:
         """
         Register a new WebSocket connection.
 
@@ -42,48 +242,46 @@ class ConnectionManager:
             websocket: WebSocket connection
             user_id: User ID
             room_id: Optional room/channel ID for group messaging
-        """
-        await websocket.accept()
+            accept: Accept the handshake (False if auth already accepted it)
 
-        # Add to user connections
-        if user_id not in self.active_connections:
-            self.active_connections[user_id] = set()
-        self.active_connections[user_id].add(websocket)
+        Returns:
+            The registered connection
+        """
+        if accept:
+            await websocket.accept()
 
-        # Add to room if specified
+        connection = Connection(
+            websocket, user_id, room_id, self.queue_size, self._on_write_error
+        )
+        self.connections[websocket] = connection
+        self.active_connections.setdefault(user_id, set()).add(websocket)
         if room_id:
-            if room_id not in self.room_connections:
-                self.room_connections[room_id] = set()
-            self.room_connections[room_id].add(websocket)
-
-        # Store metadata
-        self.connection_metadata[websocket] = {
-            "user_id": user_id,
-            "room_id": room_id,
-            "connected_at": datetime.utcnow().isoformat(),
-            "connection_id": str(uuid.uuid4()),
-        }
+            self.room_connections.setdefault(room_id, set()).add(websocket)
 
         logger.info(
-            f"WebSocket connected",
-            user_id=user_id,
-            room_id=room_id,
-            connection_id=self.connection_metadata[websocket]["connection_id"],
+            "WebSocket connected",
+            extra={
+                "user_id": user_id,
+                "room_id": room_id,
+                "connection_id": connection.connection_id,
+            },
         )
+        return connection
 
     async def disconnect(self, websocket: WebSocket) -> None:
         """
-        Remove a WebSocket connection.
+        Remove a WebSocket connection and stop its writer.
 
         Args:
             websocket: WebSocket connection to disconnect
         """
-        metadata = self.connection_metadata.get(websocket, {})
-        user_id = metadata.get("user_id")
-        room_id = metadata.get("room_id")
+        connection = self.connections.pop(websocket, None)
+        if connection is None:
+            return
+        user_id, room_id = connection.user_id, connection.room_id
 
         # Remove from user connections
-        if user_id and user_id in self.active_connections:
+        if user_id in self.active_connections:
             self.active_connections[user_id].discard(websocket)
             if not self.active_connections[user_id]:
                 del self.active_connections[user_id]
@@ -94,53 +292,111 @@ class ConnectionManager:
             if not self.room_connections[room_id]:
                 del self.room_connections[room_id]
 
-        # Remove metadata
-        del self.connection_metadata[websocket]
+        # Remove from topic subscriptions
+        for topic in connection.topics:
+            self._remove_topic(websocket, topic)
+
+        if connection.writer is not asyncio.current_task():
+            connection.writer.cancel()
 
         logger.info(
-            f"WebSocket disconnected",
-            user_id=user_id,
-            room_id=room_id,
-            connection_id=metadata.get("connection_id"),
+            "WebSocket disconnected",
+            extra={
+                "user_id": user_id,
+                "room_id": room_id,
+                "connection_id": connection.connection_id,
+            },
         )
 
+    def is_connected(self, user_id: int) -> bool:
+        """Check if a user has at least one connection to this worker."""
+        return user_id in self.active_connections
+
+    async def subscribe(self, websocket: WebSocket, topic: str) -> bool:
+        """
+        Subscribe a connection to a topic.
+
+        Args:
+            websocket: Subscribing connection
+            topic: Topic name, e.g. ``property:12``
+
+        Returns:
+            False if the topic is invalid, the connection is at WS_MAX_TOPICS
+            or its user may not follow the topic
+        """
+        connection = self.connections.get(websocket)
+        if connection is None or not TOPIC_PATTERN.match(topic):
+            return False
+        if topic in connection.topics:
+            return True
+        if len(connection.topics) >= settings.WS_MAX_TOPICS:
+            return False
+        if not await self.topic_authorizer(connection.user_id, topic):
+            return False
+        # NOTE - The socket may have closed while authorization ran
+        if websocket not in self.connections:
+            return False
+        connection.topics.add(topic)
+        self.topic_connections.setdefault(topic, set()).add(websocket)
+        return True
+
+    def unsubscribe(self, websocket: WebSocket, topic: str) -> None:
+        """
+        Remove a connection's subscription to a topic.
+
+        Args:
+            websocket: Subscribed connection
+            topic: Topic name
+        """
+        connection = self.connections.get(websocket)
+        if connection is not None and topic in connection.topics:
+            connection.topics.discard(topic)
+            self._remove_topic(websocket, topic)
+
+    def has_subscribers(self, topic: str) -> bool:
+        """Check if any connection to this worker is subscribed to a topic."""
+        return topic in self.topic_connections
+
+    def send(self, websocket: WebSocket, message: Union[Dict[str, Any], str]) -> bool:
+        """
+        Queue a message (JSON or text) for one connection.
+
+        Args:
+            websocket: Target connection
+            message: Message payload
+
+        Returns:
+            True if the message was queued
+        """
+        connection = self.connections.get(websocket)
+        return connection is not None and self._offer(connection, message)
+
     async def send_personal_message(
         self,
         message: Dict[str, Any],
         user_id: int,
         exclude_connection_id: Optional[str] = None,
-    ) -> None:
+    ) -> bool:
         """
         Send message to specific user (all connections).
 
         Args:
-            message: Message payload
+            message: Message payload, sent as is
             user_id: Target user ID
             exclude_connection_id: Optional connection ID to exclude
+
+        Returns:
+            True if at least one of the user's connections accepted it
         """
         if user_id not in self.active_connections:
             logger.debug(f"User {user_id} has no active connections")
-            return
-
-        message_with_meta = self._add_message_metadata(message)
+            return False
 
-        for websocket in self.active_connections[user_id]:
-            connection_id = self.connection_metadata.get(websocket, {}).get(
-                "connection_id"
-            )
-
-            # Skip if should be excluded
-            if exclude_connection_id and connection_id == exclude_connection_id:
-                continue
-
-            try:
-                await websocket.send_json(message_with_meta)
-            except Exception as e:
-                logger.error(
-                    f"Error sending personal message",
-                    user_id=user_id,
-                    error=str(e),
-                )
+        return self._fan_out(
+            message,
+            self.active_connections[user_id],
+            lambda connection: connection.connection_id == exclude_connection_id,
+        )
 
     async def send_room_message(
         self,
@@ -160,24 +416,29 @@ class ConnectionManager:
             logger.debug(f"Room {room_id} has no active connections")
             return
 
-        message_with_meta = self._add_message_metadata(message)
+        self._fan_out(
+            self._add_message_metadata(message),
+            self.room_connections[room_id],
+            lambda connection: connection.user_id == exclude_user_id,
+        )
+
+    async def send_topic_message(self, message: Dict[str, Any], topic: str) -> bool:
+        """
+        Send message to every connection subscribed to a topic.
 
-        for websocket in self.room_connections[room_id]:
-            user_id = self.connection_metadata.get(websocket, {}).get("user_id")
+        Args:
+            message: Message payload, sent as is
+            topic: Topic name
 
-            # Skip if should be excluded
-            if exclude_user_id and user_id == exclude_user_id:
-                continue
+        Returns:
+            True if at least one subscriber accepted it
+        """
+        if topic not in self.topic_connections:
+            return False
 
-            try:
-                await websocket.send_json(message_with_meta)
-            except Exception as e:
-                logger.error(
-                    f"Error sending room message",
-                    room_id=room_id,
-                    user_id=user_id,
-                    error=str(e),
-                )
+        return self._fan_out(
+            message, self.topic_connections[topic], lambda connection: False
+        )
 
     async def broadcast_message(
         self,
@@ -191,21 +452,11 @@ class ConnectionManager:
             message: Message payload
             exclude_user_id: Optional user to exclude
         """
-        message_with_meta = self._add_message_metadata(message)
-
-        for user_id, connections in self.active_connections.items():
-            if exclude_user_id and user_id == exclude_user_id:
-                continue
-
-            for websocket in connections:
-                try:
-                    await websocket.send_json(message_with_meta)
-                except Exception as e:
-                    logger.error(
-                        f"Error broadcasting message",
-                        user_id=user_id,
-                        error=str(e),
-                    )
+        self._fan_out(
+            self._add_message_metadata(message),
+            self.connections,
+            lambda connection: connection.user_id == exclude_user_id,
+        )
 
     def get_active_users(self) -> list[int]:
         """
@@ -216,6 +467,45 @@ class ConnectionManager:
         """
         return list(self.active_connections.keys())
 
+    def get_online_user_count(self) -> int:
+        """
+        Get number of users with a connection to this worker.
+
+        Returns:
+            User count
+        """
+        return len(self.active_connections)
+
+    def ping_all(self) -> None:
+        """Queue a heartbeat ping on every connection."""
+        self._fan_out({"type": "ping"}, self.connections, lambda connection: False)
+
+    def reap_idle(self, timeout: float) -> int:
+        """
+        Close connections the client has not been heard from within timeout.
+
+        Half-open sockets never raise on write, so silence is the only way
+        to spot them.
+
+        Args:
+            timeout: Seconds of silence allowed
+
+        Returns:
+            Number of connections reaped
+        """
+        deadline = time.monotonic() - timeout
+        idle = [c for c in self.connections.values() if c.last_seen < deadline]
+        for connection in idle:
+            logger.info(
+                "Reaping idle WebSocket",
+                extra={
+                    "user_id": connection.user_id,
+                    "connection_id": connection.connection_id,
+                },
+            )
+            self._evict(connection, status.WS_1001_GOING_AWAY)
+        return len(idle)
+
     def get_user_connection_count(self, user_id: int) -> int:
         """
         Get number of active connections for user.
@@ -247,10 +537,67 @@ class ConnectionManager:
         Returns:
             Total connection count
         """
-        total = 0
-        for connections in self.active_connections.values():
-            total += len(connections)
-        return total
+        return len(self.connections)
+
+    def _fan_out(
+        self,
+        message: Union[Dict[str, Any], str],
+        websockets: Iterable[WebSocket],
+        exclude: Callable[[Connection], bool],
+    ) -> bool:
+        """Queue a message on every target connection; True if any accepted it.
+
+        Queuing never waits, so one slow socket cannot delay the others; each
+        connection's writer task sends concurrently with the rest.
+        """
+        accepted = False
+        # NOTE - Copy: evicting a slow consumer mutates the registry
+        for websocket in list(websockets):
+            connection = self.connections.get(websocket)
+            if connection is None or exclude(connection):
+                continue
+            accepted = self._offer(connection, message) or accepted
+        return accepted
+
+    def _remove_topic(self, websocket: WebSocket, topic: str) -> None:
+        subscribers = self.topic_connections.get(topic)
+        if subscribers is not None:
+            subscribers.discard(websocket)
+            if not subscribers:
+                del self.topic_connections[topic]
+
+    def _offer(self, connection: Connection, message: Union[Dict[str, Any], str]) -> bool:
+        if connection.offer(message):
+            return True
+        logger.warning(
+            "WebSocket send queue full",
+            extra={
+                "user_id": connection.user_id,
+                "connection_id": connection.connection_id,
+                "policy": self.slow_consumer_policy,
+            },
+        )
+        if self.slow_consumer_policy == "disconnect":
+            self._evict(connection)
+        return False
+
+    def _evict(
+        self, connection: Connection, code: int = status.WS_1013_TRY_AGAIN_LATER
+    ) -> None:
+        """Drop a connection now and close its socket in the background."""
+        task = asyncio.create_task(self._close(connection, code))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _close(self, connection: Connection, code: int) -> None:
+        await self.disconnect(connection.websocket)
+        try:
+            await connection.websocket.close(code=code)
+        except Exception:
+            pass
+
+    async def _on_write_error(self, connection: Connection) -> None:
+        await self.disconnect(connection.websocket)
 
     def _add_message_metadata(self, message: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -322,10 +669,12 @@ class WebSocketHandler:
                 data = await websocket.receive_json()
 
                 logger.debug(
-                    f"WebSocket message received",
-                    user_id=user_id,
-                    room_id=room_id,
-                    message_type=data.get("type"),
+                    "WebSocket message received",
+                    extra={
+                        "user_id": user_id,
+                        "room_id": room_id,
+                        "message_type": data.get("type"),
+                    },
                 )
 
                 # Call callback if provided
@@ -334,26 +683,31 @@ class WebSocketHandler:
                         await on_message_callback(data)
                     except Exception as e:
                         logger.error(
-                            f"Error in message callback",
-                            user_id=user_id,
-                            error=str(e),
+                            "Error in message callback",
+                            extra={
+                                "user_id": user_id,
+                                "error": str(e),
+                            },
                         )
                         # Send error response to client
-                        await websocket.send_json(
+                        self.manager.send(
+                            websocket,
                             {
                                 "type": "error",
                                 "message": "Failed to process message",
                                 "error_id": str(uuid.uuid4()),
-                            }
+                            },
                         )
 
         except WebSocketDisconnect:
             await self.manager.disconnect(websocket)
         except Exception as e:
             logger.error(
-                f"WebSocket error",
-                user_id=user_id,
-                error=str(e),
+                "WebSocket error",
+                extra={
+                    "user_id": user_id,
+                    "error": str(e),
+                },
             )
             await self.manager.disconnect(websocket)
 
@@ -422,7 +776,7 @@ class WebSocketMessage:
     @staticmethod
     def status_update(
         entity_type: str,
-        entity_id: int,
+        entity_id: Union[int, str],
         status: str,
         data: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
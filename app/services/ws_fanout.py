@@ -0,0 +1,320 @@
+"""
+Cross-worker WebSocket delivery over Redis pub/sub.
+Every worker subscribes to one channel per user connected to it, plus its own
+ack channel. A delivery is queued straight onto the user's sockets on this
+process and published on the user's channel for their devices on other
+workers; when no local socket took it, the remote workers' acknowledgements
+feed the ``delivered`` flag reported to the sender. With a delivery log,
+each payload is logged first and carries its log ``seq``, so a client that
+was offline can replay it on reconnect.
+
+Topic updates (``property:{id}``, ``transaction:{bid_id}``, ...) travel the
+same way on one channel per topic, which a worker subscribes to only while
+one of its sockets is subscribed.
+"""
+
+import asyncio
+import json
+import uuid
+from typing import Any, Dict, Optional, Protocol, Set
+
+from app.services.delivery_log import DeliveryLog, get_delivery_log
+from app.services.websocket_manager import get_connection_manager
+from core.configs import settings
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class LocalConnections(Protocol):
+    """What the fanout needs from the per-process connection registry."""
+
+    def is_connected(self, user_id: int) -> bool: ...
+
+    async def send_personal_message(self, message: dict, user_id: int) -> bool: ...
+
+    def has_subscribers(self, topic: str) -> bool: ...
+
+    async def send_topic_message(self, message: dict, topic: str) -> bool: ...
+
+
+def user_channel(user_id: int) -> str:
+    """Pub/sub channel carrying deliveries for a user."""
+    return f"{settings.WS_CHANNEL_PREFIX}:user:{user_id}"
+
+
+def topic_channel(topic: str) -> str:
+    """Pub/sub channel carrying updates on a topic."""
+    return f"{settings.WS_CHANNEL_PREFIX}:topic:{topic}"
+
+
+def ack_channel(worker_id: str) -> str:
+    """Pub/sub channel carrying delivery acks back to a worker."""
+    return f"{settings.WS_CHANNEL_PREFIX}:ack:{worker_id}"
+
+
+class _PendingAck:
+    """Acks expected for one delivery: any positive ack wins."""
+
+    def __init__(self):
+        self.future = asyncio.get_running_loop().create_future()
+        self.expected: Optional[int] = None
+        self.negative = 0
+
+    def positive(self) -> None:
+        if not self.future.done():
+            self.future.set_result(True)
+
+    def nack(self) -> None:
+        self.negative += 1
+        self._settle()
+
+    def expect(self, count: int) -> None:
+        self.expected = count
+        self._settle()
+
+    def _settle(self) -> None:
+        if (
+            self.expected is not None
+            and self.negative >= self.expected
+            and not self.future.done()
+        ):
+            self.future.set_result(False)
+
+
+class WebSocketFanout:
+    """Route WebSocket payloads to whichever worker holds the user's socket."""
+
+    def __init__(
+        self,
+        connections: LocalConnections,
+        worker_id: Optional[str] = None,
+        log: Optional[DeliveryLog] = None,
+    ):
+        """Initialize fanout.
+
+        Args:
+            connections: This process's connection registry
+            worker_id: Unique worker name (random by default)
+            log: Delivery log payloads are appended to before sending
+        """
+        self.connections = connections
+        self.log = log
+        self.worker_id = worker_id or uuid.uuid4().hex
+        self.ack_channel = ack_channel(self.worker_id)
+        self._users: Set[int] = set()
+        self._topics: Set[str] = set()
+        self._pending: Dict[str, _PendingAck] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._pubsub = None
+
+    async def register(self, user_id: int) -> None:
+        """Start receiving other workers' deliveries for a locally connected user."""
+        self._users.add(user_id)
+        await self._subscribe(user_channel(user_id))
+
+    async def unregister(self, user_id: int) -> None:
+        """Stop receiving deliveries once a user's last local socket has closed."""
+        if self.connections.is_connected(user_id):
+            return
+        self._users.discard(user_id)
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.unsubscribe(user_channel(user_id))
+            except Exception as e:
+                logger.warning(f"WebSocket fanout unsubscribe error: {e}")
+
+    async def subscribe_topic(self, topic: str) -> None:
+        """Start receiving other workers' updates on a topic a local socket follows."""
+        if topic in self._topics:
+            return
+        self._topics.add(topic)
+        await self._subscribe(topic_channel(topic))
+
+    async def unsubscribe_topic(self, topic: str) -> None:
+        """Stop receiving a topic once no local socket follows it."""
+        if self.connections.has_subscribers(topic) or topic not in self._topics:
+            return
+        self._topics.discard(topic)
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.unsubscribe(topic_channel(topic))
+            except Exception as e:
+                logger.warning(f"WebSocket fanout unsubscribe error: {e}")
+
+    async def publish(self, topic: str, payload: Dict[str, Any]) -> None:
+        """Send a payload to every socket subscribed to a topic, on any worker.
+
+        Args:
+            topic: Topic name
+            payload: JSON-serializable message
+        """
+        payload = {**payload, "topic": topic}
+        await self.connections.send_topic_message(payload, topic)
+
+        from core.database import get_redis
+
+        try:
+            redis_client = await get_redis()
+            await redis_client.publish(
+                topic_channel(topic),
+                json.dumps(
+                    {"topic": topic, "origin": self.worker_id, "payload": payload},
+                    default=str,
+                ),
+            )
+        except Exception as e:
+            logger.error(f"WebSocket fanout publish error: {e}")
+
+    async def deliver(self, user_id: int, payload: Dict[str, Any]) -> bool:
+        """Send a payload to every device of a user, on any worker.
+
+        Args:
+            user_id: Receiving user
+            payload: JSON-serializable message
+
+        Returns:
+            True once some socket of the user accepted the payload
+        """
+        if self.log is not None:
+            seq = await self.log.append(user_id, payload)
+            if seq is not None:
+                payload = {**payload, "seq": seq}
+
+        local = False
+        if self.connections.is_connected(user_id):
+            local = await self.connections.send_personal_message(payload, user_id)
+
+        from core.database import get_redis
+
+        delivery_id = uuid.uuid4().hex
+        # No need to wait for remote acks once a local socket has it
+        pending = None if local else _PendingAck()
+        if pending is not None:
+            self._pending[delivery_id] = pending
+        try:
+            redis_client = await get_redis()
+            receivers = await redis_client.publish(
+                user_channel(user_id),
+                json.dumps(
+                    {
+                        "id": delivery_id,
+                        "user_id": user_id,
+                        "origin": self.worker_id,
+                        "reply_to": None if local else self.ack_channel,
+                        "payload": payload,
+                    },
+                    default=str,
+                ),
+            )
+            # NOTE - This worker is among the subscribers when it holds one of
+            # the user's sockets; it ignores its own publishes
+            remote = receivers - (user_id in self._users)
+            if pending is None or remote <= 0:
+                return local
+            pending.expect(remote)
+            return await asyncio.wait_for(pending.future, settings.WS_ACK_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(f"WebSocket delivery to user {user_id} was not acknowledged")
+            return False
+        except Exception as e:
+            logger.error(f"WebSocket fanout publish error: {e}")
+            return local
+        finally:
+            self._pending.pop(delivery_id, None)
+
+    async def run(self) -> None:
+        """Receive deliveries and acks from other workers until cancelled."""
+        from core.database import get_redis
+
+        backoff = 1
+        while True:
+            pubsub = None
+            try:
+                redis_client = await get_redis()
+                pubsub = redis_client.pubsub()
+                await pubsub.subscribe(
+                    self.ack_channel,
+                    *(user_channel(uid) for uid in self._users),
+                    *(topic_channel(topic) for topic in self._topics),
+                )
+                self._pubsub = pubsub
+                backoff = 1
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    self._handle(message["channel"], json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"WebSocket fanout listener error: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+            finally:
+                self._pubsub = None
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+
+    async def _subscribe(self, channel: str) -> None:
+        # Users registered while the listener is down are subscribed on reconnect
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.subscribe(channel)
+            except Exception as e:
+                logger.warning(f"WebSocket fanout subscribe error: {e}")
+
+    def _handle(self, channel: str, data: Dict[str, Any]) -> None:
+        if channel == self.ack_channel:
+            pending = self._pending.get(data.get("id"))
+            if pending is not None:
+                if data.get("delivered"):
+                    pending.positive()
+                else:
+                    pending.nack()
+            return
+        if data.get("origin") == self.worker_id:
+            return
+        # Socket writes run off the listener so one slow client cannot stall it
+        if "topic" in data:
+            task = asyncio.create_task(
+                self.connections.send_topic_message(data["payload"], data["topic"])
+            )
+        else:
+            task = asyncio.create_task(self._deliver_remote(data))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _deliver_remote(self, data: Dict[str, Any]) -> None:
+        delivered = await self.connections.send_personal_message(
+            data["payload"], data["user_id"]
+        )
+        reply_to = data.get("reply_to")
+        if not reply_to:
+            return
+        from core.database import get_redis
+
+        try:
+            redis_client = await get_redis()
+            await redis_client.publish(
+                reply_to, json.dumps({"id": data["id"], "delivered": delivered})
+            )
+        except Exception as e:
+            logger.error(f"WebSocket fanout ack error: {e}")
+
+
+_fanout: Optional[WebSocketFanout] = None
+
+
+def get_websocket_fanout() -> WebSocketFanout:
+    """Get this worker's fanout over the global connection registry.
+
+    Returns:
+        WebSocketFanout instance
+    """
+    global _fanout
+    if _fanout is None:
+        _fanout = WebSocketFanout(get_connection_manager(), log=get_delivery_log())
+    return _fanout
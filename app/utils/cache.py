@@ -1,10 +1,15 @@
 """Cache utilities and decorators."""
 
+import asyncio
+import math
+import random
+import time
 from functools import wraps
-from typing import Any, Callable, Optional, Coroutine
-import json
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Coroutine, Tuple, Union
 from datetime import timedelta
 import redis.asyncio as redis
+from app.utils.cache_keys import generation_key, version_key
+from app.utils.codec import CodecError, get_codec
 from core.logger import get_logger
 
 logger = get_logger(__name__)
@@ -20,6 +25,23 @@ CACHE_TTL = {
     "user_stats": timedelta(hours=1),
     "contract": timedelta(minutes=15),
     "property_detail": timedelta(minutes=15),
+    "principal": timedelta(minutes=2),
+    "property_card": timedelta(minutes=15),
+}
+
+# In-process L1 per namespace: (TTL, max entries). L1 entries are dropped
+# across workers over pub/sub; the short TTLs bound staleness if a message is
+# lost. Namespaces not listed are Redis only but still get counters.
+L1_CACHE = {
+    "system_config": (timedelta(minutes=5), 1_000),
+    "property_detail": (timedelta(seconds=30), 5_000),
+    "property_card": (timedelta(seconds=30), 5_000),
+    "property_summary": (timedelta(seconds=30), 5_000),
+    "property_feed": (timedelta(seconds=5), 1_000),
+    "search_results": (timedelta(seconds=5), 1_000),
+    "user_profile": (timedelta(seconds=10), 5_000),
+    "agent_profile": (timedelta(seconds=30), 2_000),
+    "principal": (timedelta(seconds=30), 10_000),
 }
 
 
@@ -39,9 +61,9 @@ async def get_cached(
     try:
         value = await redis_client.get(key)
         if value:
-            return json.loads(value)
             logger.debug(f"Cache hit", extra={"key": key})
-    except json.JSONDecodeError:
+            return get_codec().decode(value)
+    except CodecError:
         logger.error(f"Cache value decode error", extra={"key": key})
         await delete_cached(redis_client, key)
     except Exception as e:
@@ -67,7 +89,9 @@ async def set_cached(
         ttl = CACHE_TTL["property_feed"]
 
     try:
-        await redis_client.setex(key, int(ttl.total_seconds()), json.dumps(value))
+        await redis_client.setex(
+            key, int(ttl.total_seconds()), get_codec().encode(value)
+        )
         logger.debug(
             f"Cache set", extra={"key": key, "ttl_seconds": int(ttl.total_seconds())}
         )
@@ -97,6 +121,101 @@ async def delete_cached(redis_client: redis.Redis, key: str) -> bool:
     return False
 
 
+async def get_many_cached(
+    redis_client: redis.Redis, keys: List[str]
+) -> Dict[str, Any]:
+    """Get several values with one MGET.
+
+    Args:
+        redis_client: Redis async client
+        keys: Cache keys
+
+    Returns:
+        Mapping of found keys to values; misses and undecodable entries are omitted
+    """
+    if not keys:
+        return {}
+    try:
+        values = await redis_client.mget(keys)
+    except Exception as e:
+        logger.error(f"Cache mget error: {e}", extra={"keys": len(keys)})
+        return {}
+
+    found, corrupt = {}, []
+    codec = get_codec()
+    for key, value in zip(keys, values):
+        if not value:
+            continue
+        try:
+            found[key] = codec.decode(value)
+        except CodecError:
+            logger.error(f"Cache value decode error", extra={"key": key})
+            corrupt.append(key)
+    if corrupt:
+        await delete_many_cached(redis_client, corrupt)
+    return found
+
+
+async def set_many_cached(
+    redis_client: redis.Redis,
+    items: Dict[str, Any],
+    ttl: Union[timedelta, Dict[str, timedelta], None] = None,
+) -> bool:
+    """Set several values in one pipelined round trip.
+
+    Args:
+        redis_client: Redis async client
+        items: Mapping of keys to values
+        ttl: One TTL for every key (defaults to 5 minutes), or a TTL for
+            each key
+
+    Returns:
+        True if successful
+
+    Raises:
+        ValueError: If ``ttl`` is a mapping that misses one of the keys
+    """
+    if not items:
+        return True
+    if isinstance(ttl, dict):
+        missing = items.keys() - ttl.keys()
+        if missing:
+            raise ValueError(f"No cache TTL for keys: {sorted(missing)}")
+        ttls = ttl
+    else:
+        ttls = dict.fromkeys(items, ttl or CACHE_TTL["property_feed"])
+    codec = get_codec()
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                pipe.setex(key, int(ttls[key].total_seconds()), codec.encode(value))
+            await pipe.execute()
+        logger.debug(f"Cache set many", extra={"keys": len(items)})
+        return True
+    except Exception as e:
+        logger.error(f"Cache set many error: {e}", extra={"keys": len(items)})
+    return False
+
+
+async def delete_many_cached(redis_client: redis.Redis, keys: List[str]) -> int:
+    """Delete several keys with one DEL.
+
+    Args:
+        redis_client: Redis async client
+        keys: Cache keys
+
+    Returns:
+        Number of keys deleted
+    """
+    if not keys:
+        return 0
+    try:
+        return await redis_client.delete(*keys)
+    except Exception as e:
+        logger.error(f"Cache delete many error: {e}", extra={"keys": len(keys)})
+    return 0
+
+
 async def clear_pattern(redis_client: redis.Redis, pattern: str) -> int:
     """Delete all keys matching pattern.
 
@@ -130,6 +249,225 @@ async def clear_pattern(redis_client: redis.Redis, pattern: str) -> int:
     return 0
 
 
+# SECTION - Read-through cache with stampede protection
+
+# NOTE - Entries are stored as an envelope:
+#   {"value": ..., "version": int | None, "delta": float, "expiry": float}
+# ``delta`` is how long the last rebuild took and ``expiry`` the unix time the
+# entry goes stale; together they drive probabilistic early refresh (XFetch).
+
+# Only overwrite an entry if it is not newer than what we are writing, so a
+# slow rebuild that read the row before an update cannot clobber the update.
+# The version lives in a sibling key because payloads are opaque to Lua, and
+# it outlives a deleted entry for the same TTL.
+_SET_IF_NOT_NEWER = """
+local current = redis.call('GET', KEYS[2])
+if current and tonumber(current) > tonumber(ARGV[2]) then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[3])
+redis.call('SET', KEYS[2], ARGV[2], 'PX', ARGV[3])
+return 1
+"""
+
+LOCK_TIMEOUT = timedelta(seconds=10)
+# NOTE - Waiting on another worker's rebuild is capped well below the lock
+# TTL; past it the waiter loads for itself rather than holding the request
+LOCK_WAIT = timedelta(seconds=1)
+LOCK_POLL_INTERVAL = 0.05
+
+_inflight: dict[str, asyncio.Task] = {}
+
+
+def should_refresh_early(
+    delta: float, expiry: float, beta: float = 1.0, now: Optional[float] = None
+) -> bool:
+    """Decide whether to rebuild an entry before it expires.
+
+    The chance grows as expiry approaches and with the cost of a rebuild, so
+    one request refreshes a hot key ahead of time instead of every request
+    missing together when it expires.
+
+    Args:
+        delta: Seconds the last rebuild took
+        expiry: Unix time the entry goes stale
+        beta: Values above 1 favour earlier refreshes
+        now: Current unix time (defaults to ``time.time()``)
+
+    Returns:
+        True if the caller should rebuild now
+    """
+    now = time.time() if now is None else now
+    return now - delta * beta * math.log(1.0 - random.random()) >= expiry
+
+
+async def set_versioned(
+    redis_client: redis.Redis,
+    key: str,
+    value: Any,
+    version: Optional[int],
+    ttl: timedelta,
+    delta: float = 0.0,
+) -> bool:
+    """Store a read-through envelope unless a newer version is cached.
+
+    Args:
+        redis_client: Redis async client
+        key: Cache key
+        value: JSON-serializable value
+        version: Monotonic version of the value (e.g. ``updated_at`` in µs)
+        ttl: Time to live
+        delta: Seconds the value took to build
+
+    Returns:
+        True if the entry was written
+    """
+    envelope = {
+        "value": value,
+        "version": version,
+        "delta": delta,
+        "expiry": time.time() + ttl.total_seconds(),
+    }
+    payload = get_codec().encode(envelope)
+    ttl_ms = int(ttl.total_seconds() * 1000)
+    try:
+        if version is None:
+            await redis_client.set(key, payload, px=ttl_ms)
+            return True
+        return bool(
+            await redis_client.eval(
+                _SET_IF_NOT_NEWER, 2, key, version_key(key), payload, version, ttl_ms
+            )
+        )
+    except Exception as e:
+        logger.error(f"Cache set error: {e}", extra={"key": key, "error": str(e)})
+    return False
+
+
+async def _rebuild(
+    redis_client: redis.Redis,
+    key: str,
+    loader: Callable[[], Awaitable[Tuple[Any, Optional[int]]]],
+    ttl: timedelta,
+    stale: Optional[dict],
+) -> Any:
+    lock = redis_client.lock(f"lock:{key}", timeout=LOCK_TIMEOUT.total_seconds())
+    try:
+        acquired = await lock.acquire(blocking=False)
+    except Exception as e:
+        logger.warning(f"Cache lock unavailable: {e}", extra={"key": key})
+        lock, acquired = None, True
+
+    if not acquired:
+        if stale is not None:
+            return stale["value"]
+        # NOTE - Another worker is rebuilding; wait for its result
+        deadline = time.monotonic() + LOCK_WAIT.total_seconds()
+        while time.monotonic() < deadline:
+            await asyncio.sleep(LOCK_POLL_INTERVAL)
+            envelope = await get_cached(redis_client, key)
+            if isinstance(envelope, dict) and "value" in envelope:
+                return envelope["value"]
+        logger.warning(f"Cache rebuild wait timed out", extra={"key": key})
+
+    try:
+        started = time.monotonic()
+        value, version = await loader()
+        delta = time.monotonic() - started
+        await set_versioned(redis_client, key, value, version, ttl, delta)
+        return value
+    finally:
+        if lock is not None and acquired:
+            try:
+                await lock.release()
+            except Exception as e:
+                logger.warning(f"Cache lock release failed: {e}", extra={"key": key})
+
+
+async def read_through(
+    redis_client: redis.Redis,
+    key: str,
+    loader: Callable[[], Awaitable[Tuple[Any, Optional[int]]]],
+    ttl: timedelta,
+    beta: float = 1.0,
+) -> Any:
+    """Get a value, rebuilding it at most once across callers on a miss.
+
+    Concurrent callers in this process share one rebuild; across workers a
+    Redis lock lets a single worker rebuild while the others wait for its
+    result. Hot entries are refreshed early with probability rising towards
+    expiry, and callers that lose the refresh race are served the stale value.
+
+    Args:
+        redis_client: Redis async client
+        key: Cache key
+        loader: Coroutine factory returning ``(value, version)``
+        ttl: Time to live
+        beta: Early refresh aggressiveness
+
+    Returns:
+        Cached or freshly loaded value
+    """
+    envelope = await get_cached(redis_client, key)
+    if not (isinstance(envelope, dict) and "value" in envelope):
+        envelope = None
+    elif not should_refresh_early(envelope["delta"], envelope["expiry"], beta):
+        return envelope["value"]
+
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(
+            _rebuild(redis_client, key, loader, ttl, stale=envelope)
+        )
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    return await asyncio.shield(task)
+
+
+# SECTION - Generation counters
+
+
+async def get_generation(redis_client: redis.Redis, tag: str) -> Optional[int]:
+    """Get the current generation of a tag.
+
+    Args:
+        redis_client: Redis async client
+        tag: Invalidation tag
+
+    Returns:
+        Generation number, or None if Redis is unavailable
+    """
+    try:
+        return int(await redis_client.get(generation_key(tag)) or 0)
+    except Exception as e:
+        logger.error(f"Cache generation error: {e}", extra={"tag": tag})
+    return None
+
+
+async def bump_generations(redis_client: redis.Redis, tags: list[str]) -> int:
+    """Invalidate every key under the given tags in one round trip.
+
+    Args:
+        redis_client: Redis async client
+        tags: Invalidation tags
+
+    Returns:
+        Number of tags bumped
+    """
+    if not tags:
+        return 0
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.incr(generation_key(tag))
+            await pipe.execute()
+        logger.debug(f"Cache generations bumped", extra={"tags": tags})
+        return len(tags)
+    except Exception as e:
+        logger.error(f"Cache generation bump error: {e}", extra={"tags": tags})
+    return 0
+
+
 def cache_decorator(key_func: Callable, ttl: Optional[timedelta] = None) -> Callable:
     """Decorator for caching async function results.
 
@@ -146,9 +484,9 @@ def cache_decorator(key_func: Callable, ttl: Optional[timedelta] = None) -> Call
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         async def wrapper(*args, **kwargs) -> Any:
-            from core.database import get_redis
+            from core.database import get_cache_redis
 
-            redis_client = await get_redis()
+            redis_client = await get_cache_redis()
 
             key = key_func(*args, **kwargs)
 
@@ -8,6 +8,11 @@ def user_profile_key(user_id: int) -> str:
     return f"user:profile:{user_id}"
 
 
+def principal_key(sub: int | str, account_type: str) -> str:
+    """Authenticated principal cache key."""
+    return f"auth:principal:{account_type}:{sub}"
+
+
 def user_listings_key(user_id: int, page: int = 1) -> str:
     """User property listings cache key."""
     return f"user:{user_id}:listings:p{page}"
@@ -25,6 +30,16 @@ def property_detail_key(property_id: int) -> str:
     return f"property:detail:{property_id}"
 
 
+def property_card_key(property_id: int) -> str:
+    """Property feed entry cache key."""
+    return f"property:card:{property_id}"
+
+
+def property_summary_key(property_id: int) -> str:
+    """Property summary (chat context) cache key."""
+    return f"property:summary:{property_id}"
+
+
 def search_results_key(query: str, filters_hash: str) -> str:
     """Search results cache key."""
     return f"search:{query}:{filters_hash}"
@@ -65,45 +80,77 @@ def device_tokens_key(user_id: int) -> str:
     return f"devices:{user_id}"
 
 
-# Cache invalidation patterns
+# SECTION - Generation tags
+# NOTE - Namespaced keys embed the current generation of their tag
+# (``<key>:g<n>``); bumping the tag's counter orphans every key in the
+# namespace in O(1) and the orphans age out through their TTL.
+
+PROPERTY_FEED_TAG = "property:feed"
+SEARCH_TAG = "search"
+
+
+def user_tag(user_id: int) -> str:
+    """Tag for a user's profile and listings."""
+    return f"user:{user_id}"
+
+
+def agent_tag(agent_id: int) -> str:
+    """Tag for an agent's profile and stats."""
+    return f"agent:{agent_id}"
+
+
+def chat_tag(conversation_id: int) -> str:
+    """Tag for a conversation's history pages."""
+    return f"chat:{conversation_id}"
+
+
+def contract_tag(contract_id: int) -> str:
+    """Tag for a contract."""
+    return f"contract:{contract_id}"
+
+
+def generation_key(tag: str) -> str:
+    """Generation counter key for a tag."""
+    return f"gen:{tag}"
+
+
+def version_key(key: str) -> str:
+    """Version marker key guarding a versioned entry."""
+    return f"{key}:version"
+
+
+def tagged_key(key: str, generation: int) -> str:
+    """Key scoped to a tag generation."""
+    return f"{key}:g{generation}"
+
+
+# Cache invalidation tags
 def invalidate_user_cache(user_id: int) -> list[str]:
-    """Keys to invalidate when user is updated."""
-    return [
-        f"user:profile:{user_id}",
-        f"user:{user_id}:*",
-    ]
+    """Tags to bump when user is updated."""
+    return [user_tag(user_id)]
 
 
 def invalidate_property_cache(property_id: int) -> list[str]:
-    """Keys to invalidate when property is updated."""
-    return [
-        f"property:detail:{property_id}",
-        f"property:feed:*",
-        f"search:*",
-    ]
+    """Tags to bump when property is updated.
+
+    The property's detail key is deleted directly, not through a tag.
+    """
+    return [PROPERTY_FEED_TAG, SEARCH_TAG]
 
 
 def invalidate_listing_cache(agent_id: int) -> list[str]:
-    """Keys to invalidate when listing is updated."""
-    return [
-        f"agent:profile:{agent_id}",
-        f"agent:{agent_id}:*",
-        f"property:feed:*",
-    ]
+    """Tags to bump when listing is updated."""
+    return [agent_tag(agent_id), PROPERTY_FEED_TAG]
 
 
 def invalidate_chat_cache(conversation_id: int) -> list[str]:
-    """Keys to invalidate when chat is updated."""
-    return [
-        f"chat:{conversation_id}:*",
-    ]
+    """Tags to bump when chat is updated."""
+    return [chat_tag(conversation_id)]
 
 
 def invalidate_contract_cache(contract_id: int) -> list[str]:
-    """Keys to invalidate when contract is updated."""
-    return [
-        f"contract:{contract_id}",
-    ]
+    """Tags to bump when contract is updated."""
+    return [contract_tag(contract_id)]
 
 
 def generate_filter_hash(filters: dict) -> str:
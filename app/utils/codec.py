@@ -0,0 +1,194 @@
+"""
+Codecs for cached payloads.
+Values are serialized with orjson, msgpack or stdlib json, and compressed
+with zstd, lz4 or zlib once they cross a size threshold. Every payload starts
+with a small header naming its serializer and compression, so the configured
+codec can change without flushing Redis: old entries still decode.
+
+Binary payloads need a Redis client created with ``decode_responses=False``.
+"""
+
+import json
+import zlib
+from functools import lru_cache
+from typing import Any, Callable, Dict, Tuple, Union
+
+from core.configs import settings
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import msgpack
+
+    HAS_MSGPACK = True
+except ImportError:
+    HAS_MSGPACK = False
+
+try:
+    import zstandard
+
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+try:
+    import lz4.frame
+
+    HAS_LZ4 = True
+except ImportError:
+    HAS_LZ4 = False
+
+# NOTE - Header: MAGIC, serializer id, compression id. Plain JSON written
+# before codecs existed is ASCII and never starts with MAGIC.
+MAGIC = 0xC5
+HEADER_SIZE = 3
+
+
+class CodecError(ValueError):
+    """Raised when a cached payload cannot be decoded."""
+
+
+def _json_dumps(value: Any) -> bytes:
+    return json.dumps(value, default=str, separators=(",", ":")).encode()
+
+
+def _orjson_dumps(value: Any) -> bytes:
+    return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _msgpack_dumps(value: Any) -> bytes:
+    return msgpack.packb(value, default=str, use_bin_type=True)
+
+
+def _msgpack_loads(payload: bytes) -> Any:
+    return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+
+
+# name -> (id, dumps, loads, available)
+SERIALIZERS: Dict[str, Tuple[int, Callable, Callable, bool]] = {
+    "json": (1, _json_dumps, json.loads, True),
+    "orjson": (2, _orjson_dumps, orjson.loads if HAS_ORJSON else None, HAS_ORJSON),
+    "msgpack": (3, _msgpack_dumps, _msgpack_loads, HAS_MSGPACK),
+}
+
+# name -> (id, compress, decompress, available)
+COMPRESSORS: Dict[str, Tuple[int, Callable, Callable, bool]] = {
+    "none": (0, None, None, True),
+    "zlib": (1, lambda data: zlib.compress(data, 6), zlib.decompress, True),
+    "zstd": (
+        2,
+        (lambda data: zstandard.ZstdCompressor(level=3).compress(data))
+        if HAS_ZSTD
+        else None,
+        (lambda data: zstandard.ZstdDecompressor().decompress(data))
+        if HAS_ZSTD
+        else None,
+        HAS_ZSTD,
+    ),
+    "lz4": (
+        3,
+        lz4.frame.compress if HAS_LZ4 else None,
+        lz4.frame.decompress if HAS_LZ4 else None,
+        HAS_LZ4,
+    ),
+}
+
+_SERIALIZERS_BY_ID = {spec[0]: spec for spec in SERIALIZERS.values()}
+_COMPRESSORS_BY_ID = {spec[0]: spec for spec in COMPRESSORS.values()}
+
+
+def _pick(registry: Dict[str, tuple], name: str, preference: Tuple[str, ...]) -> str:
+    """Resolve ``auto`` or an unavailable back end to the best installed one."""
+    if name != "auto" and registry.get(name, (None,) * 4)[3]:
+        return name
+    return next(candidate for candidate in preference if registry[candidate][3])
+
+
+class Codec:
+    """Serialize and optionally compress cache values behind a format header."""
+
+    def __init__(
+        self,
+        serializer: str = "auto",
+        compression: str = "auto",
+        threshold: int = 1024,
+    ):
+        """Initialize codec.
+
+        Args:
+            serializer: ``orjson``, ``msgpack``, ``json`` or ``auto``
+            compression: ``zstd``, ``lz4``, ``zlib``, ``none`` or ``auto``
+            threshold: Payloads smaller than this many bytes are not compressed
+        """
+        self.serializer = _pick(SERIALIZERS, serializer, ("orjson", "msgpack", "json"))
+        self.compression = _pick(
+            COMPRESSORS, compression, ("zstd", "lz4", "zlib", "none")
+        )
+        self.threshold = threshold
+
+    def encode(self, value: Any) -> bytes:
+        """Encode a value with the configured back ends.
+
+        Args:
+            value: Value to encode
+
+        Returns:
+            Header-prefixed payload
+        """
+        serializer_id, dumps, _, _ = SERIALIZERS[self.serializer]
+        body = dumps(value)
+        compression_id, compress, _, _ = COMPRESSORS[self.compression]
+        if compress is None or len(body) < self.threshold:
+            compression_id = 0
+        else:
+            body = compress(body)
+        return bytes((MAGIC, serializer_id, compression_id)) + body
+
+    def decode(self, payload: Union[bytes, str]) -> Any:
+        """Decode a payload written by any codec, or legacy plain JSON.
+
+        Args:
+            payload: Raw value from Redis
+
+        Returns:
+            Decoded value
+
+        Raises:
+            CodecError: If the payload is corrupt or needs an unavailable back end
+        """
+        if isinstance(payload, str):
+            payload = payload.encode()
+        try:
+            if not payload or payload[0] != MAGIC:
+                return json.loads(payload)
+            if len(payload) < HEADER_SIZE:
+                raise CodecError("truncated payload header")
+            serializer = _SERIALIZERS_BY_ID.get(payload[1])
+            compressor = _COMPRESSORS_BY_ID.get(payload[2])
+            if serializer is None or not serializer[3]:
+                raise CodecError(f"unsupported serializer id {payload[1]}")
+            if compressor is None or not compressor[3]:
+                raise CodecError(f"unsupported compression id {payload[2]}")
+            body = payload[HEADER_SIZE:]
+            if compressor[2] is not None:
+                body = compressor[2](body)
+            return serializer[2](body)
+        except CodecError:
+            raise
+        except Exception as e:
+            raise CodecError(str(e)) from e
+
+
+@lru_cache
+def get_codec() -> Codec:
+    """Get the codec configured in settings."""
+    return Codec(
+        serializer=settings.CACHE_SERIALIZER,
+        compression=settings.CACHE_COMPRESSION,
+        threshold=settings.CACHE_COMPRESSION_THRESHOLD,
+    )
@@ -67,6 +67,18 @@ class PropertyStatEnum(str, Enum):
     rented = "rented"
 
 
+class FeedSortEnum(str, Enum):
+    newest = "newest"
+    oldest = "oldest"
+    price_asc = "price_asc"
+    price_desc = "price_desc"
+
+
+class FeedViewEnum(str, Enum):
+    full = "full"
+    card = "card"
+
+
 class UserRole(str, Enum):
     USER = "user"
     ADMIN = "admin"
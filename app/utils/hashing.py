@@ -0,0 +1,101 @@
+"""
+Password hashing off the event loop.
+bcrypt is deliberately slow (100-300 ms per call), so hash and verify jobs run
+on a small dedicated thread pool (bcrypt releases the GIL) with a cap on jobs
+in flight; a login burst is shed with 503 instead of stalling the worker.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional, Tuple, TypeVar
+
+from fastapi import HTTPException, status
+
+from core.configs import settings
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_in_flight = 0
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            thread_name_prefix="password-hash",
+        )
+    return _executor
+
+
+async def _run(func: Callable[..., T], *args: Any) -> T:
+    global _in_flight
+    if _in_flight >= settings.PASSWORD_HASH_MAX_QUEUE:
+        logger.warning(f"Password hashing queue full ({_in_flight} jobs)")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server busy, please retry",
+            headers={"Retry-After": "1"},
+        )
+    _in_flight += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), partial(func, *args))
+    finally:
+        _in_flight -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Hash a password on the hashing pool.
+
+    Args:
+        password: Plain text password
+
+    Returns:
+        Password hash
+    """
+    return await _run(settings.pwd_context.hash, password)
+
+
+async def verify_password_async(password: str, password_hash: str) -> bool:
+    """
+    Verify a password on the hashing pool.
+
+    Args:
+        password: Plain text password
+        password_hash: Stored hash
+
+    Returns:
+        True if the password matches
+    """
+    return await _run(settings.pwd_context.verify, password, password_hash)
+
+
+async def verify_and_update_async(
+    password: str, password_hash: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and rehash it if the stored hash uses outdated parameters.
+
+    Args:
+        password: Plain text password
+        password_hash: Stored hash
+
+    Returns:
+        Tuple of (is_valid, new_hash); new_hash is None unless a rehash is needed
+    """
+    return await _run(settings.pwd_context.verify_and_update, password, password_hash)
+
+
+def shutdown_hashing_executor() -> None:
+    """Release the hashing threads."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
@@ -0,0 +1,218 @@
+"""
+In-process L1 cache in front of Redis.
+Each namespace is an LRU with its own TTL and size cap. Entries may carry an
+invalidation tag so bumping a tag generation in Redis can drop the matching L1
+entries too; invalidations are broadcast to the other workers over Redis
+pub/sub.
+"""
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+import redis.asyncio as redis
+
+from app.utils.cache import L1_CACHE
+from core.configs import settings
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+MISSING = object()
+
+
+@dataclass
+class NamespaceStats:
+    """Counters for one cache namespace."""
+
+    l1_hits: int = 0
+    l2_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+class _Namespace:
+    def __init__(self, ttl: timedelta, max_entries: int):
+        self.ttl = ttl.total_seconds()
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, Tuple[float, Any, Optional[str]]]" = (
+            OrderedDict()
+        )
+        self.stats = NamespaceStats()
+
+
+class LocalCache:
+    """Per-namespace LRU/TTL cache with a tag index for invalidation."""
+
+    def __init__(self, config: Dict[str, Tuple[timedelta, int]] = L1_CACHE):
+        self._config = config
+        self._namespaces: Dict[str, _Namespace] = {}
+        self._tags: Dict[str, Set[Tuple[str, str]]] = {}
+
+    def _namespace(self, namespace: str) -> _Namespace:
+        ns = self._namespaces.get(namespace)
+        if ns is None:
+            ttl, max_entries = self._config.get(namespace, (timedelta(0), 0))
+            if not settings.CACHE_L1_ENABLED:
+                max_entries = 0
+            ns = self._namespaces[namespace] = _Namespace(ttl, max_entries)
+        return ns
+
+    def _drop(self, namespace: str, key: str) -> bool:
+        entry = self._namespaces[namespace].entries.pop(key, None)
+        if entry is None:
+            return False
+        tag = entry[2]
+        if tag is not None:
+            members = self._tags.get(tag)
+            if members is not None:
+                members.discard((namespace, key))
+                if not members:
+                    del self._tags[tag]
+        return True
+
+    def get(self, namespace: str, key: str) -> Any:
+        """Get a value, or ``MISSING`` if absent or expired."""
+        ns = self._namespace(namespace)
+        entry = ns.entries.get(key)
+        if entry is None:
+            return MISSING
+        if entry[0] < time.monotonic():
+            self._drop(namespace, key)
+            return MISSING
+        ns.entries.move_to_end(key)
+        ns.stats.l1_hits += 1
+        return entry[1]
+
+    def set(self, namespace: str, key: str, value: Any, tag: Optional[str] = None):
+        """Store a value; the least recently used entries beyond the cap are evicted.
+
+        Values are shared by reference between callers and must not be mutated.
+        """
+        ns = self._namespace(namespace)
+        if ns.max_entries <= 0:
+            return
+        self._drop(namespace, key)
+        ns.entries[key] = (time.monotonic() + ns.ttl, value, tag)
+        if tag is not None:
+            self._tags.setdefault(tag, set()).add((namespace, key))
+        while len(ns.entries) > ns.max_entries:
+            oldest = next(iter(ns.entries))
+            self._drop(namespace, oldest)
+            ns.stats.evictions += 1
+
+    def record_l2_hit(self, namespace: str) -> None:
+        self._namespace(namespace).stats.l2_hits += 1
+
+    def record_miss(self, namespace: str) -> None:
+        self._namespace(namespace).stats.misses += 1
+
+    def invalidate(
+        self, keys: Iterable[Tuple[str, str]] = (), tags: Iterable[str] = ()
+    ) -> int:
+        """Drop entries by ``(namespace, key)`` and by tag.
+
+        Returns:
+            Number of entries dropped
+        """
+        targets = set(keys)
+        for tag in tags:
+            targets |= self._tags.get(tag, set())
+        dropped = 0
+        for namespace, key in targets:
+            if namespace in self._namespaces and self._drop(namespace, key):
+                self._namespaces[namespace].stats.invalidations += 1
+                dropped += 1
+        return dropped
+
+    def clear(self) -> None:
+        """Drop every entry, keeping the counters."""
+        for ns in self._namespaces.values():
+            ns.entries.clear()
+        self._tags.clear()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Counters and current size per namespace."""
+        return {
+            name: {**asdict(ns.stats), "size": len(ns.entries)}
+            for name, ns in sorted(self._namespaces.items())
+        }
+
+
+_local_cache: Optional[LocalCache] = None
+
+
+def get_local_cache() -> LocalCache:
+    """Get the process-wide L1 cache."""
+    global _local_cache
+    if _local_cache is None:
+        _local_cache = LocalCache()
+    return _local_cache
+
+
+# SECTION - Cross-worker invalidation
+
+
+async def publish_invalidation(
+    redis_client: redis.Redis,
+    keys: Iterable[Tuple[str, str]] = (),
+    tags: Iterable[str] = (),
+) -> None:
+    """Drop entries locally and tell the other workers to do the same.
+
+    Args:
+        redis_client: Redis async client
+        keys: ``(namespace, key)`` pairs
+        tags: Invalidation tags
+    """
+    keys, tags = list(keys), list(tags)
+    get_local_cache().invalidate(keys, tags)
+    try:
+        await redis_client.publish(
+            settings.CACHE_INVALIDATION_CHANNEL,
+            json.dumps({"keys": keys, "tags": tags}),
+        )
+    except Exception as e:
+        logger.error(f"Cache invalidation publish error: {e}")
+
+
+async def run_invalidation_listener(local_cache: Optional[LocalCache] = None):
+    """Apply L1 invalidations published by other workers until cancelled."""
+    from core.database import get_redis
+
+    local_cache = local_cache or get_local_cache()
+    backoff = 1
+    while True:
+        pubsub = None
+        try:
+            redis_client = await get_redis()
+            pubsub = redis_client.pubsub()
+            await pubsub.subscribe(settings.CACHE_INVALIDATION_CHANNEL)
+            # NOTE - Messages published while disconnected are lost
+            local_cache.clear()
+            backoff = 1
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                payload = json.loads(message["data"])
+                local_cache.invalidate(
+                    [tuple(pair) for pair in payload.get("keys", [])],
+                    payload.get("tags", []),
+                )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Cache invalidation listener error: {e}")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+        finally:
+            if pubsub is not None:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
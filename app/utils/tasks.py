@@ -7,6 +7,8 @@ from core.logger import logger
 from core.database import AsyncSessionLocal
 from app.models.property import Contract, Property
 from app.utils.enums import PropertyStatEnum
+from app.services.last_seen import flush_last_seen_task
+from core.configs import settings
 
 
 scheduler = AsyncIOScheduler()
@@ -48,4 +50,9 @@ def start_scheduler():
         trigger="interval",
         hours=24,  # NOTE - Runs every 24 hours
     )
+    scheduler.add_job(
+        flush_last_seen_task,
+        trigger="interval",
+        seconds=settings.LAST_SEEN_FLUSH_INTERVAL,
+    )
     scheduler.start()
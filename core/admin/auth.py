@@ -5,7 +5,7 @@ from starlette.responses import Response
 from sqlalchemy import select
 from app.models.user import Admin
 from core.database import AsyncSessionLocal
-from app.utils.utils import verify_password
+from app.utils.hashing import verify_password_async
 
 
 
@@ -34,7 +34,7 @@ class AdminAuthProvider(AuthProvider):
             result = await session.execute(query)
             admin_user = result.scalar_one_or_none()
 
-            if admin_user and verify_password(password, admin_user.password):
+            if admin_user and await verify_password_async(password, admin_user.password):
                 # Store minimal info in the encrypted session cookie
                 request.session["admin_user"]={
                     "id": admin_user.id,
@@ -4,7 +4,7 @@ from starlette_admin import DateField, ImageField, PasswordField, EnumField
 from starlette.requests import Request
 from starlette.datastructures import UploadFile
 from typing import Any, Dict
-from app.utils.utils import hash_password
+from app.utils.hashing import hash_password_async
 import cloudinary.uploader
 from app.utils.enums import AccountTypeEnum, KycStatusEnum, UserRole
 from starlette_admin.exceptions import FormValidationError
@@ -62,7 +62,7 @@ class BaseUserModelView(ModelView):
         password = data.get("password")
         
         if password and not settings.pwd_context.identify(password):
-           data["password"] = hash_password(password)
+           data["password"] = await hash_password_async(password)
            
         else:
             if not is_edit:
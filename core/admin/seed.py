@@ -7,7 +7,7 @@ from core.configs import settings
 from core.logger import logger
 
 from app.models.user import Admin
-from app.utils.utils import hash_password
+from app.utils.hashing import hash_password_async
 
 
 async def seed_superadmin() -> None:
@@ -51,7 +51,7 @@ async def seed_superadmin() -> None:
             if not existing.is_superuser:
                 existing.is_superuser = True
             # Keep credentials in sync with env in dev.
-            existing.password = hash_password(password)
+            existing.password = await hash_password_async(password)
             if not existing.email:
                 existing.email = email
             await session.commit()
@@ -60,7 +60,7 @@ async def seed_superadmin() -> None:
         admin = Admin(
             username=username,
             email=email,
-            password=hash_password(password),
+            password=await hash_password_async(password),
             is_superuser=True,
         )
         session.add(admin)
@@ -3,6 +3,7 @@ from dotenv import load_dotenv
 import os
 from passlib.context import CryptContext
 from datetime import timedelta
+from functools import cached_property
 import redis.asyncio as aioredis
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, computed_field
@@ -16,7 +17,27 @@ class Settings(BaseSettings):
     # Don't crash on additional keys in `.env` that aren't modeled here
     # (e.g., admin seeding vars used by `core.admin.seed`).
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
-    pwd_context: CryptContext = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+    # Password hashing
+    PASSWORD_BCRYPT_ROUNDS: int = Field(
+        default=12,
+        description="bcrypt cost; hashes made with another cost are upgraded on login",
+    )
+    PASSWORD_HASH_WORKERS: int = Field(
+        default=2, description="Threads dedicated to password hashing per worker"
+    )
+    PASSWORD_HASH_MAX_QUEUE: int = Field(
+        default=64,
+        description="Hash/verify jobs allowed in flight before rejecting with 503",
+    )
+
+    @cached_property
+    def pwd_context(self) -> CryptContext:
+        return CryptContext(
+            schemes=["bcrypt"],
+            deprecated="auto",
+            bcrypt__rounds=self.PASSWORD_BCRYPT_ROUNDS,
+        )
 
     # General description
     SIGN_UP_DESC: str = Field(
@@ -53,6 +74,127 @@ class Settings(BaseSettings):
     # Database
     DB_URL: str = Field(..., description="Database connection URL")
     REDIS_URL: str = Field(..., description="Redis connection URL")
+    DB_REPLICA_URLS: list[str] = Field(
+        default=[], description="Read replica connection URLs for read-only routes"
+    )
+    DB_REPLICA_RETRY_INTERVAL: int = Field(
+        default=30, description="Seconds a failed replica is skipped before retrying"
+    )
+    DB_READ_YOUR_WRITES_WINDOW: int = Field(
+        default=5,
+        description="Seconds after a user's own write during which their reads use the primary",
+    )
+    DB_POOL_SIZE: int = Field(default=10, description="Persistent connections per worker")
+    DB_MAX_OVERFLOW: int = Field(
+        default=10, description="Extra connections allowed above the pool size"
+    )
+    DB_POOL_TIMEOUT: float = Field(
+        default=30.0, description="Seconds to wait for a free connection"
+    )
+    DB_POOL_RECYCLE: int = Field(
+        default=1800, description="Seconds before a connection is replaced"
+    )
+    DB_POOL_PRE_PING: bool = Field(
+        default=True, description="Test connections on checkout"
+    )
+    DB_STATEMENT_CACHE_SIZE: int = Field(
+        default=256,
+        description="asyncpg prepared statement cache per connection (0 behind PgBouncer transaction pooling)",
+    )
+    DB_STRICT_LOADING: bool = Field(
+        default=False,
+        description="Raise on any relationship access not covered by a loading profile (tests/CI)",
+    )
+
+    # Cache
+    CACHE_L1_ENABLED: bool = Field(
+        default=True, description="Keep an in-process L1 cache in front of Redis"
+    )
+    CACHE_INVALIDATION_CHANNEL: str = Field(
+        default="cache:invalidate",
+        description="Redis pub/sub channel carrying L1 invalidations between workers",
+    )
+    CACHE_SERIALIZER: str = Field(
+        default="auto",
+        description="Cache value serializer: orjson, msgpack, json or auto",
+    )
+    CACHE_COMPRESSION: str = Field(
+        default="auto",
+        description="Cache value compression: zstd, lz4, zlib, none or auto",
+    )
+    CACHE_COMPRESSION_THRESHOLD: int = Field(
+        default=1024, description="Bytes above which cached values are compressed"
+    )
+
+    # Presence (last_seen write-behind)
+    LAST_SEEN_FLUSH_INTERVAL: int = Field(
+        default=30, description="Seconds between bulk last_seen flushes"
+    )
+    LAST_SEEN_STALENESS: int = Field(
+        default=60,
+        description="Seconds a recorded last_seen may lag before it is queued again",
+    )
+
+    # Chat ingest (group commit)
+    CHAT_INGEST_MAX_BATCH: int = Field(
+        default=256, description="Most chat messages written by one group commit"
+    )
+    CHAT_INGEST_MAX_DELAY_MS: int = Field(
+        default=5,
+        description="Milliseconds a message waits for others to join its group commit",
+    )
+    CHAT_INGEST_QUEUE_SIZE: int = Field(
+        default=10_000,
+        description="Chat messages buffered before senders wait for the writer",
+    )
+
+    # WebSockets
+    WS_SEND_QUEUE_SIZE: int = Field(
+        default=256, description="Outbound messages buffered per WebSocket connection"
+    )
+    WS_SLOW_CONSUMER_POLICY: str = Field(
+        default="disconnect",
+        description="What to do when a connection's send queue is full: "
+        "disconnect (close with 1013 so the client reconnects) or drop (discard the message)",
+    )
+    WS_DB_POOL_SIZE: int = Field(
+        default=5,
+        description="Persistent connections per worker in the WebSocket-only pool",
+    )
+    WS_DB_MAX_OVERFLOW: int = Field(
+        default=5, description="Extra WebSocket pool connections above its size"
+    )
+    WS_DB_CONCURRENCY: int = Field(
+        default=4,
+        description="Database operations one WebSocket may have in flight at once",
+    )
+    WS_HEARTBEAT_INTERVAL: float = Field(
+        default=25.0, description="Seconds between server pings on every WebSocket"
+    )
+    WS_HEARTBEAT_TIMEOUT: float = Field(
+        default=60.0,
+        description="Seconds without any client frame before a WebSocket is closed "
+        "and its user stops counting as online",
+    )
+    WS_DELIVERY_LOG_MAXLEN: int = Field(
+        default=1000,
+        description="Recent chat deliveries kept per user for replay on reconnect",
+    )
+    WS_DELIVERY_LOG_TTL: int = Field(
+        default=86400,
+        description="Seconds a user's delivery log is kept after their last delivery",
+    )
+    WS_MAX_TOPICS: int = Field(
+        default=50, description="Topics one notifications WebSocket may subscribe to"
+    )
+    WS_CHANNEL_PREFIX: str = Field(
+        default="ws",
+        description="Prefix of the Redis pub/sub channels carrying WebSocket deliveries",
+    )
+    WS_ACK_TIMEOUT: float = Field(
+        default=1.0,
+        description="Seconds to wait for another worker to acknowledge a delivery",
+    )
 
     # External Services (Phase 2)
     # Firebase Cloud Messaging (Push Notifications)
@@ -151,6 +293,7 @@ class Settings(BaseSettings):
     BLACKLIST_PREFIX: str = "blacklist:{}"
     USER_DATA_PREFIX: str = "user_data:{}"
     OTP_PREFIX: str = "otp:{}"
+    RECENT_WRITE_PREFIX: str = "recent_write:{}"
 
     # Directories
     TEMPLATES_DIR: str = os.path.join(os.getcwd(), "templates")
@@ -1,28 +1,366 @@
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker
+from sqlalchemy import Delete, Insert, Update, event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import ORMExecuteState, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.requests import Request
+from typing import Any, Iterable, Optional
+import itertools
+import jwt
+import time
 import redis.asyncio as redis
 from core.configs import settings
+from core.logger import logger
 
 if not settings.DB_URL:
     raise ValueError("No valid database URL found. Check your configuration.")
 
-db_url = (
-    settings.DB_URL.replace("postgresql://", "postgresql+asyncpg://")
-    if settings.DB_URL.startswith("postgresql://")  # type: ignore
-    else settings.DB_URL
-)
 
-# Apply check_same_thread only for SQLite
-connect_args = {"check_same_thread": False} if db_url.startswith("sqlite") else {}
+def _async_url(url: str) -> str:
+    return (
+        url.replace("postgresql://", "postgresql+asyncpg://")
+        if url.startswith("postgresql://")
+        else url
+    )
+
+
+class PoolMetrics:
+    """Connection checkout wait statistics for one pool."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def observe(self, wait: float, timed_out: bool = False) -> None:
+        self.checkouts += 1
+        self.wait_total += wait
+        self.wait_max = max(self.wait_max, wait)
+        if timed_out:
+            self.timeouts += 1
+
+    def as_dict(self) -> dict:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_avg_ms": (
+                round(self.wait_total / self.checkouts * 1000, 3)
+                if self.checkouts
+                else 0.0
+            ),
+            "wait_max_ms": round(self.wait_max * 1000, 3),
+        }
+
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each of its checkouts waited."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.observe(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.observe(time.perf_counter() - start)
+        return connection
+
+
+def _engine_args(
+    url: str, pool_size: Optional[int] = None, max_overflow: Optional[int] = None
+) -> dict:
+    if url.startswith("sqlite"):
+        # Apply check_same_thread only for SQLite
+        return {"connect_args": {"check_same_thread": False}}
 
+    engine_args: dict = dict(
+        poolclass=MeteredQueuePool,
+        pool_size=pool_size if pool_size is not None else settings.DB_POOL_SIZE,
+        max_overflow=(
+            max_overflow if max_overflow is not None else settings.DB_MAX_OVERFLOW
+        ),
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    if url.startswith("postgresql+asyncpg"):
+        # NOTE - asyncpg keeps its own statement cache; SQLAlchemy adds a
+        # prepared statement LRU on top. Both must be 0 behind PgBouncer.
+        engine_args["connect_args"] = {
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        }
+    return engine_args
 
-engine = create_async_engine(url=db_url, connect_args=connect_args)
+
+db_url = _async_url(settings.DB_URL)
+engine = create_async_engine(url=db_url, **_engine_args(db_url))
 AsyncSessionLocal = async_sessionmaker(bind=engine, expire_on_commit=False)
 Base = declarative_base()
 
+# NOTE - WebSocket work gets its own small pool, so thousands of open sockets
+# can never starve REST routes of connections. SQLite has nothing to pool.
+ws_engine = (
+    engine
+    if db_url.startswith("sqlite")
+    else create_async_engine(
+        url=db_url,
+        **_engine_args(
+            db_url,
+            pool_size=settings.WS_DB_POOL_SIZE,
+            max_overflow=settings.WS_DB_MAX_OVERFLOW,
+        ),
+    )
+)
+WSSessionLocal = async_sessionmaker(bind=ws_engine, expire_on_commit=False)
+
+
+def pool_stats(async_engine: AsyncEngine) -> dict:
+    """Get one engine's pool statistics.
+
+    Args:
+        async_engine: Engine whose pool to report
+
+    Returns:
+        Dict with pool occupancy and, for metered pools, checkout wait times
+    """
+    pool = async_engine.pool
+    stats: dict = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+        )
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        stats.update(metrics.as_dict())
+    return stats
+
+
+def get_pool_stats() -> dict:
+    """Get connection pool statistics for every engine.
+
+    Returns:
+        Dict of primary, WebSocket and per-replica pool statistics
+    """
+    return {
+        "primary": pool_stats(engine),
+        # NOTE - SQLite shares the primary engine with WebSockets
+        "websocket": pool_stats(ws_engine) if ws_engine is not engine else None,
+        "replicas": [
+            {
+                "url": replica.url.render_as_string(hide_password=True),
+                **pool_stats(replica),
+            }
+            for replica in replica_router.replicas
+        ],
+    }
+
+
+# SECTION - Read replicas
+
+
+class ReplicaRouter:
+    """Health-aware round robin over read replica engines."""
+
+    def __init__(
+        self,
+        primary: AsyncEngine,
+        replicas: list[AsyncEngine],
+        retry_interval: float,
+    ):
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.retry_interval = retry_interval
+        self._down_until: dict[Engine, float] = {}
+        self._cycle = itertools.count()
+        for replica in self.replicas:
+            event.listen(replica.sync_engine, "handle_error", self._on_error)
+
+    def _on_error(self, context) -> None:
+        # Connection failures (context.connection is None) or dropped connections
+        if context.engine is not None and (
+            context.is_disconnect or context.connection is None
+        ):
+            self.mark_down(context.engine)
+
+    def mark_down(self, sync_engine: Engine) -> None:
+        """Skip a replica until the retry interval has passed."""
+        logger.warning(f"Read replica {sync_engine.url!r} marked down")
+        self._down_until[sync_engine] = time.monotonic() + self.retry_interval
+
+    def pick(self) -> Optional[Engine]:
+        """Next healthy replica, or None if none are available."""
+        now = time.monotonic()
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[next(self._cycle) % len(self.replicas)]
+            if self._down_until.get(replica.sync_engine, 0.0) <= now:
+                return replica.sync_engine
+        return None
+
+
+class RoutingSession(Session):
+    """Session that reads from one replica and writes to the primary."""
+
+    def __init__(self, *args: Any, router: ReplicaRouter, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.router = router
+        self.use_replica = False
+        self._replica: Optional[Engine] = None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if (
+            not self.use_replica
+            or self._flushing
+            or isinstance(clause, (Insert, Update, Delete))
+        ):
+            return self.router.primary.sync_engine
+        # NOTE - One replica per session so a request sees a single snapshot
+        if self._replica is None:
+            self._replica = self.router.pick() or self.router.primary.sync_engine
+        return self._replica
+
+
+replica_router = ReplicaRouter(
+    engine,
+    [
+        create_async_engine(url=url, **_engine_args(url))
+        for url in map(_async_url, settings.DB_REPLICA_URLS)
+    ],
+    retry_interval=settings.DB_REPLICA_RETRY_INTERVAL,
+)
+ReadSessionLocal = async_sessionmaker(
+    sync_session_class=RoutingSession,
+    router=replica_router,
+    expire_on_commit=False,
+)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session: Session, flush_context) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_dml(orm_execute_state: ORMExecuteState) -> None:
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        orm_execute_state.session.info["wrote"] = True
+
+
+# Principals with a recent write (principal id -> expiry), checked before Redis
+_recent_writes: dict[int, float] = {}
+
+
+async def mark_recent_write(principal_id: int) -> None:
+    """Pin a principal's reads to the primary for the read-your-writes window."""
+    await mark_recent_writes([principal_id])
+
+
+async def mark_recent_writes(principal_ids: Iterable[int]) -> None:
+    """Pin several principals' reads to the primary in one Redis round trip."""
+    principal_ids = set(principal_ids)
+    if not principal_ids:
+        return
+    window = settings.DB_READ_YOUR_WRITES_WINDOW
+    now = time.monotonic()
+    if len(_recent_writes) > 10_000:
+        for key in [k for k, v in _recent_writes.items() if v <= now]:
+            del _recent_writes[key]
+    for principal_id in principal_ids:
+        _recent_writes[principal_id] = now + window
+    try:
+        redis_client = await get_redis()
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for principal_id in principal_ids:
+                pipe.setex(settings.RECENT_WRITE_PREFIX.format(principal_id), window, 1)
+            await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to record recent write: {e}")
+
+
+async def has_recent_write(principal_id: int) -> bool:
+    """Whether a principal wrote within the read-your-writes window."""
+    if _recent_writes.get(principal_id, 0.0) > time.monotonic():
+        return True
+    try:
+        redis_client = await get_redis()
+        return bool(
+            await redis_client.exists(settings.RECENT_WRITE_PREFIX.format(principal_id))
+        )
+    except Exception as e:
+        logger.warning(f"Failed to check recent write, reading from primary: {e}")
+        return True
+
+
+def _token_principal(request: Request) -> Optional[int]:
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        payload = jwt.decode(
+            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+        )
+    except jwt.InvalidTokenError:
+        return None
+    sub = str(payload.get("sub", ""))
+    return int(sub) if sub.isdigit() else None
+
 
 async def get_db():
+    # NOTE - Sessions autobegin: no connection is checked out of the pool
+    # until the first statement, so routes that never query (e.g. auth
+    # served from the principal cache) do not hold a connection.
     db = AsyncSessionLocal()
+    try:
+        yield db
+    except Exception:
+        await db.rollback()
+        raise
+    finally:
+        # principal_id is set by the auth chain on this session
+        if db.info.get("wrote") and db.info.get("principal_id"):
+            await mark_recent_write(db.info["principal_id"])
+        await db.close()
+
+
+async def get_ws_db():
+    """Session from the WebSocket pool for the handshake.
+
+    Handlers close it as soon as the socket is authenticated, so an idle
+    socket holds no connection; later work opens its own short sessions.
+    """
+    db = WSSessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+async def get_read_db(request: Request):
+    """Session for read-only routes.
+
+    Reads go to a healthy replica unless none are configured or the caller
+    wrote within the read-your-writes window; writes always hit the primary.
+    """
+    db = ReadSessionLocal()
+    if replica_router.replicas:
+        principal_id = _token_principal(request)
+        db.sync_session.use_replica = not (
+            principal_id and await has_recent_write(principal_id)
+        )
     try:
         yield db
     except Exception:
@@ -50,9 +388,27 @@ async def get_redis() -> redis.Redis:
     return _redis_client
 
 
+_cache_redis_client: redis.Redis = None
+
+
+async def get_cache_redis() -> redis.Redis:
+    """Get the binary-safe Redis client used for cached payloads.
+
+    Returns:
+        Redis async client that returns raw bytes
+    """
+    global _cache_redis_client
+    if _cache_redis_client is None:
+        _cache_redis_client = redis.from_url(settings.REDIS_URL)
+    return _cache_redis_client
+
+
 async def close_redis():
-    """Close Redis connection."""
-    global _redis_client
+    """Close Redis connections."""
+    global _redis_client, _cache_redis_client
     if _redis_client:
         await _redis_client.close()
         _redis_client = None
+    if _cache_redis_client:
+        await _cache_redis_client.close()
+        _cache_redis_client = None
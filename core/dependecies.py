@@ -1,5 +1,5 @@
 from fastapi import Depends, Form, HTTPException, status
-from core.database import get_db
+from core.database import get_db, get_read_db, get_ws_db
 from typing import Annotated
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import (
@@ -48,6 +48,10 @@ security = HTTPBearerWithScopes(scopes=scopes)
 HTTPBearerDependency = Annotated[HTTPAuthorizationCredentials, Depends(security)]
 
 DBSession = Annotated[AsyncSession, Depends(get_db)]
+# NOTE - Replica-routed session for read-only routes
+ReadDBSession = Annotated[AsyncSession, Depends(get_read_db)]
+# NOTE - WebSocket handshake session, from the dedicated WebSocket pool
+WSDBSession = Annotated[AsyncSession, Depends(get_ws_db)]
 PassWordRequestForm = Annotated[CustomOAuth2PasswordRequestForm, Depends()]
 
 
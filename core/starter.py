@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 from core.database import Base, engine
 from fastapi import FastAPI, Depends, Form
@@ -5,6 +6,10 @@ from core.logger import logger
 from core.configs import settings, redis
 
 from app.utils.tasks import start_scheduler
+from app.services.last_seen import get_last_seen_tracker
+from app.utils.hashing import shutdown_hashing_executor
+from app.utils.local_cache import run_invalidation_listener
+from app.routers.websocket import chat_ingest, presence, ws_fanout
 from core.admin.seed import seed_superadmin
 import cloudinary
 from app.models.user import Admin
@@ -18,6 +23,9 @@ async def lifespan(app: FastAPI):
     logger.info("Tables Created")
     await seed_superadmin()
     start_scheduler()
+    invalidation_listener = asyncio.create_task(run_invalidation_listener())
+    fanout_listener = asyncio.create_task(ws_fanout.run())
+    heartbeat = asyncio.create_task(presence.run())
     # Configuration
     cloudinary.config(
         cloud_name=settings.CLOUDINARY_NAME,
@@ -27,3 +35,12 @@ async def lifespan(app: FastAPI):
     )
 
     yield
+
+    invalidation_listener.cancel()
+    fanout_listener.cancel()
+    heartbeat.cancel()
+    # NOTE - Commit chat messages still waiting for their group commit
+    await chat_ingest.close()
+    # NOTE - Persist buffered presence before the worker exits
+    await get_last_seen_tracker().flush()
+    shutdown_hashing_executor()
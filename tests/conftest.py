@@ -10,10 +10,11 @@ from fastapi.testclient import TestClient
 from httpx import AsyncClient, ASGITransport
 
 from main import app
-from core.database import Base, get_db, AsyncSessionLocal
+from core.database import Base, get_db, get_read_db, get_ws_db, AsyncSessionLocal
 from app.models.user import BaseUser as User, Client
 from app.models.property import Property
 from app.utils.enums import AccountTypeEnum
+from app.utils.local_cache import get_local_cache
 
 # Use in-memory SQLite for tests
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
@@ -38,6 +39,13 @@ def event_loop() -> Generator:
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+def clear_local_cache():
+    """Start every test with an empty in-process cache (ids are reused)."""
+    get_local_cache().clear()
+    yield
+
+
 @pytest.fixture(scope="function")
 async def db() -> AsyncGenerator[AsyncSession, None]:
     """Create database session for tests."""
@@ -53,13 +61,17 @@ async def db() -> AsyncGenerator[AsyncSession, None]:
 
 
 @pytest.fixture(scope="function")
-def override_get_db(db: AsyncSession):
+def override_get_db(db: AsyncSession, monkeypatch):
     """Override database dependency."""
 
     async def _override_get_db():
         yield db
 
     app.dependency_overrides[get_db] = _override_get_db
+    app.dependency_overrides[get_read_db] = _override_get_db
+    app.dependency_overrides[get_ws_db] = _override_get_db
+    # Work that opens its own sessions (e.g. shared cache rebuilds)
+    monkeypatch.setattr("core.database.AsyncSessionLocal", TestingSessionLocal)
     yield
     app.dependency_overrides.clear()
 
@@ -0,0 +1,157 @@
+"""Integration tests for the conversation inbox."""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.chat import ChatMessage
+from app.models.loading import QueryCounter
+from app.models.property import Property
+from app.models.user import Client
+from app.routers.chat import get_conversations, get_unread_count, mark_messages_read
+from app.schemas.chat import ConversationPaginationParams
+from app.services.conversations import record_message
+
+
+@pytest.fixture
+async def inbox(db: AsyncSession, test_user: Client, test_property: Property):
+    """Eight partners, each with a short exchange with ``test_user``."""
+    partners = [
+        Client(
+            email=f"partner{i}@example.com",
+            username=f"partner_{i}",
+            fullname=f"Partner {i}",
+            password="hashed_password_here",
+        )
+        for i in range(8)
+    ]
+    db.add_all(partners)
+    await db.flush()
+
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    messages = []
+    for i, partner in enumerate(partners):
+        sent_at = start + timedelta(hours=i)
+        messages += [
+            ChatMessage(
+                sender_id=partner.id,
+                receiver_id=test_user.id,
+                message=f"hello {i}",
+                is_read=False,
+                timestamp=sent_at,
+            ),
+            ChatMessage(
+                sender_id=partner.id,
+                receiver_id=test_user.id,
+                message=f"about the flat {i}",
+                property_id=test_property.id,
+                is_read=i % 2 == 0,
+                timestamp=sent_at + timedelta(minutes=1),
+            ),
+        ]
+        if i % 3 == 0:
+            messages.append(
+                ChatMessage(
+                    sender_id=test_user.id,
+                    receiver_id=partner.id,
+                    message=f"reply {i}",
+                    is_read=False,
+                    timestamp=sent_at + timedelta(minutes=2),
+                )
+            )
+    for message in messages:
+        db.add(message)
+        await db.flush()
+        await record_message(db, message)
+    await db.commit()
+    return partners
+
+
+@pytest.mark.asyncio
+class TestConversations:
+    """Test inbox contents and its query budget."""
+
+    async def test_fixed_query_count(
+        self, db: AsyncSession, test_user: Client, test_property: Property, inbox
+    ):
+        """A page is one statement however many partners it has."""
+        current_user = SimpleNamespace(id=test_user.id)
+        with QueryCounter(db.bind) as counter:
+            conversations = await get_conversations(
+                current_user, db, ConversationPaginationParams(limit=20)
+            )
+        assert len(conversations) == 8
+        assert counter.selects == 1
+
+        newest = conversations[0]
+        assert newest.other_user_id == inbox[7].id
+        assert newest.other_user_fullname == "Partner 7"
+        assert newest.last_message == "about the flat 7"
+        assert newest.unread_count == 2
+        assert newest.property_title == test_property.title
+
+        replied = next(c for c in conversations if c.other_user_id == inbox[6].id)
+        assert replied.last_message == "reply 6"
+        assert replied.last_message_sender_id == test_user.id
+        assert replied.unread_count == 1
+        assert replied.property_id is None
+
+    async def test_pagination(self, db: AsyncSession, test_user: Client, inbox):
+        """Pages follow last-message recency."""
+        current_user = SimpleNamespace(id=test_user.id)
+        page = await get_conversations(
+            current_user, db, ConversationPaginationParams(offset=2, limit=3)
+        )
+        assert [c.other_user_id for c in page] == [p.id for p in inbox[5:2:-1]]
+
+    async def test_unread_counters(self, db: AsyncSession, test_user: Client, inbox):
+        """The badge reads the counters and marking read resets one of them."""
+        current_user = SimpleNamespace(id=test_user.id)
+        counts = await get_unread_count(current_user, db)
+        # Odd partners left both messages unread, even partners only the first
+        assert counts.total_unread == 4 * 2 + 4 * 1
+        assert counts.conversations_with_unread == 8
+
+        marked = await mark_messages_read(inbox[7].id, current_user, db)
+        assert marked.messages_marked == 2
+
+        counts = await get_unread_count(current_user, db)
+        assert counts.total_unread == 10
+        assert counts.conversations_with_unread == 7
+
+        # The partner's own counter is untouched by the reader's reset
+        partner_counts = await get_unread_count(SimpleNamespace(id=inbox[6].id), db)
+        assert partner_counts.total_unread == 1
+
+    async def test_mark_read_watermark(
+        self, db: AsyncSession, test_user: Client, inbox
+    ):
+        """A watermark marks only older messages, in a single UPDATE."""
+        current_user = SimpleNamespace(id=test_user.id)
+        partner = inbox[7]
+        first = await db.scalar(
+            select(func.min(ChatMessage.id)).where(
+                ChatMessage.sender_id == partner.id
+            )
+        )
+
+        with QueryCounter(db.bind) as counter:
+            marked = await mark_messages_read(
+                partner.id, current_user, db, up_to_id=first
+            )
+        assert marked.messages_marked == 1
+        updates = [s for s in counter.statements if s.startswith("UPDATE chat_message")]
+        assert len(updates) == 1
+
+        conversations = await get_conversations(
+            current_user, db, ConversationPaginationParams(limit=1)
+        )
+        assert conversations[0].unread_count == 1
+
+        marked = await mark_messages_read(partner.id, current_user, db)
+        assert marked.messages_marked == 1
+        counts = await get_unread_count(current_user, db)
+        assert counts.total_unread == 10
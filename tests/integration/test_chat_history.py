@@ -0,0 +1,178 @@
+"""Integration tests for keyset-paged message history."""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.chat import ChatMessage
+from app.models.loading import QueryCounter
+from app.models.property import Property, PropertyImage
+from app.models.user import Client
+from app.routers.chat import chat_history, get_message_history
+from app.schemas.chat import ChatPaginationParams, MessageHistoryParams
+from app.services.conversations import PropertySummaryLoader
+from app.utils.local_cache import get_local_cache
+
+
+@pytest.fixture
+async def exchange(db: AsyncSession, test_user: Client):
+    """Twenty alternating messages between ``test_user`` and a partner."""
+    partner = Client(
+        email="partner@example.com",
+        username="partner",
+        fullname="Partner",
+        password="hashed_password_here",
+    )
+    bystander = Client(
+        email="bystander@example.com",
+        username="bystander",
+        fullname="Bystander",
+        password="hashed_password_here",
+    )
+    db.add_all([partner, bystander])
+    await db.flush()
+
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    messages = [
+        ChatMessage(
+            sender_id=test_user.id if i % 2 else partner.id,
+            receiver_id=partner.id if i % 2 else test_user.id,
+            message=f"message {i}",
+            timestamp=start + timedelta(minutes=i),
+        )
+        for i in range(20)
+    ]
+    # Noise from another conversation must never leak into the page
+    messages.append(
+        ChatMessage(
+            sender_id=bystander.id,
+            receiver_id=test_user.id,
+            message="unrelated",
+            timestamp=start,
+        )
+    )
+    db.add_all(messages)
+    await db.commit()
+    return partner, messages[:20]
+
+
+def _user(client: Client) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=client.id,
+        username=client.username,
+        avatar_url=client.avatar_url,
+        fullname=client.fullname,
+    )
+
+
+@pytest.mark.asyncio
+class TestMessageHistory:
+    """Test cursor paging over a conversation."""
+
+    async def test_before_id_cursor(
+        self, db: AsyncSession, test_user: Client, exchange
+    ):
+        """Following the cursor walks the whole conversation without gaps."""
+        partner, messages = exchange
+        current_user = _user(test_user)
+
+        seen, before_id = [], None
+        while True:
+            page = await get_message_history(
+                partner.id,
+                current_user,
+                db,
+                MessageHistoryParams(limit=6, before_id=before_id),
+            )
+            if not page:
+                break
+            seen += [message.id for message in page]
+            before_id = page[-1].id
+
+        assert seen == [message.id for message in reversed(messages)]
+
+    async def test_page_is_single_history_query(
+        self, db: AsyncSession, test_user: Client, exchange
+    ):
+        """Both directions come back from one statement."""
+        partner, messages = exchange
+        with QueryCounter(db.bind) as counter:
+            page = await get_message_history(
+                partner.id,
+                _user(test_user),
+                db,
+                MessageHistoryParams(limit=5, before_id=messages[10].id),
+            )
+        assert [message.message for message in page] == [
+            f"message {i}" for i in range(9, 4, -1)
+        ]
+        # Partner lookup plus the history page
+        assert counter.selects == 2
+
+    async def test_sent_history_cursor(
+        self, db: AsyncSession, test_user: Client, exchange
+    ):
+        """The sent-messages endpoint pages by message ID as well."""
+        _, messages = exchange
+        sent = [
+            message.id
+            for message in reversed(messages)
+            if message.sender_id == test_user.id
+        ]
+
+        first = await chat_history(test_user, db, ChatPaginationParams(limit=4))
+        rest = await chat_history(
+            test_user, db, ChatPaginationParams(limit=50, before_id=first[-1].id)
+        )
+        assert [message.id for message in first + rest] == sent
+
+    async def test_properties_loaded_once_per_page(
+        self, db: AsyncSession, test_user: Client, test_property: Property, exchange
+    ):
+        """Messages about the same listing share one batched summary lookup."""
+        partner, messages = exchange
+        db.add(PropertyImage(property_id=test_property.id, image_url="a.jpg"))
+        for message in messages:
+            message.property_id = test_property.id
+        await db.commit()
+
+        with QueryCounter(db.bind) as counter:
+            page = await get_message_history(
+                partner.id, _user(test_user), db, MessageHistoryParams(limit=20)
+            )
+        # Partner lookup, history page, one property summary query
+        assert counter.selects == 3
+        assert {message.property_info.title for message in page} == {
+            test_property.title
+        }
+        assert page[0].property_info.images == ["a.jpg"]
+
+        with QueryCounter(db.bind) as counter:
+            await get_message_history(
+                partner.id, _user(test_user), db, MessageHistoryParams(limit=20)
+            )
+        # Summaries now come from L1
+        assert counter.selects == 2
+
+
+@pytest.mark.asyncio
+class TestPropertySummaryLoader:
+    """Test summary batching and caching."""
+
+    async def test_missing_and_repeated_ids(
+        self, db: AsyncSession, test_property: Property
+    ):
+        """Unknown IDs are skipped and repeats are fetched once."""
+        local = get_local_cache()
+        misses = local.stats().get("property_summary", {}).get("misses", 0)
+        loader = PropertySummaryLoader(db)
+        with QueryCounter(db.bind) as counter:
+            summaries = await loader.load_many(
+                [test_property.id, None, test_property.id, 999_999]
+            )
+            assert await loader.load(999_999) is None
+        assert list(summaries) == [test_property.id]
+        assert counter.selects == 1
+        assert local.stats()["property_summary"]["misses"] == misses + 2
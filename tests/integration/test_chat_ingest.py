@@ -0,0 +1,112 @@
+"""Integration tests for the group-commit chat ingest pipeline."""
+
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.chat import ChatMessage, Conversation
+from app.models.loading import QueryCounter
+from app.models.user import Client
+from app.services.chat_ingest import ChatIngest
+
+
+@pytest.fixture
+async def partner(db: AsyncSession) -> Client:
+    partner = Client(
+        email="partner@example.com",
+        username="partner",
+        fullname="Partner",
+        password="hashed_password_here",
+    )
+    db.add(partner)
+    await db.commit()
+    return partner
+
+
+@pytest.fixture
+async def ingest(db: AsyncSession):
+    pipeline = ChatIngest(
+        async_sessionmaker(db.bind, expire_on_commit=False), max_delay=0.05
+    )
+    yield pipeline
+    await pipeline.close()
+
+
+@pytest.mark.asyncio
+class TestChatIngest:
+    """Test batching, acknowledgement and failure isolation."""
+
+    async def test_concurrent_messages_share_one_insert(
+        self, db: AsyncSession, test_user: Client, partner: Client, ingest
+    ):
+        """Messages from many sockets land in one INSERT and get their own IDs."""
+        with QueryCounter(db.bind) as counter:
+            stored = await asyncio.gather(
+                *(
+                    ingest.submit(test_user.id, partner.id, f"message {n}")
+                    for n in range(20)
+                )
+            )
+
+        inserts = [
+            s for s in counter.statements if s.startswith("INSERT INTO chat_message")
+        ]
+        assert len(inserts) == 1
+        ids = [message.id for message in stored]
+        assert len(set(ids)) == 20
+        assert ids == sorted(ids)
+        assert [message.message for message in stored] == [
+            f"message {n}" for n in range(20)
+        ]
+
+        conversation = await db.scalar(select(Conversation))
+        assert conversation.last_message_id == ids[-1]
+        unread = (
+            conversation.unread_low
+            if partner.id < test_user.id
+            else conversation.unread_high
+        )
+        assert unread == 20
+
+    async def test_bad_message_does_not_fail_batch(
+        self, db: AsyncSession, test_user: Client, partner: Client, ingest
+    ):
+        """A message the database rejects fails alone."""
+        results = await asyncio.gather(
+            ingest.submit(test_user.id, partner.id, "fine"),
+            ingest.submit(test_user.id, partner.id, None),
+            ingest.submit(partner.id, test_user.id, "also fine"),
+            return_exceptions=True,
+        )
+
+        assert results[0].id is not None
+        assert isinstance(results[1], Exception)
+        assert results[2].id is not None
+        assert await db.scalar(select(func.count(ChatMessage.id))) == 2
+
+    async def test_close_drains_queue(
+        self, db: AsyncSession, test_user: Client, partner: Client, ingest
+    ):
+        """Messages queued at shutdown are still committed."""
+        pending = asyncio.ensure_future(
+            ingest.submit(test_user.id, partner.id, "last words")
+        )
+        await asyncio.sleep(0)
+        await ingest.close()
+
+        assert (await pending).id is not None
+
+    async def test_senders_read_their_writes(
+        self, test_user: Client, partner: Client, ingest
+    ):
+        """Senders' reads are pinned to the primary after the group commit."""
+        from core.database import _recent_writes
+
+        _recent_writes.pop(test_user.id, None)
+        _recent_writes.pop(partner.id, None)
+        await ingest.submit(test_user.id, partner.id, "hello")
+
+        assert test_user.id in _recent_writes
+        assert partner.id not in _recent_writes
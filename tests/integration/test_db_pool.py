@@ -0,0 +1,61 @@
+"""Integration tests for connection pool configuration and metrics."""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from core.database import MeteredQueuePool, get_pool_stats, pool_stats
+
+
+@pytest.fixture
+async def metered_engine(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=MeteredQueuePool,
+        pool_size=1,
+        max_overflow=0,
+    )
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+class TestConnectionPool:
+    """Test lazy checkout and pool metrics."""
+
+    async def test_unused_session_does_not_checkout(self, metered_engine):
+        """A session that never executes never takes a pool connection."""
+        session_factory = async_sessionmaker(metered_engine)
+        async with session_factory():
+            pass
+        assert metered_engine.pool.metrics.checkouts == 0
+
+    async def test_checkout_is_metered(self, metered_engine):
+        """Checkouts are counted and their wait recorded."""
+        session_factory = async_sessionmaker(metered_engine)
+        async with session_factory() as session:
+            await session.execute(text("SELECT 1"))
+            assert metered_engine.pool.checkedout() == 1
+        assert metered_engine.pool.metrics.checkouts == 1
+        assert metered_engine.pool.metrics.wait_max >= 0
+
+    async def test_pools_metered_separately(self, metered_engine, tmp_path):
+        """Each pool keeps its own metrics."""
+        other = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'other.db'}", poolclass=MeteredQueuePool
+        )
+        try:
+            async with async_sessionmaker(metered_engine)() as session:
+                await session.execute(text("SELECT 1"))
+            assert metered_engine.pool.metrics.checkouts == 1
+            assert other.pool.metrics.checkouts == 0
+        finally:
+            await other.dispose()
+
+    async def test_pool_stats(self, metered_engine):
+        """Pool stats expose occupancy and wait times, per engine."""
+        stats = pool_stats(metered_engine)
+        assert {"pool_class", "size", "checkouts", "timeouts", "wait_avg_ms"} <= set(
+            stats
+        )
+        assert {"primary", "websocket", "replicas"} <= set(get_pool_stats())
@@ -0,0 +1,60 @@
+"""Integration tests for write-behind last_seen tracking."""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models.loading import QueryCounter
+from app.models.user import BaseUser, Client
+from app.services.last_seen import LastSeenTracker
+
+
+@pytest.mark.asyncio
+class TestLastSeenTracker:
+    """Test buffering and bulk flushing of last_seen."""
+
+    async def test_staleness_window(self):
+        """Sightings inside the staleness window are not queued again."""
+        tracker = LastSeenTracker(staleness=timedelta(seconds=60))
+        now = datetime.now(timezone.utc)
+        assert tracker.record(1, now)
+        assert not tracker.record(1, now + timedelta(seconds=30))
+        assert tracker.record(1, now + timedelta(seconds=90))
+        assert tracker.pending == 1
+
+    async def test_flush_single_update(self, db: AsyncSession, test_user: Client):
+        """Pending timestamps are written with one UPDATE."""
+        other = Client(
+            email="other@example.com",
+            username="other_user",
+            password="hashed_password_here",
+        )
+        db.add(other)
+        await db.commit()
+        updated_at = test_user.updated_at
+
+        @asynccontextmanager
+        async def session_factory():
+            yield db
+
+        seen_at = datetime(2030, 1, 1, tzinfo=timezone.utc)
+        tracker = LastSeenTracker()
+        tracker.record(test_user.id, seen_at)
+        tracker.record(other.id, seen_at + timedelta(minutes=1))
+
+        with QueryCounter(db.bind) as counter:
+            assert await tracker.flush(session_factory) == 2
+        assert [s.split()[0] for s in counter.statements] == ["UPDATE"]
+        assert tracker.pending == 0
+
+        db.expunge_all()
+        result = await db.execute(select(BaseUser).order_by(BaseUser.id))
+        users = result.scalars().all()
+        assert [u.last_seen.replace(tzinfo=timezone.utc) for u in users] == [
+            seen_at,
+            seen_at + timedelta(minutes=1),
+        ]
+        assert users[0].updated_at == updated_at
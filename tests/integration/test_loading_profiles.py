@@ -0,0 +1,77 @@
+"""Integration tests for relationship loading profiles."""
+
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models.loading import QueryCounter, load_profile, strict_loading
+from app.models.property import Property, PropertyImage
+
+
+async def _add_images(db: AsyncSession, property_obj: Property) -> None:
+    db.add_all(
+        [
+            PropertyImage(
+                property_id=property_obj.id,
+                image_url=f"https://example/img/{i}.jpg",
+                is_primary=i == 0,
+            )
+            for i in range(3)
+        ]
+    )
+    await db.commit()
+
+
+@pytest.mark.asyncio
+class TestLoadingProfiles:
+    """Test named loading profiles and strict mode."""
+
+    async def test_unknown_profile(self):
+        """Unknown profile names are rejected."""
+        with pytest.raises(ValueError):
+            load_profile("everything")
+
+    async def test_unloaded_relationship_raises(
+        self, db: AsyncSession, test_property: Property
+    ):
+        """Relationships are never lazy loaded implicitly."""
+        result = await db.execute(
+            select(Property)
+            .where(Property.id == test_property.id)
+            .execution_options(populate_existing=True)
+        )
+        property_obj = result.scalar_one()
+        with pytest.raises(InvalidRequestError):
+            property_obj.images
+
+    async def test_feed_card_bounded_selects(
+        self, db: AsyncSession, test_property: Property
+    ):
+        """The feed-card profile loads images in one extra SELECT."""
+        await _add_images(db, test_property)
+        with QueryCounter(db.bind) as counter:
+            result = await db.execute(
+                select(Property)
+                .options(*load_profile("feed-card"))
+                .execution_options(populate_existing=True)
+            )
+            properties = result.scalars().all()
+            urls = [img.image_url for p in properties for img in p.images]
+        assert len(urls) == 3
+        assert counter.selects == 2
+
+    async def test_strict_loading_blocks_identity_map(
+        self, db: AsyncSession, test_property: Property
+    ):
+        """Strict mode rejects many-to-one access even without SQL."""
+        await _add_images(db, test_property)
+        query = select(PropertyImage).where(PropertyImage.is_primary.is_(False))
+        image = (await db.execute(query)).scalars().first()
+        assert image.property is test_property
+
+        with strict_loading():
+            query = select(PropertyImage).where(PropertyImage.is_primary.is_(True))
+            image = (await db.execute(query)).scalars().first()
+            with pytest.raises(InvalidRequestError):
+                image.property
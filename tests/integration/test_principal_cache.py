@@ -0,0 +1,83 @@
+"""Integration tests for the auth principal cache."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models.loading import QueryCounter
+from app.models.user import Client
+from app.services.principal_cache import PrincipalCache
+from app.utils.cache_keys import principal_key
+from app.utils.enums import AccountTypeEnum, KycStatusEnum
+from app.utils.local_cache import get_local_cache
+
+
+@pytest.mark.asyncio
+class TestPrincipalCache:
+    """Test principal caching for the auth dependency chain."""
+
+    async def test_hit_needs_no_queries(self, db: AsyncSession, test_user: Client):
+        """A cached principal is attached without touching the database."""
+        cache = PrincipalCache()
+        await cache.set(str(test_user.id), AccountTypeEnum.client, test_user)
+        db.expunge_all()
+
+        with QueryCounter(db.bind) as counter:
+            user = await cache.get(str(test_user.id), AccountTypeEnum.client, db)
+            assert user.username == test_user.username
+            assert user.account_type is AccountTypeEnum.client
+            assert user.kyc_status is KycStatusEnum.pending
+            assert user.created_at == test_user.created_at
+        assert counter.count == 0
+        assert user in db
+
+    async def test_cached_principal_is_writable(
+        self, db: AsyncSession, test_user: Client
+    ):
+        """Routes can modify and commit the cached instance."""
+        cache = PrincipalCache()
+        await cache.set(str(test_user.id), AccountTypeEnum.client, test_user)
+        db.expunge_all()
+
+        user = await cache.get(str(test_user.id), AccountTypeEnum.client, db)
+        user.fullname = "Renamed User"
+        await db.commit()
+        db.expunge_all()
+
+        result = await db.execute(select(Client).where(Client.id == test_user.id))
+        assert result.scalar_one().fullname == "Renamed User"
+
+    async def test_invalidate(self, db: AsyncSession, test_user: Client):
+        """Invalidated principals fall back to the database."""
+        cache = PrincipalCache()
+        await cache.set(str(test_user.id), AccountTypeEnum.client, test_user)
+        await cache.invalidate(test_user.id, AccountTypeEnum.client)
+        assert await cache.get(str(test_user.id), AccountTypeEnum.client, db) is None
+
+    async def test_invalidate_reaches_other_workers(
+        self, db: AsyncSession, test_user: Client
+    ):
+        """Invalidation is published, and a peer's message drops the L1 entry."""
+        cache = PrincipalCache()
+        await cache.set(str(test_user.id), AccountTypeEnum.client, test_user)
+        key = principal_key(test_user.id, AccountTypeEnum.client.value)
+
+        with patch(
+            "app.services.principal_cache.publish_invalidation", AsyncMock()
+        ) as publish:
+            await cache.invalidate(test_user.id, AccountTypeEnum.client)
+        assert publish.await_args.kwargs["keys"] == [("principal", key)]
+
+        # As applied by the invalidation listener on every worker
+        get_local_cache().invalidate(keys=[("principal", key)])
+        assert await cache.get(str(test_user.id), AccountTypeEnum.client, db) is None
+
+    async def test_non_id_subject_not_cached(
+        self, db: AsyncSession, test_user: Client
+    ):
+        """Only ID subjects are cached, so invalidation by ID is complete."""
+        cache = PrincipalCache()
+        await cache.set(test_user.email, AccountTypeEnum.client, test_user)
+        assert await cache.get(test_user.email, AccountTypeEnum.client, db) is None
@@ -0,0 +1,68 @@
+"""Integration tests for the read-through property detail cache."""
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.property import Property, PropertyImage
+from app.services.listing import detail_version, get_property_by_id
+from app.utils import cache as cache_utils
+from app.utils.cache import read_through, should_refresh_early
+from core.database import get_cache_redis
+
+
+@pytest.mark.asyncio
+class TestPropertyDetailCache:
+    """Test detail serialization, single-flight and early refresh."""
+
+    async def test_full_detail_serialized(
+        self, db: AsyncSession, test_property: Property
+    ):
+        """The cached detail is a complete PropertyShow, images included."""
+        db.add(
+            PropertyImage(
+                property_id=test_property.id, image_url="cover.jpg", is_primary=True
+            )
+        )
+        await db.commit()
+
+        detail = await get_property_by_id(
+            test_property.id, db, async_sessionmaker(db.bind, expire_on_commit=False)
+        )
+        assert detail.id == test_property.id
+        assert detail.status == test_property.status
+        assert [image.image_url for image in detail.images] == ["cover.jpg"]
+        assert detail_version(test_property) is not None
+
+    async def test_single_flight(self):
+        """Concurrent misses on one key share a single rebuild."""
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return {"id": 1}, 1
+
+        redis_client = await get_cache_redis()
+        results = await asyncio.gather(
+            *(
+                read_through(
+                    redis_client, "test:single-flight", loader, timedelta(minutes=1)
+                )
+                for _ in range(5)
+            )
+        )
+        assert results == [{"id": 1}] * 5
+        assert calls == 1
+        assert not cache_utils._inflight
+
+    async def test_early_refresh_probability(self, monkeypatch):
+        """Early refresh never fires far from expiry and always fires past it."""
+        monkeypatch.setattr(cache_utils.random, "random", lambda: 0.5)
+        assert not should_refresh_early(delta=0.1, expiry=1000.0, now=900.0)
+        assert should_refresh_early(delta=0.1, expiry=1000.0, now=1000.0)
+        # An expensive rebuild is started earlier than a cheap one
+        assert should_refresh_early(delta=200.0, expiry=1000.0, now=900.0)
@@ -0,0 +1,148 @@
+"""Integration tests for the keyset-paginated property feed."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.loading import QueryCounter
+from app.models.property import Property, PropertyImage
+from app.schemas.property_schema import FilterParams
+from app.services.listing import filtered_property, property_cards
+from app.utils.enums import FeedSortEnum, ListingTypeEnum, PropertyStatEnum
+
+
+@pytest.fixture
+async def listings(db: AsyncSession, test_user) -> list[Property]:
+    """25 listings with distinct creation times and repeating prices."""
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    properties = [
+        Property(
+            title=f"Listing number {i}",
+            description="A wonderful place to live with modern amenities",
+            price=1000 * (i % 5 + 1),
+            location="Lekki, Lagos" if i % 2 else "Wuse, Abuja",
+            bedroom=i % 4 + 1,
+            bathroom=1,
+            property_type="apartment",
+            listing_type=ListingTypeEnum.rent if i % 3 else ListingTypeEnum.sale,
+            status=PropertyStatEnum.available,
+            agent_id=test_user.id,
+            created_at=start + timedelta(hours=i),
+        )
+        for i in range(25)
+    ]
+    db.add_all(properties)
+    await db.commit()
+    return properties
+
+
+async def _walk(db: AsyncSession, **filters) -> list[list]:
+    pages, cursor = [], None
+    while True:
+        feed = await filtered_property(
+            FilterParams(limit=10, cursor=cursor, **filters), db
+        )
+        pages.append(feed.data)
+        cursor = feed.next_coursor
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.asyncio
+class TestPropertyFeed:
+    """Test feed ordering, filtering and keyset cursors."""
+
+    async def test_newest_pages(self, db: AsyncSession, listings):
+        """Pages cover every listing once, newest first."""
+        pages = await _walk(db)
+        assert [len(page) for page in pages] == [10, 10, 5]
+        ids = [p.id for page in pages for p in page]
+        expected = [p.id for p in sorted(listings, key=lambda p: p.created_at)]
+        assert ids == expected[::-1]
+
+    async def test_price_ties_broken_by_id(self, db: AsyncSession, listings):
+        """Equal prices do not drop or repeat rows across pages."""
+        pages = await _walk(db, sort=FeedSortEnum.price_asc)
+        rows = [(p.price, p.id) for page in pages for p in page]
+        assert rows == sorted((p.price, p.id) for p in listings)
+
+    async def test_filters(self, db: AsyncSession, listings):
+        """Filters are applied server-side."""
+        pages = await _walk(
+            db,
+            listing_type=ListingTypeEnum.rent,
+            min_price=2000,
+            max_price=4000,
+            location="lagos",
+        )
+        rows = [p for page in pages for p in page]
+        assert rows
+        assert all(
+            p.listing_type == ListingTypeEnum.rent
+            and 2000 <= p.price <= 4000
+            and "Lagos" in p.location
+            for p in rows
+        )
+
+    async def test_location_wildcards_are_literal(self, db: AsyncSession, listings):
+        """``%`` and ``_`` in the location filter match only themselves."""
+        for location in ("%", "_agos", "L%s"):
+            pages = await _walk(db, location=location)
+            assert pages == [[]]
+
+    async def test_deep_page_is_keyset(self, db: AsyncSession, listings):
+        """Later pages seek by cursor instead of using OFFSET."""
+        first = await filtered_property(FilterParams(limit=10), db)
+        with QueryCounter(db.bind) as counter:
+            await filtered_property(
+                FilterParams(limit=10, cursor=first.next_coursor), db
+            )
+        feed_sql = counter.statements[0].lower()
+        assert "(property.created_at, property.id) < (" in feed_sql
+        # keyset page of ids, then the uncached entries and their images
+        assert counter.selects == 3
+
+    async def test_cached_entries_reused(self, db: AsyncSession, listings):
+        """Rebuilding a page only selects ids when its entries are cached."""
+        first = await filtered_property(FilterParams(limit=10), db)
+        with QueryCounter(db.bind) as counter:
+            again = await filtered_property(FilterParams(limit=10), db)
+        assert counter.selects == 1
+        assert [p.id for p in again.data] == [p.id for p in first.data]
+
+    async def test_invalid_cursor(self, db: AsyncSession):
+        """Malformed or mismatched cursors are rejected."""
+        with pytest.raises(HTTPException) as exc:
+            await filtered_property(FilterParams(limit=10, cursor="garbage"), db)
+        assert exc.value.status_code == 400
+
+    async def test_card_view_single_select(self, db: AsyncSession, listings):
+        """Cards carry the primary image and agent name from one SELECT."""
+        newest = listings[-1]
+        db.add_all(
+            [
+                PropertyImage(
+                    property_id=newest.id, image_url="extra.jpg", is_primary=False
+                ),
+                PropertyImage(
+                    property_id=newest.id, image_url="cover.jpg", is_primary=True
+                ),
+            ]
+        )
+        await db.commit()
+
+        with QueryCounter(db.bind) as counter:
+            feed = await property_cards(FilterParams(limit=10), db)
+        assert counter.selects == 1
+        assert feed.data[0].id == newest.id
+        assert feed.data[0].primary_image_url == "cover.jpg"
+        assert feed.data[1].primary_image_url is None
+        assert {card.agent_name for card in feed.data} == {"Test User"}
+
+        second = await property_cards(
+            FilterParams(limit=10, cursor=feed.next_coursor), db
+        )
+        full = await _walk(db)
+        assert [c.id for c in second.data] == [p.id for p in full[1]]
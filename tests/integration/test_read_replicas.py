@@ -0,0 +1,83 @@
+"""Integration tests for read replica routing."""
+
+import pytest
+from sqlalchemy import column, insert, table, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from core.database import (
+    ReplicaRouter,
+    RoutingSession,
+    has_recent_write,
+    mark_recent_write,
+)
+
+
+async def _make_engine(path, name: str):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path / name}.db")
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE node (name TEXT)"))
+        await conn.execute(text(f"INSERT INTO node VALUES ('{name}')"))
+    return engine
+
+
+@pytest.fixture
+async def router(tmp_path):
+    primary = await _make_engine(tmp_path, "primary")
+    replicas = [
+        await _make_engine(tmp_path, "replica1"),
+        await _make_engine(tmp_path, "replica2"),
+    ]
+    yield ReplicaRouter(primary, replicas, retry_interval=60)
+    for engine in [primary, *replicas]:
+        await engine.dispose()
+
+
+async def _read_node(session) -> list[str]:
+    result = await session.execute(text("SELECT name FROM node ORDER BY name"))
+    return list(result.scalars())
+
+
+@pytest.mark.asyncio
+class TestReplicaRouting:
+    """Test replica selection and primary fallback."""
+
+    async def test_round_robin(self, router: ReplicaRouter):
+        """Each read session is pinned to the next healthy replica."""
+        factory = async_sessionmaker(sync_session_class=RoutingSession, router=router)
+        seen = []
+        for _ in range(3):
+            async with factory() as session:
+                session.sync_session.use_replica = True
+                seen.append((await _read_node(session))[0])
+        assert seen == ["replica1", "replica2", "replica1"]
+
+    async def test_writes_go_to_primary(self, router: ReplicaRouter):
+        """DML is always sent to the primary."""
+        factory = async_sessionmaker(sync_session_class=RoutingSession, router=router)
+        node = table("node", column("name"))
+        async with factory() as session:
+            session.sync_session.use_replica = True
+            await session.execute(insert(node).values(name="written"))
+            await session.commit()
+
+        async with router.primary.connect() as conn:
+            result = await conn.execute(text("SELECT count(*) FROM node"))
+            assert result.scalar() == 2
+
+    async def test_unhealthy_replica_skipped(self, router: ReplicaRouter):
+        """Replicas marked down are skipped; with none left reads hit the primary."""
+        factory = async_sessionmaker(sync_session_class=RoutingSession, router=router)
+        router.mark_down(router.replicas[0].sync_engine)
+        async with factory() as session:
+            session.sync_session.use_replica = True
+            assert await _read_node(session) == ["replica2"]
+
+        router.mark_down(router.replicas[1].sync_engine)
+        async with factory() as session:
+            session.sync_session.use_replica = True
+            assert await _read_node(session) == ["primary"]
+
+    async def test_read_your_writes(self):
+        """A principal's own writes pin their reads to the primary."""
+        await mark_recent_write(987654)
+        assert await has_recent_write(987654)
@@ -0,0 +1,144 @@
+"""Benchmark cache codecs on feed and chat-history payloads.
+
+Reports payload size (and Redis ``MEMORY USAGE`` when a server is reachable)
+plus encode/decode CPU per hit for every available serializer/compression
+pair.
+
+Usage:
+    python -m tests.load.bench_cache_codec [--redis redis://localhost:6379/15]
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.utils.codec import COMPRESSORS, SERIALIZERS, Codec
+
+ROUNDS = 2_000
+
+
+def feed_payload(size: int = 20) -> dict:
+    """A serialized ``PropertyFeed`` page."""
+    created = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return {
+        "data": [
+            {
+                "id": i,
+                "title": f"Spacious {i % 4 + 1} bedroom apartment",
+                "description": "A wonderful place to live with modern amenities "
+                "and great access to shops, schools and transport.",
+                "location": "Lekki Phase 1, Lagos",
+                "price": 2_500_000.0 + i * 1000,
+                "property_type": "apartment",
+                "listing_type": "rent",
+                "status": "available",
+                "bedroom": i % 4 + 1,
+                "bathroom": 2,
+                "furnished": bool(i % 2),
+                "is_active": True,
+                "agent_id": i % 7 + 1,
+                "created_at": (created + timedelta(hours=i)).isoformat(),
+                "images": [
+                    {
+                        "image_url": f"https://res.cloudinary.com/demo/{i}-{n}.jpg",
+                        "is_primary": n == 0,
+                    }
+                    for n in range(4)
+                ],
+            }
+            for i in range(size)
+        ],
+        "next_coursor": "WyJuZXdlc3QiLCAiMjAyNi0wMS0wMlQwMDowMDowMCIsIDIwXQ",
+    }
+
+
+def chat_payload(size: int = 50) -> dict:
+    """A serialized chat history page."""
+    sent = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return {
+        "messages": [
+            {
+                "id": i,
+                "sender_id": 1 + i % 2,
+                "receiver_id": 2 - i % 2,
+                "message": "Is the apartment still available for viewing this week?",
+                "property_id": 42,
+                "is_read": i < size - 3,
+                "timestamp": (sent + timedelta(minutes=i)).isoformat(),
+            }
+            for i in range(size)
+        ]
+    }
+
+
+def _per_call_us(func, arg) -> float:
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        func(arg)
+    return (time.perf_counter() - started) / ROUNDS * 1e6
+
+
+async def _redis_memory(redis_url: str, payloads: dict) -> dict:
+    import redis.asyncio as redis
+
+    client = redis.from_url(redis_url)
+    usage = {}
+    try:
+        for name, payload in payloads.items():
+            key = f"bench:codec:{name}"
+            await client.set(key, payload)
+            usage[name] = await client.memory_usage(key)
+            await client.delete(key)
+    except Exception as e:
+        print(f"Redis memory usage unavailable: {e}")
+    finally:
+        await client.close()
+    return usage
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--redis", help="Redis URL for MEMORY USAGE (optional)")
+    args = parser.parse_args()
+
+    samples = {"feed": feed_payload(), "chat": chat_payload()}
+    codecs = {
+        f"{serializer}+{compression}": Codec(serializer, compression, threshold=0)
+        for serializer, spec in SERIALIZERS.items()
+        if spec[3]
+        for compression, compressor in COMPRESSORS.items()
+        if compressor[3]
+    }
+
+    rows, encoded = [], {}
+    for sample, value in samples.items():
+        for name, codec in codecs.items():
+            payload = codec.encode(value)
+            encoded[f"{sample}:{name}"] = payload
+            rows.append(
+                (
+                    sample,
+                    name,
+                    len(payload),
+                    _per_call_us(codec.encode, value),
+                    _per_call_us(codec.decode, payload),
+                )
+            )
+
+    memory = asyncio.run(_redis_memory(args.redis, encoded)) if args.redis else {}
+
+    print(
+        f"{'payload':8} {'codec':16} {'bytes':>8} {'redis':>8} "
+        f"{'encode µs':>10} {'decode µs':>10}"
+    )
+    for sample, name, size, encode_us, decode_us in rows:
+        redis_bytes = memory.get(f"{sample}:{name}", "-")
+        print(
+            f"{sample:8} {name:16} {size:>8} {redis_bytes!s:>8} "
+            f"{encode_us:>10.1f} {decode_us:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,13 @@
 Tests for the WebSocket service at /ws/{user_id}
 """
 
+import asyncio
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from fastapi import WebSocket, status
-from app.routers.websocket import (
-    WebSocketConnectionManager,
-    ws_manager,
-)
+from app.routers.websocket import ws_manager
+from app.services.websocket_manager import ConnectionManager
 
 
 class TestIsJwtLike:
@@ -43,95 +43,174 @@ class TestIsJwtLike:
         assert is_jwt_like("has!special.chars.here") is False
 
 
-class TestWebSocketConnectionManager:
-    """Tests for the WebSocketConnectionManager class."""
+async def drain():
+    """Let connection writer tasks run."""
+    for _ in range(3):
+        await asyncio.sleep(0)
 
-    def setup_method(self):
-        """Reset the connection manager before each test."""
-        self.manager = WebSocketConnectionManager()
 
-    def test_connect_stores_connection(self):
-        """Test that connect properly stores the WebSocket connection."""
-        mock_websocket = AsyncMock(spec=WebSocket)
-        user_id = 1
+async def stall(*_):
+    """A send that never completes."""
+    await asyncio.Event().wait()
 
-        result = self.manager.connect(mock_websocket, user_id)
 
-        assert result is True
-        assert user_id in self.manager.active_connections
-        assert self.manager.active_connections[user_id] == mock_websocket
+@pytest.mark.asyncio
+class TestConnectionManager:
+    """Tests for the multi-device ConnectionManager registry."""
 
-    def test_disconnect_removes_connection(self):
-        """Test that disconnect removes the user's connection."""
+    def setup_method(self):
+        """Reset the connection manager before each test."""
+        self.manager = ConnectionManager(queue_size=2, slow_consumer_policy="drop")
+
+    async def test_connect_stores_connection(self):
+        """Test that connect registers the socket under its user."""
         mock_websocket = AsyncMock(spec=WebSocket)
-        user_id = 1
-        self.manager.active_connections[user_id] = mock_websocket
 
-        self.manager.disconnect(user_id)
+        connection = await self.manager.connect(mock_websocket, 1, accept=False)
 
-        assert user_id not in self.manager.active_connections
+        assert self.manager.active_connections[1] == {mock_websocket}
+        assert self.manager.connections[mock_websocket] is connection
+        mock_websocket.accept.assert_not_called()
 
-    def test_disconnect_nonexistent_user_no_error(self):
-        """Test that disconnecting a non-existent user doesn't raise an error."""
-        # Should not raise an exception
-        self.manager.disconnect(999)
+    async def test_second_device_keeps_first(self):
+        """A second socket for the same user does not evict the first."""
+        phone, laptop = AsyncMock(spec=WebSocket), AsyncMock(spec=WebSocket)
+        await self.manager.connect(phone, 1, accept=False)
+        await self.manager.connect(laptop, 1, accept=False)
 
-    def test_is_connected_returns_true_when_connected(self):
-        """Test is_connected returns True for connected users."""
-        mock_websocket = AsyncMock(spec=WebSocket)
-        user_id = 1
-        self.manager.active_connections[user_id] = mock_websocket
+        assert self.manager.get_user_connection_count(1) == 2
+        assert await self.manager.send_personal_message({"m": 1}, 1) is True
+        await drain()
+        phone.send_json.assert_called_once_with({"m": 1})
+        laptop.send_json.assert_called_once_with({"m": 1})
+
+        await self.manager.disconnect(phone)
+        assert self.manager.is_connected(1) is True
+        await self.manager.disconnect(laptop)
+        assert self.manager.is_connected(1) is False
 
-        assert self.manager.is_connected(user_id) is True
+    async def test_disconnect_unknown_socket_no_error(self):
+        """Test that disconnecting an untracked socket doesn't raise an error."""
+        await self.manager.disconnect(AsyncMock(spec=WebSocket))
 
-    def test_is_connected_returns_false_when_not_connected(self):
+    async def test_is_connected_returns_false_when_not_connected(self):
         """Test is_connected returns False for disconnected users."""
         assert self.manager.is_connected(999) is False
 
-    @pytest.mark.asyncio
-    async def test_send_personal_message_to_connected_user(self):
-        """Test sending a message to a connected user."""
-        mock_websocket = AsyncMock(spec=WebSocket)
-        user_id = 1
-        self.manager.active_connections[user_id] = mock_websocket
-        message = {"type": "test", "content": "Hello"}
-
-        result = await self.manager.send_personal_message(message, user_id)
-
-        assert result is True
-        mock_websocket.send_json.assert_called_once_with(message)
-
-    @pytest.mark.asyncio
     async def test_send_personal_message_to_disconnected_user(self):
         """Test sending a message to a disconnected user returns False."""
-        message = {"type": "test", "content": "Hello"}
-
-        result = await self.manager.send_personal_message(message, 999)
+        assert await self.manager.send_personal_message({"m": 1}, 999) is False
 
-        assert result is False
-
-    @pytest.mark.asyncio
-    async def test_send_personal_message_cleans_up_broken_connection(self):
-        """Test that broken connections are cleaned up when sending fails."""
+    async def test_broken_connection_cleaned_up(self):
+        """A failed write removes the connection."""
         mock_websocket = AsyncMock(spec=WebSocket)
         mock_websocket.send_json.side_effect = Exception("Connection broken")
-        user_id = 1
-        self.manager.active_connections[user_id] = mock_websocket
-
-        result = await self.manager.send_personal_message({"test": "data"}, user_id)
-
-        assert result is False
-        assert user_id not in self.manager.active_connections
-
-    def test_get_connected_users(self):
+        await self.manager.connect(mock_websocket, 1, accept=False)
+
+        await self.manager.send_personal_message({"test": "data"}, 1)
+        await drain()
+
+        assert self.manager.is_connected(1) is False
+
+    async def test_slow_client_does_not_block_others(self):
+        """A stalled socket fills its own queue while others keep receiving."""
+        stalled, healthy = AsyncMock(spec=WebSocket), AsyncMock(spec=WebSocket)
+        stalled.send_json.side_effect = stall
+        await self.manager.connect(stalled, 1, accept=False)
+        await self.manager.connect(healthy, 2, accept=False)
+
+        for n in range(5):
+            await self.manager.broadcast_message({"n": n})
+            await drain()
+
+        assert healthy.send_json.call_count == 5
+        # One message in flight plus a full queue; the rest were dropped
+        assert self.manager.connections[stalled].dropped == 2
+
+    async def test_overflow_disconnects_slow_consumer(self):
+        """With the disconnect policy a full queue closes the socket."""
+        manager = ConnectionManager(queue_size=1, slow_consumer_policy="disconnect")
+        stalled = AsyncMock(spec=WebSocket)
+        stalled.send_json.side_effect = stall
+        await manager.connect(stalled, 1, accept=False)
+
+        for n in range(3):
+            await manager.send_personal_message({"n": n}, 1)
+            await drain()
+
+        assert manager.is_connected(1) is False
+        stalled.close.assert_called_once_with(code=status.WS_1013_TRY_AGAIN_LATER)
+
+    async def test_operations_capped_per_socket(self):
+        """Database work per socket is capped; further starts wait for a slot."""
+        connection = await self.manager.connect(
+            AsyncMock(spec=WebSocket), 1, accept=False
+        )
+        release = asyncio.Event()
+        running = 0
+
+        async def operation():
+            nonlocal running
+            running += 1
+            await release.wait()
+
+        with patch.object(connection, "db_slots", asyncio.Semaphore(2)):
+            await connection.start_operation(operation())
+            await connection.start_operation(operation())
+            blocked = asyncio.create_task(connection.start_operation(operation()))
+            await drain()
+            assert running == 2
+            assert blocked.done() is False
+
+            release.set()
+            await blocked
+            await connection.wait_operations()
+        assert running == 3
+
+    async def test_topic_subscriptions(self):
+        """Topic messages go only to subscribed sockets; disconnect unsubscribes."""
+        self.manager.topic_authorizer = AsyncMock(return_value=True)
+        follower, bystander = AsyncMock(spec=WebSocket), AsyncMock(spec=WebSocket)
+        await self.manager.connect(follower, 1, accept=False)
+        await self.manager.connect(bystander, 2, accept=False)
+
+        assert await self.manager.subscribe(follower, "transaction:bid-7") is True
+        assert await self.manager.subscribe(bystander, "property:abc") is False
+        assert await self.manager.send_topic_message({"n": 1}, "transaction:bid-7")
+        await drain()
+
+        follower.send_json.assert_called_once_with({"n": 1})
+        bystander.send_json.assert_not_called()
+
+        await self.manager.disconnect(follower)
+        assert self.manager.has_subscribers("transaction:bid-7") is False
+
+    async def test_topic_limit_per_socket(self):
+        """A socket cannot follow more than WS_MAX_TOPICS topics."""
+        websocket = AsyncMock(spec=WebSocket)
+        await self.manager.connect(websocket, 1, accept=False)
+        with patch("app.services.websocket_manager.settings.WS_MAX_TOPICS", 2):
+            assert await self.manager.subscribe(websocket, "property:1") is True
+            assert await self.manager.subscribe(websocket, "property:2") is True
+            assert await self.manager.subscribe(websocket, "property:1") is True
+            assert await self.manager.subscribe(websocket, "property:3") is False
+
+    async def test_forbidden_topic_not_subscribed(self):
+        """A topic the authorizer rejects is not added to the index."""
+        self.manager.topic_authorizer = AsyncMock(return_value=False)
+        websocket = AsyncMock(spec=WebSocket)
+        await self.manager.connect(websocket, 1, accept=False)
+
+        assert await self.manager.subscribe(websocket, "transaction:bid-7") is False
+        self.manager.topic_authorizer.assert_awaited_once_with(1, "transaction:bid-7")
+        assert self.manager.has_subscribers("transaction:bid-7") is False
+
+    async def test_get_active_users(self):
         """Test getting list of connected user IDs."""
-        self.manager.active_connections[1] = AsyncMock()
-        self.manager.active_connections[2] = AsyncMock()
-        self.manager.active_connections[3] = AsyncMock()
-
-        connected_users = self.manager.get_connected_users()
+        for user_id in (1, 2, 3):
+            await self.manager.connect(AsyncMock(spec=WebSocket), user_id, accept=False)
 
-        assert sorted(connected_users) == [1, 2, 3]
+        assert sorted(self.manager.get_active_users()) == [1, 2, 3]
 
 
 class TestGetWebSocketUser:
@@ -350,5 +429,74 @@ class TestGlobalConnectionManager:
     def test_ws_manager_is_initialized(self):
         """Test that the global ws_manager is properly initialized."""
         assert ws_manager is not None
-        assert isinstance(ws_manager, WebSocketConnectionManager)
+        assert isinstance(ws_manager, ConnectionManager)
         assert isinstance(ws_manager.active_connections, dict)
+
+
+class TestParseChatMessage:
+    """Tests for validating inbound chat frames before they are queued."""
+
+    def test_coerces_numeric_strings(self):
+        """IDs sent as strings are coerced to int."""
+        from app.routers.websocket import parse_chat_message
+
+        chat = parse_chat_message(1, {"receiver_id": "5", "message": "hi"})
+        assert chat.receiver_id == 5
+        assert chat.property_id is None
+        chat = parse_chat_message(
+            1, {"receiver_id": 5, "message": "hi", "property_id": "9"}
+        )
+        assert chat.property_id == 9
+
+    def test_rejects_malformed_fields(self):
+        """Frames that would fail the INSERT never reach the batch."""
+        from app.routers.websocket import parse_chat_message
+
+        assert parse_chat_message(1, {"receiver_id": "bob", "message": "hi"}) is None
+        assert parse_chat_message(1, {"receiver_id": 5, "message": ["hi"]}) is None
+        assert (
+            parse_chat_message(
+                1, {"receiver_id": 5, "message": "hi", "property_id": {"id": 2}}
+            )
+            is None
+        )
+
+
+@pytest.mark.asyncio
+class TestAuthorizeTopic:
+    """Tests for who may follow a notification topic."""
+
+    async def test_agent_topic_only_for_that_agent(self):
+        """Agent topics are private to the agent; property topics are public."""
+        from app.services.websocket_manager import authorize_topic
+
+        assert await authorize_topic(4, "agent:4") is True
+        assert await authorize_topic(5, "agent:4") is False
+        assert await authorize_topic(5, "property:4") is True
+
+    async def test_transaction_topic_only_for_parties(self, db, test_user):
+        """Only the bid's buyer or seller may follow its transaction topic."""
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        from app.models.transaction import TransactionRecord, WalletMapping
+        from app.services.websocket_manager import authorize_topic
+        from app.utils.enums import TransactionStatusEnum
+
+        db.add_all(
+            [
+                WalletMapping(user_id=test_user.id, wallet_id="0xbuyer"),
+                TransactionRecord(
+                    bid_id="bid-7",
+                    property_id="1",
+                    status=TransactionStatusEnum.pending,
+                    buyer_wallet_id="0xbuyer",
+                    seller_wallet_id="0xseller",
+                ),
+            ]
+        )
+        await db.commit()
+        sessions = async_sessionmaker(db.bind, expire_on_commit=False)
+
+        assert await authorize_topic(test_user.id, "transaction:bid-7", sessions)
+        assert not await authorize_topic(test_user.id + 1, "transaction:bid-7", sessions)
+        assert not await authorize_topic(test_user.id, "transaction:bid-8", sessions)
@@ -0,0 +1,146 @@
+"""Unit tests for multi-key cache reads, writes and deletes."""
+
+from datetime import timedelta
+
+import pytest
+
+from app.services.cache import CacheService
+from app.utils.cache import delete_many_cached, get_many_cached, set_many_cached
+from app.utils.cache_keys import property_detail_key
+from app.utils.local_cache import MISSING, get_local_cache
+
+
+class Store:
+    """In-memory stand-in for the Redis commands the multi-key helpers use."""
+
+    def __init__(self):
+        self.values = {}
+        self.ttls = {}
+        self.calls = []
+
+    async def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
+    async def delete(self, *keys):
+        self.calls.append(("delete", keys))
+        return sum(self.values.pop(key, None) is not None for key in keys)
+
+    async def publish(self, channel, data):
+        self.calls.append(("publish", channel))
+        return 0
+
+    def setex(self, key, seconds, value):
+        self.values[key] = value
+        self.ttls[key] = seconds
+
+    def pipeline(self, transaction=True):
+        return Pipeline(self)
+
+
+class Pipeline:
+    """Runs queued SETEX calls on execute()."""
+
+    def __init__(self, store):
+        self.store = store
+        self.calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        return False
+
+    def setex(self, *args):
+        self.calls.append(args)
+
+    async def execute(self):
+        for args in self.calls:
+            self.store.setex(*args)
+        return [True] * len(self.calls)
+
+
+@pytest.mark.asyncio
+class TestManyHelpers:
+    """Test the pipelined Redis helpers."""
+
+    async def test_per_key_ttl_and_partial_miss(self):
+        """Each key gets its own TTL; misses are left out of the result."""
+        store = Store()
+        ttl = {"a": timedelta(seconds=30), "b": timedelta(minutes=10)}
+        assert await set_many_cached(store, {"a": 1, "b": [2]}, ttl) is True
+
+        assert store.ttls == {"a": 30, "b": 600}
+        assert await get_many_cached(store, ["a", "b", "c"]) == {"a": 1, "b": [2]}
+
+    async def test_missing_ttl_raises(self):
+        """A per-key TTL mapping must cover every key; nothing is written."""
+        store = Store()
+        with pytest.raises(ValueError):
+            await set_many_cached(
+                store, {"a": 1, "b": 2}, {"a": timedelta(seconds=30)}
+            )
+        assert store.values == {}
+
+    async def test_single_ttl_applies_to_all(self):
+        """One TTL covers every key."""
+        store = Store()
+        await set_many_cached(store, {"a": 1, "b": 2}, timedelta(seconds=45))
+        assert store.ttls == {"a": 45, "b": 45}
+
+    async def test_delete_many_counts_existing(self):
+        """Only keys that existed are counted."""
+        store = Store()
+        await set_many_cached(store, {"a": 1}, timedelta(seconds=30))
+        assert await delete_many_cached(store, ["a", "b"]) == 1
+        assert await delete_many_cached(store, []) == 0
+
+
+@pytest.mark.asyncio
+class TestCacheServiceMany:
+    """Test the L1-backed multi-key service methods."""
+
+    async def test_get_many_mixes_l1_redis_and_misses(self):
+        """L1 hits skip Redis, Redis hits fill L1, misses are counted."""
+        store = Store()
+        cache = CacheService(store)
+        local = get_local_cache()
+        before = local.stats().get("property_card", {"l2_hits": 0, "misses": 0})
+        await set_many_cached(store, {"b": 2}, timedelta(seconds=30))
+        local.set("property_card", "a", 1)
+
+        found = await cache.get_many("property_card", ["a", "b", "c"])
+
+        assert found == {"a": 1, "b": 2}
+        assert local.get("property_card", "b") == 2
+        after = local.stats()["property_card"]
+        assert after["l2_hits"] - before["l2_hits"] == 1
+        assert after["misses"] - before["misses"] == 1
+
+    async def test_set_many_per_key_ttl(self):
+        """The service passes per-key TTLs through to Redis."""
+        store = Store()
+        cache = CacheService(store)
+        ttl = {"a": timedelta(seconds=30), "b": timedelta(seconds=90)}
+        assert await cache.set_many("property_card", {"a": 1, "b": 2}, ttl)
+        assert store.ttls == {"a": 30, "b": 90}
+
+    async def test_delete_many_invalidates_after_delete(self):
+        """Redis is cleared before peers are told to drop their L1 copies."""
+        store = Store()
+        cache = CacheService(store)
+        await cache.set_many("property_card", {"a": 1}, timedelta(seconds=30))
+
+        assert await cache.delete_many("property_card", ["a"]) == 1
+        assert [call[0] for call in store.calls] == ["delete", "publish"]
+        assert get_local_cache().get("property_card", "a") is MISSING
+
+    async def test_delete_invalidates_after_delete(self):
+        """A single-key delete also clears Redis before publishing."""
+        store = Store()
+        cache = CacheService(store)
+        key = property_detail_key(1)
+        get_local_cache().set("property_detail", key, {"id": 1})
+
+        assert await cache.invalidate_property_detail(1) is True
+        assert [call[0] for call in store.calls] == ["delete", "publish"]
+        assert get_local_cache().get("property_detail", key) is MISSING
@@ -0,0 +1,41 @@
+"""Unit tests for generation-tag cache invalidation."""
+
+import pytest
+
+from app.services.cache import CacheService
+from app.utils.cache_keys import (
+    PROPERTY_FEED_TAG,
+    SEARCH_TAG,
+    agent_tag,
+    generation_key,
+    invalidate_listing_cache,
+    invalidate_property_cache,
+    property_feed_key,
+    tagged_key,
+)
+from core.database import get_cache_redis
+
+
+@pytest.mark.asyncio
+class TestCacheTags:
+    """Test tag mapping and generation-scoped keys."""
+
+    async def test_invalidation_maps_to_tags(self):
+        """Invalidation helpers name tags, not key patterns."""
+        assert invalidate_property_cache(7) == [PROPERTY_FEED_TAG, SEARCH_TAG]
+        assert invalidate_listing_cache(3) == [agent_tag(3), PROPERTY_FEED_TAG]
+        for tag in invalidate_property_cache(7) + invalidate_listing_cache(3):
+            assert "*" not in tag
+
+    async def test_generation_scoped_keys(self):
+        """Bumping a generation moves every key in the namespace."""
+        key = property_feed_key(1, "abc")
+        assert tagged_key(key, 4) == "property:feed:p1:abc:g4"
+        assert tagged_key(key, 4) != tagged_key(key, 5)
+        assert generation_key(PROPERTY_FEED_TAG) == "gen:property:feed"
+
+    async def test_unavailable_generation_skips_cache(self):
+        """Without a readable generation, tagged reads and writes are skipped."""
+        cache = CacheService(await get_cache_redis())
+        assert await cache._tagged(property_feed_key(1), PROPERTY_FEED_TAG) is None
+        assert not await cache.set_property_feed(1, "abc", {"data": []})
@@ -0,0 +1,51 @@
+"""Unit tests for the cache payload codec."""
+
+import json
+
+import pytest
+
+from app.utils.codec import MAGIC, Codec, CodecError
+
+FEED = {
+    "data": [
+        {"id": i, "title": f"Listing {i}", "price": 1500.5, "images": []}
+        for i in range(50)
+    ],
+    "next_coursor": "WyJuZXdlc3QiXQ",
+}
+
+
+@pytest.mark.asyncio
+class TestCodec:
+    """Test encoding, compression and the format header."""
+
+    @pytest.mark.parametrize("serializer", ["json", "orjson", "msgpack"])
+    async def test_round_trip(self, serializer: str):
+        """Every serializer round-trips cached payloads."""
+        codec = Codec(serializer=serializer, compression="none")
+        payload = codec.encode(FEED)
+        assert payload[0] == MAGIC
+        assert codec.decode(payload) == FEED
+
+    async def test_compression_threshold(self):
+        """Only payloads above the threshold are compressed."""
+        codec = Codec(serializer="orjson", compression="zlib", threshold=256)
+        small, large = codec.encode({"id": 1}), codec.encode(FEED)
+        assert small[2] == 0
+        assert large[2] != 0
+        assert len(large) < len(Codec("orjson", "none").encode(FEED))
+        assert codec.decode(large) == FEED
+
+    async def test_reads_other_formats(self):
+        """A codec decodes entries written by other codecs and legacy JSON."""
+        reader = Codec(serializer="orjson", compression="none")
+        written = Codec(serializer="msgpack", compression="zlib", threshold=0)
+        assert reader.decode(written.encode(FEED)) == FEED
+        assert reader.decode(json.dumps(FEED)) == FEED
+
+    async def test_corrupt_payload(self):
+        """Corrupt payloads raise CodecError."""
+        with pytest.raises(CodecError):
+            Codec().decode(bytes((MAGIC, 99, 0)) + b"{}")
+        with pytest.raises(CodecError):
+            Codec().decode(b"not json")
@@ -0,0 +1,158 @@
+"""Unit tests for the per-user delivery log and resume on reconnect."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import WebSocket, WebSocketDisconnect
+
+from app.services.delivery_log import DeliveryLog
+from app.services.websocket_manager import ConnectionManager
+from app.services.ws_fanout import WebSocketFanout
+
+
+def _seq(stream_id):
+    milliseconds, sequence = stream_id.split("-")
+    return int(milliseconds), int(sequence)
+
+
+class Streams:
+    """In-memory stand-in for the Redis stream commands the log uses."""
+
+    def __init__(self):
+        self.streams = {}
+        self.next_id = 1
+
+    async def xadd(self, key, fields, maxlen=None, approximate=True):
+        stream = self.streams.setdefault(key, [])
+        stream_id = f"{self.next_id}-0"
+        self.next_id += 1
+        stream.append((stream_id, fields))
+        if maxlen is not None:
+            del stream[:-maxlen]
+        return stream_id
+
+    async def expire(self, key, ttl):
+        return key in self.streams
+
+    async def xrange(self, key, min="-", max="+", count=None):
+        entries = self.streams.get(key, [])
+        if min.startswith("("):
+            entries = [e for e in entries if _seq(e[0]) > _seq(min[1:])]
+        return entries[:count]
+
+    def pipeline(self, transaction=True):
+        return Pipeline(self)
+
+
+class Pipeline:
+    """Queues Streams calls and runs them on execute()."""
+
+    def __init__(self, store):
+        self.store = store
+        self.calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        return False
+
+    def __getattr__(self, name):
+        method = getattr(self.store, name)
+        return lambda *args, **kwargs: self.calls.append(method(*args, **kwargs))
+
+    async def execute(self):
+        return [await call for call in self.calls]
+
+
+async def drain():
+    """Let connection writer tasks run."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def streams():
+    streams = Streams()
+    with patch("core.database.get_redis", AsyncMock(return_value=streams)):
+        yield streams
+
+
+@pytest.mark.asyncio
+class TestDeliveryLog:
+    """Test logging, replay and gap detection."""
+
+    async def test_read_after_returns_later_entries(self, streams):
+        """Entries after the client's seq come back in order with their seq."""
+        log = DeliveryLog(maxlen=10)
+        seqs = [await log.append(1, {"message": n}) for n in range(3)]
+
+        payloads, complete = await log.read_after(1, seqs[0])
+
+        assert complete is True
+        assert payloads == [
+            {"message": 1, "seq": seqs[1]},
+            {"message": 2, "seq": seqs[2]},
+        ]
+
+    async def test_trimmed_log_reports_gap(self, streams):
+        """A seq older than the retained entries is flagged as incomplete."""
+        log = DeliveryLog(maxlen=2)
+        seqs = [await log.append(1, {"message": n}) for n in range(4)]
+
+        payloads, complete = await log.read_after(1, seqs[0])
+
+        assert complete is False
+        assert [p["seq"] for p in payloads] == seqs[2:]
+
+    async def test_unavailable_redis_reports_gap(self):
+        """Without Redis nothing is logged and resume falls back to history."""
+        log = DeliveryLog()
+        with patch("core.database.get_redis", AsyncMock(side_effect=ConnectionError)):
+            assert await log.append(1, {"message": "hi"}) is None
+            assert await log.read_after(1, "1-0") == ([], False)
+
+    async def test_fanout_logs_offline_delivery(self, streams):
+        """A delivery to an offline user is kept for replay."""
+        log = DeliveryLog()
+        fanout = WebSocketFanout(ConnectionManager(), log=log)
+        streams.publish = AsyncMock(return_value=0)
+
+        assert await fanout.deliver(2, {"message": "hi"}) is False
+
+        payloads, _ = await log.read_after(2, "0-0")
+        assert payloads[0]["message"] == "hi"
+
+    async def test_resume_replays_past_queue_size(self, streams):
+        """Replay waits for the socket instead of tripping the overflow policy."""
+        from app.routers import websocket as router
+
+        for n in range(5):
+            await router.delivery_log.append(7, {"message": n})
+        manager = ConnectionManager(queue_size=1, slow_consumer_policy="disconnect")
+        socket = AsyncMock(spec=WebSocket)
+        connection = await manager.connect(socket, 7, accept=False)
+
+        await router.resume(connection, "1-0")
+        await drain()
+
+        sent = [call.args[0] for call in socket.send_json.call_args_list]
+        assert [m["message"] for m in sent[:-1]] == [1, 2, 3, 4]
+        assert sent[-1] == {"type": "resumed", "last_seq": "5-0", "complete": True}
+        assert manager.is_connected(7)
+
+    async def test_resume_stops_when_socket_fails(self, streams):
+        """A replay into a socket whose writer died gives up instead of hanging."""
+        from app.routers import websocket as router
+
+        for n in range(10):
+            await router.delivery_log.append(8, {"message": n})
+        manager = ConnectionManager(queue_size=4)
+        socket = AsyncMock(spec=WebSocket)
+        socket.send_json.side_effect = RuntimeError("socket gone")
+        connection = await manager.connect(socket, 8, accept=False)
+
+        with pytest.raises(WebSocketDisconnect):
+            await asyncio.wait_for(router.resume(connection, "0-0"), timeout=1)
+        assert not manager.is_connected(8)
@@ -0,0 +1,43 @@
+"""Unit tests for off-loop password hashing."""
+
+import pytest
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+from app.utils import hashing
+from app.utils.hashing import (
+    hash_password_async,
+    verify_and_update_async,
+    verify_password_async,
+)
+from core.configs import settings
+
+
+@pytest.mark.asyncio
+class TestPasswordHashing:
+    """Test async password hashing APIs."""
+
+    async def test_hash_and_verify(self):
+        """Hashes made on the pool verify on the pool."""
+        password_hash = await hash_password_async("s3cret")
+        assert await verify_password_async("s3cret", password_hash)
+        assert not await verify_password_async("wrong", password_hash)
+
+    async def test_rehash_on_cost_change(self):
+        """Hashes with an outdated cost are upgraded on verification."""
+        old_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("s3cret")
+        is_valid, new_hash = await verify_and_update_async("s3cret", old_hash)
+        assert is_valid
+        assert new_hash is not None
+        assert f"${settings.PASSWORD_BCRYPT_ROUNDS:02d}$" in new_hash
+
+        is_valid, new_hash = await verify_and_update_async("s3cret", new_hash)
+        assert is_valid and new_hash is None
+
+    async def test_queue_limit(self, monkeypatch):
+        """Jobs beyond the queue limit are rejected instead of queued."""
+        monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_QUEUE", 0)
+        with pytest.raises(HTTPException) as exc:
+            await hash_password_async("s3cret")
+        assert exc.value.status_code == 503
+        assert hashing._in_flight == 0
@@ -0,0 +1,57 @@
+"""Unit tests for the in-process L1 cache."""
+
+from datetime import timedelta
+
+import pytest
+
+from app.utils.local_cache import MISSING, LocalCache
+
+
+@pytest.fixture
+def local_cache() -> LocalCache:
+    return LocalCache(
+        {
+            "hot": (timedelta(minutes=1), 2),
+            "expired": (timedelta(seconds=-1), 10),
+        }
+    )
+
+
+@pytest.mark.asyncio
+class TestLocalCache:
+    """Test LRU/TTL behaviour, tag invalidation and counters."""
+
+    async def test_lru_eviction(self, local_cache: LocalCache):
+        """The least recently used entry is evicted past the size cap."""
+        local_cache.set("hot", "a", 1)
+        local_cache.set("hot", "b", 2)
+        assert local_cache.get("hot", "a") == 1
+        local_cache.set("hot", "c", 3)
+        assert local_cache.get("hot", "b") is MISSING
+        assert local_cache.get("hot", "a") == 1
+        assert local_cache.stats()["hot"]["evictions"] == 1
+
+    async def test_ttl_expiry(self, local_cache: LocalCache):
+        """Expired entries are not served."""
+        local_cache.set("expired", "a", 1)
+        assert local_cache.get("expired", "a") is MISSING
+
+    async def test_unconfigured_namespace_not_stored(self, local_cache: LocalCache):
+        """Namespaces without an L1 config only collect counters."""
+        local_cache.set("redis_only", "a", 1)
+        local_cache.record_miss("redis_only")
+        assert local_cache.get("redis_only", "a") is MISSING
+        assert local_cache.stats()["redis_only"]["misses"] == 1
+
+    async def test_tag_invalidation(self, local_cache: LocalCache):
+        """Dropping a tag removes only the entries stored under it."""
+        local_cache.set("hot", "feed:1", [1], tag="property:feed")
+        local_cache.set("hot", "detail:1", {"id": 1})
+        assert local_cache.invalidate(tags=["property:feed"]) == 1
+        assert local_cache.get("hot", "feed:1") is MISSING
+        assert local_cache.get("hot", "detail:1") == {"id": 1}
+        assert local_cache.invalidate(keys=[("hot", "detail:1")]) == 1
+        stats = local_cache.stats()["hot"]
+        assert stats["invalidations"] == 2
+        assert stats["l1_hits"] == 1
+        assert stats["size"] == 0
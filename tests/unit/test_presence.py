@@ -0,0 +1,147 @@
+"""Unit tests for WebSocket heartbeat, reaping and shared presence."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import WebSocket, status
+
+from app.services.presence import PresenceService
+from app.services.websocket_manager import ConnectionManager
+
+
+class Store:
+    """In-memory stand-in for the Redis commands presence uses."""
+
+    def __init__(self):
+        self.zsets = {}
+        self.hashes = {}
+
+    async def zadd(self, key, mapping, xx=False):
+        zset = self.zsets.setdefault(key, {})
+        for member, score in mapping.items():
+            if not xx or member in zset:
+                zset[member] = score
+
+    async def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+
+    async def zscore(self, key, member):
+        return self.zsets.get(key, {}).get(member)
+
+    async def zremrangebyscore(self, key, low, high):
+        zset = self.zsets.get(key, {})
+        for member in [m for m, score in zset.items() if score <= high]:
+            del zset[member]
+
+    async def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = str(value)
+
+    async def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    def pipeline(self, transaction=True):
+        return Pipeline(self)
+
+
+class Pipeline:
+    """Queues Store calls and runs them on execute()."""
+
+    def __init__(self, store):
+        self.store = store
+        self.calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        return False
+
+    def __getattr__(self, name):
+        method = getattr(self.store, name)
+        return lambda *args, **kwargs: self.calls.append(method(*args, **kwargs))
+
+    async def execute(self):
+        return [await call for call in self.calls]
+
+
+async def drain():
+    """Let connection writer and close tasks run."""
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def store():
+    store = Store()
+    with patch("core.database.get_redis", AsyncMock(return_value=store)):
+        yield store
+
+
+def worker() -> PresenceService:
+    return PresenceService(ConnectionManager(), interval=10, timeout=30)
+
+
+@pytest.mark.asyncio
+class TestPresence:
+    """Test heartbeat, reaping and the cross-worker online map."""
+
+    async def test_online_count_spans_workers(self, store):
+        """A user connected to one worker is online as seen from another."""
+        first, second = worker(), worker()
+        await first.connections.connect(AsyncMock(spec=WebSocket), 1, accept=False)
+        await first.connected(1)
+
+        assert await second.online_count() == 1
+        assert await second.is_online(1) is True
+        assert await second.is_online(2) is False
+
+    async def test_beat_pings_and_reaps_silent_sockets(self, store):
+        """Live sockets get a ping; silent ones are closed with 1001."""
+        presence = worker()
+        live, silent = AsyncMock(spec=WebSocket), AsyncMock(spec=WebSocket)
+        await presence.connections.connect(live, 1, accept=False)
+        connection = await presence.connections.connect(silent, 2, accept=False)
+        connection.last_seen = time.monotonic() - 31
+
+        assert await presence.beat() == 1
+        await drain()
+
+        live.send_json.assert_called_once_with({"type": "ping"})
+        silent.close.assert_called_once_with(code=status.WS_1001_GOING_AWAY)
+        assert presence.connections.get_active_users() == [1]
+
+    async def test_disconnect_ages_out_unless_refreshed(self, store):
+        """A user whose last socket closed drops out after one heartbeat,
+        unless another worker still holds one of their sockets."""
+        first, second = worker(), worker()
+        sockets = []
+        for presence, user_ids in ((first, (1, 2)), (second, (2,))):
+            for user_id in user_ids:
+                socket = AsyncMock(spec=WebSocket)
+                await presence.connections.connect(socket, user_id, accept=False)
+                await presence.connected(user_id)
+                if presence is first:
+                    sockets.append((socket, user_id))
+
+        for socket, user_id in sockets:
+            await first.connections.disconnect(socket)
+            await first.disconnected(user_id)
+        assert await first.last_seen(1) is not None
+
+        later = time.time() + 11
+        with patch("app.services.presence.time.time", return_value=later):
+            await second.beat()
+            assert await first.online_count() == 1
+            assert await first.is_online(1) is False
+            assert await first.is_online(2) is True
+
+    async def test_falls_back_to_local_registry(self):
+        """Without Redis, counts come from this worker."""
+        presence = worker()
+        await presence.connections.connect(AsyncMock(spec=WebSocket), 1, accept=False)
+        with patch("core.database.get_redis", AsyncMock(side_effect=ConnectionError)):
+            await presence.connected(1)
+            assert await presence.online_count() == 1
+            assert await presence.is_online(1) is True
@@ -0,0 +1,143 @@
+"""Unit tests for cross-worker WebSocket fanout."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import WebSocket
+
+from app.services.websocket_manager import ConnectionManager
+from app.services.ws_fanout import WebSocketFanout, topic_channel, user_channel
+
+
+class Broker:
+    """In-memory stand-in for Redis PUBLISH between fanout instances."""
+
+    def __init__(self):
+        self.channels = {}
+
+    def subscribe(self, fanout: WebSocketFanout, *channels: str):
+        for channel in channels:
+            self.channels.setdefault(channel, []).append(fanout)
+
+    async def publish(self, channel: str, data: str) -> int:
+        subscribers = self.channels.get(channel, [])
+        for fanout in subscribers:
+            fanout._handle(channel, json.loads(data))
+        return len(subscribers)
+
+
+async def drain():
+    """Let connection writer tasks run."""
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+async def workers():
+    """Two workers sharing a broker; user 2 is connected to the second."""
+    broker = Broker()
+    first = WebSocketFanout(ConnectionManager(), worker_id="one")
+    second = WebSocketFanout(ConnectionManager(), worker_id="two")
+    broker.subscribe(first, first.ack_channel)
+    broker.subscribe(second, second.ack_channel, user_channel(2))
+
+    socket = AsyncMock(spec=WebSocket)
+    await second.connections.connect(socket, 2, accept=False)
+    second._users.add(2)
+    with patch("core.database.get_redis", AsyncMock(return_value=broker)):
+        yield first, second, socket
+
+
+@pytest.mark.asyncio
+class TestWebSocketFanout:
+    """Test local, remote and offline delivery."""
+
+    async def test_local_delivery_skips_broker(self, workers):
+        """A user connected to this worker gets the payload without an ack wait."""
+        _, second, socket = workers
+        assert await second.deliver(2, {"message": "hi"}) is True
+        await drain()
+        # Published for other devices, but not echoed back to this worker
+        socket.send_json.assert_called_once_with({"message": "hi"})
+
+    async def test_remote_delivery_is_acknowledged(self, workers):
+        """The worker holding the socket writes the payload and acks it."""
+        first, _, socket = workers
+        assert await first.deliver(2, {"message": "hi"}) is True
+        await drain()
+        socket.send_json.assert_called_once_with({"message": "hi"})
+        assert not first._pending
+
+    async def test_devices_on_both_workers(self, workers):
+        """Every device gets the payload, wherever it is connected."""
+        first, second, remote_socket = workers
+        local_socket = AsyncMock(spec=WebSocket)
+        await first.connections.connect(local_socket, 2, accept=False)
+
+        assert await first.deliver(2, {"message": "hi"}) is True
+        await drain()
+        local_socket.send_json.assert_called_once_with({"message": "hi"})
+        remote_socket.send_json.assert_called_once_with({"message": "hi"})
+
+    async def test_remote_worker_without_socket_nacks(self, workers):
+        """A worker that no longer holds the user's socket reports undelivered."""
+        first, second, socket = workers
+        await second.connections.disconnect(socket)
+        assert await first.deliver(2, {"message": "hi"}) is False
+
+    async def test_offline_user(self, workers):
+        """Nobody subscribed to the user's channel means offline, no waiting."""
+        first, _, _ = workers
+        delivered = await asyncio.wait_for(first.deliver(3, {"message": "hi"}), 0.5)
+        assert delivered is False
+
+    async def test_broker_unavailable(self):
+        """Publish errors report undelivered instead of raising."""
+        fanout = WebSocketFanout(ConnectionManager())
+        broken = AsyncMock()
+        broken.publish.side_effect = ConnectionError("Redis down")
+        with patch("core.database.get_redis", AsyncMock(return_value=broken)):
+            assert await fanout.deliver(2, {"message": "hi"}) is False
+
+
+@pytest.mark.asyncio
+class TestTopicFanout:
+    """Test topic updates reach only subscribed sockets, on any worker."""
+
+    async def test_update_reaches_subscribers_on_other_worker(self, workers):
+        """A topic update published on one worker reaches another's subscriber."""
+        first, second, socket = workers
+        other = AsyncMock(spec=WebSocket)
+        await second.connections.connect(other, 3, accept=False)
+        assert await second.connections.subscribe(socket, "property:12") is True
+        broker = Broker()
+        broker.subscribe(second, topic_channel("property:12"))
+
+        with patch("core.database.get_redis", AsyncMock(return_value=broker)):
+            await first.publish("property:12", {"type": "status_update"})
+            await first.publish("property:13", {"type": "status_update"})
+        await drain()
+
+        socket.send_json.assert_called_once_with(
+            {"type": "status_update", "topic": "property:12"}
+        )
+        other.send_json.assert_not_called()
+
+    async def test_unsubscribe_topic_waits_for_last_socket(self, workers):
+        """The worker keeps a topic channel while any local socket follows it."""
+        _, second, socket = workers
+        other = AsyncMock(spec=WebSocket)
+        await second.connections.connect(other, 3, accept=False)
+        for websocket in (socket, other):
+            await second.connections.subscribe(websocket, "property:4")
+            await second.subscribe_topic("property:4")
+
+        second.connections.unsubscribe(socket, "property:4")
+        await second.unsubscribe_topic("property:4")
+        assert second._topics == {"property:4"}
+
+        await second.connections.disconnect(other)
+        await second.unsubscribe_topic("property:4")
+        assert second._topics == set()